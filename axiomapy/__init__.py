@@ -18,11 +18,23 @@ from ._version import get_versions
 
 from .session import (
     AxiomaSession,
+    AsyncAxiomaSession,
     AxiomaRequestError,
     AxiomaAuthenticationError,
     AxiomaAuthorizationError,
     AxiomaResponse,
 )
+from .ratelimit import RateLimit, RateLimiter
+from .retry import RetryPolicy
+from .jsoncodec import JsonCodec, get_json_codec
+from .compression import CompressionPolicy, supported_content_encodings
+from .streaming import (
+    JsonItemParser,
+    aiter_json_items,
+    iter_csv_records,
+    iter_csv_rows,
+    iter_json_items,
+)
 
 
 __version__ = get_versions()["version"]
@@ -30,8 +42,21 @@ del get_versions
 
 __all__ = [
     "AxiomaSession",
+    "AsyncAxiomaSession",
     "AxiomaRequestError",
     "AxiomaAuthenticationError",
     "AxiomaAuthorizationError",
     "AxiomaResponse",
+    "RateLimit",
+    "RateLimiter",
+    "RetryPolicy",
+    "JsonItemParser",
+    "iter_json_items",
+    "aiter_json_items",
+    "iter_csv_rows",
+    "iter_csv_records",
+    "JsonCodec",
+    "get_json_codec",
+    "CompressionPolicy",
+    "supported_content_encodings",
 ]
@@ -36,6 +36,36 @@ from .riskmodeldefinitions import RiskModelDefinitionsAPI
 from .templates import TemplatesAPI
 from .clienteventbus import ClientEventBusAPI
 from .admin import AdminAPI
+from .asyncapis import (
+    AsyncAnalysesAPI,
+    AsyncAnalysesRiskAPI,
+    AsyncAnalysesPerformanceAPI,
+    AsyncAnalysisDefinitionAPI,
+    AsyncBatchDefinitionsAPI,
+    AsyncBulkAPI,
+    AsyncEntitiesAPI,
+    AsyncMarketDataSourcesAPI,
+    AsyncMetaDataAPI,
+    AsyncPortfolioGroupsAPI,
+    AsyncPortfoliosAPI,
+    AsyncRiskModelDefinitionsAPI,
+    AsyncTemplatesAPI,
+    AsyncClientEventBusAPI,
+    AsyncAdminAPI,
+)
+from .pagination import paginate, apaginate
+from .jobs import AnalysisJob, JobPoller, PollingPolicy
+from .pipelines import (
+    DirectorySink,
+    PerformanceAttributionPipeline,
+    PerformanceResult,
+    PipelineResult,
+    ResultSink,
+    RiskAnalysisPipeline,
+    run_risk_analyses,
+)
+from .positions import PositionColumns
+from .templateentities import get_template_entity_class, template_entity_class
 
 __all__ = [
     "AnalysisDefinitionAPI",
@@ -62,5 +92,35 @@ __all__ = [
     "RiskModelDefinitionsAPI",
     "BulkAPI",
     "ClientEventBusAPI",
-    "AdminAPI"
+    "AdminAPI",
+    "AsyncAnalysesAPI",
+    "AsyncAnalysesRiskAPI",
+    "AsyncAnalysesPerformanceAPI",
+    "AsyncAnalysisDefinitionAPI",
+    "AsyncBatchDefinitionsAPI",
+    "AsyncBulkAPI",
+    "AsyncEntitiesAPI",
+    "AsyncMarketDataSourcesAPI",
+    "AsyncMetaDataAPI",
+    "AsyncPortfolioGroupsAPI",
+    "AsyncPortfoliosAPI",
+    "AsyncRiskModelDefinitionsAPI",
+    "AsyncTemplatesAPI",
+    "AsyncClientEventBusAPI",
+    "AsyncAdminAPI",
+    "paginate",
+    "apaginate",
+    "PositionColumns",
+    "template_entity_class",
+    "get_template_entity_class",
+    "AnalysisJob",
+    "JobPoller",
+    "PollingPolicy",
+    "RiskAnalysisPipeline",
+    "ResultSink",
+    "DirectorySink",
+    "PipelineResult",
+    "run_risk_analyses",
+    "PerformanceAttributionPipeline",
+    "PerformanceResult",
 ]
@@ -26,8 +26,10 @@ class AdminAPI:
     """Access admin api methods using the active session
     """
 
-    @staticmethod
-    def get_external_identities(filter_results: str = None,
+    _session_cls = AxiomaSession
+
+    @classmethod
+    def get_external_identities(cls, filter_results: str = None,
         top: int = None,
         skip: int = None,
         orderby: str = None,
@@ -47,13 +49,13 @@ class AdminAPI:
         url = "/admin/external-identities"
         _logger.info(f"Getting from {url}")
         params = odata_params(filter_results, top, skip, orderby)
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, params=params, return_response=return_response
         )
         return response
 
-    @staticmethod
-    def get_external_identity(external_identity_id: int,
+    @classmethod
+    def get_external_identity(cls, external_identity_id: int,
                                return_response: bool = False):
         """The method returns the external identity
 
@@ -66,13 +68,13 @@ class AdminAPI:
         """
         url = f"/admin/external-identities/{external_identity_id}"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, return_response=return_response
         )
         return response
 
-    @staticmethod
-    def post_external_identity(external_identity: dict,
+    @classmethod
+    def post_external_identity(cls, external_identity: dict,
                                  return_response: bool = False):
         """The method creates a new external identity
 
@@ -85,13 +87,13 @@ class AdminAPI:
         """
         url = "/admin/external-identities"
         _logger.info(f"Posting to {url}")
-        response = AxiomaSession.current._post(
+        response = cls._session_cls.current._post(
             url, external_identity, return_response=return_response
         )
         return response
 
-    @staticmethod
-    def put_external_identity(external_identity_id: int,
+    @classmethod
+    def put_external_identity(cls, external_identity_id: int,
                               external_identity: dict,
                               return_response: bool = False):
         """The method updates the existing external identity
@@ -106,13 +108,13 @@ class AdminAPI:
         """
         url = f"/admin/external-identities/{external_identity_id}"
         _logger.info(f"Sending Put to {url}")
-        response = AxiomaSession.current._put(
+        response = cls._session_cls.current._put(
             url, external_identity, return_response=return_response
         )
         return response
 
-    @staticmethod
-    def delete_external_identity(external_identity_id: int,
+    @classmethod
+    def delete_external_identity(cls, external_identity_id: int,
                                  return_response: bool = False):
         """The method deletes an existing external identity
 
@@ -125,7 +127,7 @@ class AdminAPI:
         """
         url = f"/admin/external-identities/{external_identity_id}"
         _logger.info(f"Delete using {url}")
-        response = AxiomaSession.current._delete(
+        response = cls._session_cls.current._delete(
             url, return_response=return_response
         )
         return response
\ No newline at end of file
@@ -14,30 +14,106 @@ specific language governing permissions and limitations
 under the License.
 
 """
+import concurrent.futures
 import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
 
 from axiomapy.axiomaapi.enums import FinishedStatuses, Status
+from axiomapy.axiomaexceptions import AxiomaValueError
+from axiomapy.context import as_current
 from axiomapy.entitybase import get_enum_value
-from axiomapy.session import AxiomaSession
+from axiomapy.downloads import PathLike
+from axiomapy.session import AxiomaResponse, AxiomaSession
 
 _logger = logging.getLogger(__name__)
 _logger.addHandler(logging.NullHandler())
 
 _finished_states = set(item.value.upper() for item in FinishedStatuses)
 
+# the reports of AnalysesPerformanceAPI.fetch_all_results: the api method of each
+# report, whether the method can stream and whether the report is available as csv
+PERFORMANCE_REPORTS = {
+    "summary": ("get_results_summary", True, True),
+    "summary-time-series": ("get_summary_time_series", False, False),
+    "brinson-attribution": ("get_results_brinson_attribution", True, True),
+    "brinson-attribution-time-series": (
+        "get_results_brinson_attribution_time_series",
+        True,
+        True,
+    ),
+    "brinson-asset-returns": ("get_brinson_asset_returns", False, True),
+    "factor-attribution": ("get_results_factor_attribution", True, True),
+    "factor-attribution-time-series": (
+        "get_results_factor_attribution_time_series",
+        True,
+        True,
+    ),
+    "asset-returns": ("get_results_asset_returns", True, True),
+    "asset-factor-contributions": (
+        "get_results_asset_factor_contributions",
+        True,
+        True,
+    ),
+    "warnings-and-errors": ("get_results_warnings_errors", True, True),
+}
+
+
+def _performance_reports(reports: Iterable[str] = None) -> List[str]:
+    """The names of the reports to fetch, all the reports by default"""
+    if reports is None:
+        return list(PERFORMANCE_REPORTS)
+    reports = list(reports)
+    unknown = [name for name in reports if name not in PERFORMANCE_REPORTS]
+    if unknown:
+        raise AxiomaValueError(
+            f"Unknown performance reports {unknown}, the reports are "
+            f"{list(PERFORMANCE_REPORTS)}"
+        )
+    return reports
+
+
+def _report_request(name: str, to_disk: bool, as_csv: bool) -> Tuple[str, dict]:
+    """The api method and the arguments requesting a performance report"""
+    method_name, streams, csv = PERFORMANCE_REPORTS[name]
+    kwargs = {}
+    if streams and to_disk:
+        kwargs["stream"] = True
+    if csv and as_csv:
+        kwargs["headers"] = {"Accept": "text/csv"}
+    return method_name, kwargs
+
+
+def _report_path(
+    directory: Path, request_id: int, name: str, response: AxiomaResponse
+) -> Path:
+    is_csv = "CSV" in response.headers.get("content-type", "").upper()
+    return directory / f"{request_id}_{name}.{'csv' if is_csv else 'json'}"
+
 
 class AnalysesAPI:
     """This class provides access to more generic API methods which are common across various analyses, risk and performance
 
     """
-    @staticmethod
-    def get_analyses(request_id: int, as_csv: bool = False, return_response: bool = False):
+
+    _session_cls = AxiomaSession
+
+    @classmethod
+    def get_analyses(
+        cls,
+        request_id: int,
+        as_csv: bool = False,
+        return_response: bool = False,
+        stream: bool = False,
+    ):
         """The method is used to fetch the result of the analysis request.
 
         Args:
             request_id: Request id for the analysis request.
             as_csv: Option to return the results as CSV rather than JSON
             return_response: If set to true, the response will be returned
+            stream: If set to True, the response will be streamed, e.g. to iterate
+                over the CSV records with response.iter_records()
 
         Returns:
             The result of the analysis are returned.
@@ -47,11 +123,13 @@ class AnalysesAPI:
         _logger.info(f"Getting from {url}")
         if as_csv:
             headers = {"Accept": "text/csv"}
-        response = AxiomaSession.current._get(url, headers=headers, return_response=return_response)
+        response = cls._session_cls.current._get(
+            url, headers=headers, stream=stream, return_response=return_response
+        )
         return response
 
-    @staticmethod
-    def get_analyses_log(request_id: int, return_response: bool = False):
+    @classmethod
+    def get_analyses_log(cls, request_id: int, return_response: bool = False):
         """This method returns the logs generated by the analysis request.
 
         Args:
@@ -63,11 +141,12 @@ class AnalysesAPI:
         """
         url = f"/analyses/{request_id}/logs"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(url, return_response=return_response)
+        response = cls._session_cls.current._get(url, return_response=return_response)
         return response
 
-    @staticmethod
+    @classmethod
     def get_analyses_status(
+        cls,
         request_id: int, return_response: bool = False
     ):
         """This method returns the status of the analysis request.
@@ -81,7 +160,7 @@ class AnalysesAPI:
         """
         url = f"/analyses/{request_id}/status"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, return_response=return_response
         )
         return response
@@ -135,8 +214,9 @@ class AnalysesRiskAPI(AnalysesAPI):
 
     """
 
-    @staticmethod
+    @classmethod
     def post_portfolio_analyses(
+        cls,
         portfolio_id: int, analyses_parameters: dict, return_response: bool = False
     ):
         """This method creates a new portfolio risk analysis request and submits it for processing.
@@ -151,13 +231,14 @@ class AnalysesRiskAPI(AnalysesAPI):
         """
         url = f"/analyses/risk/portfolios/{portfolio_id}"
         _logger.info(f"Posting to {url}")
-        response = AxiomaSession.current._post(
+        response = cls._session_cls.current._post(
             url, json=analyses_parameters, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def post_positions_analyses(
+        cls,
         analyses_parameters: dict, return_response: bool = False
     ):
         """This method creates a new dynamic positions risk analysis request and submits it for processing
@@ -171,13 +252,14 @@ class AnalysesRiskAPI(AnalysesAPI):
         """
         url = "/analyses/risk/positions"
         _logger.info(f"Posting to {url}")
-        response = AxiomaSession.current._post(
+        response = cls._session_cls.current._post(
             url, json=analyses_parameters, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def post_instrument_analyses(
+        cls,
         analyses_parameters: dict, return_response: bool = False
     ):
         """This method queues an instrument analysis request
@@ -191,13 +273,15 @@ class AnalysesRiskAPI(AnalysesAPI):
         """
         url = "analyses/instruments"
         _logger.info(f"Posting to {url}")
-        response = AxiomaSession.current._post(
+        response = cls._session_cls.current._post(
             url, json=analyses_parameters, return_response=return_response
         )
         return response
 
-    @staticmethod
-    def post_batch_analyses(analyses_parameters: dict, return_response: bool = False):
+    @classmethod
+    def post_batch_analyses(
+        cls, analyses_parameters: dict, return_response: bool = False
+    ):
         """This method creates a new batch risk analysis request and submits it for processing
 
         Args:
@@ -209,13 +293,14 @@ class AnalysesRiskAPI(AnalysesAPI):
         """
         url = "/analyses/risk/batches"
         _logger.info(f"Posting to {url}")
-        response = AxiomaSession.current._post(
+        response = cls._session_cls.current._post(
             url, json=analyses_parameters, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_portfolio_request(
+        cls,
         request_id: int, original: bool = False, return_response: bool = False
     ):
         """This method returns the request of a portfolio risk analysis
@@ -230,13 +315,14 @@ class AnalysesRiskAPI(AnalysesAPI):
         """
         url = f"analyses/risk/portfolios/{request_id}/request"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, params={"original": original}, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_positions_request(
+        cls,
         request_id: int, original: bool = False, return_response: bool = False
     ):
         """This method retrieves the request of a positions risk analysis
@@ -251,13 +337,14 @@ class AnalysesRiskAPI(AnalysesAPI):
         """
         url = f"analyses/risk/positions/{request_id}/request"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, params={"original": original}, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_instruments_request(
+        cls,
         request_id: int, original: bool = False, return_response: bool = False
     ):
         """This method returns the instrument analysis request
@@ -272,13 +359,14 @@ class AnalysesRiskAPI(AnalysesAPI):
         """
         url = f"analyses/instruments/{request_id}/request"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, params={"original": original}, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_batch_request(
+        cls,
         request_id: int, original: bool = False, return_response: bool = False
     ):
         """This method returns the request of a batch risk analysis request
@@ -293,13 +381,14 @@ class AnalysesRiskAPI(AnalysesAPI):
         """
         url = f"analyses/risk/batches/{request_id}/request"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, params={"original": original}, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_batch_request_status(
+        cls,
         request_id: int,
         headers=None,
         return_response: bool = False,
@@ -316,13 +405,14 @@ class AnalysesRiskAPI(AnalysesAPI):
         """
         url = f"/analyses/risk/batches/{request_id}/status"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, headers=headers, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def post_risk_model_request(
+        cls,
         risk_model_parameters: dict, headers=None, return_response: bool = False
     ):
         """This method creates and runs a risk model analysis task
@@ -337,7 +427,7 @@ class AnalysesRiskAPI(AnalysesAPI):
         """
         url = "/analyses/risk/risk-models"
         _logger.info(f"Posting to {url}")
-        response = AxiomaSession.current._post(
+        response = cls._session_cls.current._post(
             url,
             json=risk_model_parameters,
             headers=headers,
@@ -345,8 +435,9 @@ class AnalysesRiskAPI(AnalysesAPI):
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_risk_model_request(
+        cls,
         request_id: int, original: bool = False, return_response: bool = False
     ):
         """This method returns the request for a risk model analysis request
@@ -361,13 +452,14 @@ class AnalysesRiskAPI(AnalysesAPI):
         """
         url = f"analyses/risk/risk-models/{request_id}/request"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, params={"original": original}, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_risk_model_logs(
+        cls,
         request_id: int, headers: dict = None, return_response: bool = False
     ):
         """This method returns the logs generated by a risk model analysis request.
@@ -383,13 +475,14 @@ class AnalysesRiskAPI(AnalysesAPI):
         """
         url = f"/analyses/risk/risk-models/{request_id}/logs"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, headers=headers, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_risk_model_results(
+        cls,
         request_id: int,
         show_raw_results: bool = False,
         headers: dict = None,
@@ -411,7 +504,7 @@ class AnalysesRiskAPI(AnalysesAPI):
         param = {"showRawResults": show_raw_results}
         url = f"/analyses/risk/risk-models/{request_id}"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url,
             headers=headers,
             params=param,
@@ -420,8 +513,9 @@ class AnalysesRiskAPI(AnalysesAPI):
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_risk_model_request_status(
+        cls,
         request_id: int,
         headers=None,
         return_response: bool = False,
@@ -438,7 +532,7 @@ class AnalysesRiskAPI(AnalysesAPI):
         """
         url = f"/analyses/risk/risk-models/{request_id}/status"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, headers=headers, return_response=return_response
         )
         return response
@@ -448,8 +542,11 @@ class AnalysesPerformanceAPI():
     """Access api methods of performance analysis using the active session
 
     """
-    @staticmethod
-    def get_logs(request_id: int, return_response: bool = False):
+
+    _session_cls = AxiomaSession
+
+    @classmethod
+    def get_logs(cls, request_id: int, return_response: bool = False):
         """This method fetches the logs generated by a performance analysis request
 
         Args:
@@ -461,11 +558,76 @@ class AnalysesPerformanceAPI():
         """
         url = f"/analyses/performance/{request_id}/logs"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(url)
+        response = cls._session_cls.current._get(url)
         return response
 
     @staticmethod
+    def fetch_all_results(
+        request_id: int,
+        reports: Iterable[str] = None,
+        directory: PathLike = None,
+        as_csv: bool = False,
+        max_concurrency: int = None,
+    ) -> Dict[str, Any]:
+        """This method fetches the reports of a completed performance attribution
+        concurrently, so fetching them takes as long as the slowest report instead of
+        the sum of the reports
+
+        Args:
+            request_id: id returned when the performance attribution task is submitted
+            reports: names of the reports (see PERFORMANCE_REPORTS), all by default
+            directory: optional directory the reports are streamed to, as
+                {request_id}_{report}.json (or .csv)
+            as_csv: Option to request the reports as CSV where available
+            max_concurrency: The maximum number of reports fetched at a time, all
+                the reports by default
+
+        Returns:
+            The responses (or the paths of the files if directory is given) by
+            report name
+
+        Raises:
+            AxiomaValueError: unknown report names
+        """
+        names = _performance_reports(reports)
+        if not names:
+            return {}
+        if directory is not None:
+            directory = Path(directory)
+            directory.mkdir(parents=True, exist_ok=True)
+        # the current session is thread local, the workers share it without
+        # entering it
+        session = AxiomaSession.current
+
+        def fetch(name: str):
+            method_name, kwargs = _report_request(name, directory is not None, as_csv)
+            with as_current(session):
+                response = getattr(AnalysesPerformanceAPI, method_name)(
+                    request_id, **kwargs
+                )
+                if directory is None:
+                    return response
+                path = _report_path(directory, request_id, name, response)
+                response.download_to(path)
+                return path
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_concurrency or len(names)
+        ) as pool:
+            futures = {name: pool.submit(fetch, name) for name in names}
+            done, pending = concurrent.futures.wait(
+                futures.values(), return_when=concurrent.futures.FIRST_EXCEPTION
+            )
+            for future in pending:
+                future.cancel()
+            for future in done:
+                if future.exception() is not None:
+                    raise future.exception()
+            return {name: future.result() for name, future in futures.items()}
+
+    @classmethod
     def get_request(
+        cls,
         request_id: int, original: bool = False, return_response: bool = False
     ):
         """This method retrieves the job details of a performance attribution task
@@ -481,13 +643,14 @@ class AnalysesPerformanceAPI():
         """
         url = f"analyses/performance/{request_id}/request"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, params={"original": original}, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_results_asset_factor_contributions(
+        cls,
         request_id: int,
         stream: bool = False,
         headers: dict = None,
@@ -520,7 +683,7 @@ class AnalysesPerformanceAPI():
         url = f"/analyses/performance/{request_id}/results/asset-factor-contributions"
         _logger.info(f"Getting from {url}")
 
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url,
             stream=stream,
             headers=headers,
@@ -529,8 +692,9 @@ class AnalysesPerformanceAPI():
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_results_asset_returns(
+        cls,
         request_id: int,
         stream: bool = False,
         headers: dict = None,
@@ -549,7 +713,7 @@ class AnalysesPerformanceAPI():
         """
         url = f"/analyses/performance/{request_id}/results/asset-returns"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url,
             stream=stream,
             headers=headers,
@@ -557,8 +721,9 @@ class AnalysesPerformanceAPI():
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_results_brinson_attribution(
+        cls,
         request_id: int,
         stream: bool = False,
         headers: dict = None,
@@ -577,7 +742,7 @@ class AnalysesPerformanceAPI():
         """
         url = f"/analyses/performance/{request_id}/results/brinson-attribution"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url,
             stream=stream,
             headers=headers,
@@ -585,8 +750,9 @@ class AnalysesPerformanceAPI():
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_results_brinson_attribution_time_series(
+        cls,
         request_id: int,
         stream: bool = False,
         headers: dict = None,
@@ -608,7 +774,7 @@ class AnalysesPerformanceAPI():
             "results/brinson-attribution-time-series"
         )
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url,
             stream=stream,
             headers=headers,
@@ -616,8 +782,9 @@ class AnalysesPerformanceAPI():
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_results_factor_attribution(
+        cls,
         request_id: int,
         stream: bool = False,
         headers: dict = None,
@@ -636,7 +803,7 @@ class AnalysesPerformanceAPI():
         """
         url = f"/analyses/performance/{request_id}/results/factor-attribution"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url,
             stream=stream,
             headers=headers,
@@ -644,8 +811,9 @@ class AnalysesPerformanceAPI():
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_results_factor_attribution_time_series(
+        cls,
         request_id: int,
         stream: bool = False,
         headers: dict = None,
@@ -672,7 +840,7 @@ class AnalysesPerformanceAPI():
             f"/analyses/performance/{request_id}/results/factor-attribution-time-series"
         )
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url,
             stream=stream,
             headers=headers,
@@ -681,8 +849,9 @@ class AnalysesPerformanceAPI():
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_results_summary(
+        cls,
         request_id: int,
         stream: bool = False,
         headers: dict = None,
@@ -702,7 +871,7 @@ class AnalysesPerformanceAPI():
         """
         url = f"/analyses/performance/{request_id}/results/summary"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url,
             stream=stream,
             headers=headers,
@@ -710,8 +879,9 @@ class AnalysesPerformanceAPI():
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_results_warnings_errors(
+        cls,
         request_id: int,
         stream: bool = False,
         headers: dict = None,
@@ -730,7 +900,7 @@ class AnalysesPerformanceAPI():
         """
         url = f"/analyses/performance/{request_id}/results/warnings-and-errors"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url,
             stream=stream,
             headers=headers,
@@ -738,8 +908,9 @@ class AnalysesPerformanceAPI():
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_status(
+        cls,
         request_id: int,
         headers: dict = None,
         return_response: bool = False,
@@ -756,13 +927,14 @@ class AnalysesPerformanceAPI():
         """
         url = f"/analyses/performance/{request_id}/status"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, headers=headers, return_response=return_response,
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_report_status(
+        cls,
         portfolio_id: int,
         headers: dict = None,
         return_response: bool = False,
@@ -779,13 +951,14 @@ class AnalysesPerformanceAPI():
         """
         url = f"/analyses/performance/portfolios/{portfolio_id}/report-status"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, headers=headers, return_response=return_response,
         )
         return response
 
-    @staticmethod
+    @classmethod
     def post_performance_analysis(
+        cls,
         portfolio_id: int,
         analyses_parameters: dict,
         headers: dict = None,
@@ -804,7 +977,7 @@ class AnalysesPerformanceAPI():
         """
         url = f"analyses/performance/portfolios/{portfolio_id}"
         _logger.info(f"Posting to {url}")
-        response = AxiomaSession.current._post(
+        response = cls._session_cls.current._post(
             url,
             json=analyses_parameters,
             headers=headers,
@@ -812,8 +985,9 @@ class AnalysesPerformanceAPI():
         )
         return response
 
-    @staticmethod
+    @classmethod
     def post_missing_precomputed(
+        cls,
         portfolio_id: int,
         precompute_dates_parameters: dict,
         headers: dict = None,
@@ -835,7 +1009,7 @@ class AnalysesPerformanceAPI():
             f"{portfolio_id}/missing-precomputed-analytics"
         )
         _logger.info(f"Posting to {url}")
-        response = AxiomaSession.current._post(
+        response = cls._session_cls.current._post(
             url,
             json=precompute_dates_parameters,
             headers=headers,
@@ -843,8 +1017,9 @@ class AnalysesPerformanceAPI():
         )
         return response
 
-    @staticmethod
+    @classmethod
     def post_precompute(
+        cls,
         portfolio_id: int,
         precompute_parameters: dict,
         headers: dict = None,
@@ -863,7 +1038,7 @@ class AnalysesPerformanceAPI():
         """
         url = f"analyses/performance/portfolios/{portfolio_id}/precompute-analytics"
         _logger.info(f"Posting to {url}")
-        response = AxiomaSession.current._post(
+        response = cls._session_cls.current._post(
             url,
             json=precompute_parameters,
             headers=headers,
@@ -871,8 +1046,9 @@ class AnalysesPerformanceAPI():
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_brinson_asset_returns(
+        cls,
         request_id: int,
         headers: dict = None,
         return_response: bool = False,
@@ -889,13 +1065,14 @@ class AnalysesPerformanceAPI():
         """
         url = f"/analyses/performance/{request_id}/results/brinson-asset-returns"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, headers=headers, return_response=return_response,
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_summary_time_series(
+            cls,
             request_id: int,
             headers: dict = None,
             return_response: bool = False,
@@ -914,13 +1091,14 @@ class AnalysesPerformanceAPI():
         """
         url = f"/analyses/performance/{request_id}/results/summary-time-series?reportFrequency={report_frequency}"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, headers=headers, return_response=return_response,
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_asset_details_time_series(
+            cls,
             request_id: int,
             headers: dict = None,
             return_response: bool = False,
@@ -950,7 +1128,7 @@ class AnalysesPerformanceAPI():
             filter_string = f"{filter_string}date={request_date}&"
         url = f"/analyses/performance/{request_id}/results/asset-details-time-series?{filter_string}"[:-1]
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, headers=headers, return_response=return_response,
         )
         return response
\ No newline at end of file
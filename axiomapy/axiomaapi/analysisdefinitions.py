@@ -28,8 +28,11 @@ class AnalysisDefinitionAPI():
 
     """
 
-    @staticmethod
+    _session_cls = AxiomaSession
+
+    @classmethod
     def get_analysis_definitions(
+        cls,
         filter_results: str = None,
         top: int = None,
         skip: int = None,
@@ -51,13 +54,14 @@ class AnalysisDefinitionAPI():
         url = "/analysis-definitions"
         params = odata_params(filter_results, top, skip, orderby)
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, params=params, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_analysis_definition(
+        cls,
         analysis_def_id: str,
         return_response: bool = False,
     ):
@@ -72,13 +76,14 @@ class AnalysisDefinitionAPI():
         """
         url = f"/analysis-definitions/{analysis_def_id}"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def post_analysis_definition(
+        cls,
         analysis_def: dict, return_response: bool = False,
     ):
         """This method creates new analysis definitions
@@ -92,13 +97,14 @@ class AnalysisDefinitionAPI():
         """
         url = "/analysis-definitions"
         _logger.info(f"Posting to {url}")
-        response = AxiomaSession.current._post(
+        response = cls._session_cls.current._post(
             url, json=analysis_def, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def post_share_analysis_definition(
+        cls,
         analysis_def_id: int, share_def: dict, return_response: bool = False,
     ):
         """This method shares a view with a specific team
@@ -113,7 +119,7 @@ class AnalysisDefinitionAPI():
         """
         url = f"analysis-definitions/{analysis_def_id}/share"
         _logger.info(f"Posting to {url}")
-        response = AxiomaSession.current._post(
+        response = cls._session_cls.current._post(
             url, json=share_def, return_response=return_response
         )
         return response
@@ -0,0 +1,336 @@
+"""
+Copyright © 2024 Axioma by SimCorp.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+
+"""
+import ast
+import asyncio
+import functools
+import inspect
+import logging
+import textwrap
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from axiomapy.axiomaexceptions import AxiomaTypeError
+from axiomapy.downloads import PathLike
+from axiomapy.session import AsyncAxiomaSession
+
+from .admin import AdminAPI
+from .analyses import (
+    AnalysesAPI,
+    AnalysesPerformanceAPI,
+    AnalysesRiskAPI,
+    _performance_reports,
+    _report_path,
+    _report_request,
+)
+from .analysisdefinitions import AnalysisDefinitionAPI
+from .batchdefinitions import BatchDefinitionsAPI
+from .bulk import BulkAPI
+from .clienteventbus import ClientEventBusAPI
+from .entities import EntitiesAPI
+from .marketdatasources import MarketDataSourcesAPI
+from .metadata import MetaDataAPI
+from .portfoliogroups import PortfolioGroupsAPI
+from .portfolios import PortfoliosAPI
+from .riskmodeldefinitions import RiskModelDefinitionsAPI
+from .templates import TemplatesAPI
+
+_logger = logging.getLogger(__name__)
+_logger.addHandler(logging.NullHandler())
+
+# the session of the endpoints of the api classes, see async_api
+_SESSION_ATTRIBUTE = "_session_cls"
+
+
+def _is_session_request(node: ast.AST, cls_name: str) -> bool:
+    """True if node is a request of the session of the api class, e.g.
+    cls._session_cls.current._get(...)"""
+    if not isinstance(node, ast.Call) or not isinstance(node.func, ast.Attribute):
+        return False
+    current = node.func.value
+    return (
+        isinstance(current, ast.Attribute)
+        and current.attr == "current"
+        and isinstance(current.value, ast.Attribute)
+        and current.value.attr == _SESSION_ATTRIBUTE
+        and isinstance(current.value.value, ast.Name)
+        and current.value.value.id == cls_name
+    )
+
+
+def _is_returned(function: ast.FunctionDef, call: ast.Call) -> bool:
+    """True if the result of call is returned unchanged by the function"""
+    for node in ast.walk(function):
+        if isinstance(node, ast.Return) and node.value is call:
+            return True
+        if (
+            isinstance(node, ast.Assign)
+            and node.value is call
+            and len(node.targets) == 1
+            and isinstance(node.targets[0], ast.Name)
+        ):
+            name = node.targets[0].id
+            loads = [
+                n
+                for n in ast.walk(function)
+                if isinstance(n, ast.Name) and n.id == name
+                and isinstance(n.ctx, ast.Load)
+            ]
+            return len(loads) == 1 and any(
+                isinstance(n, ast.Return) and n.value is loads[0]
+                for n in ast.walk(function)
+            )
+    return False
+
+
+def _endpoint_error(func, is_classmethod: bool) -> Optional[str]:
+    """Why func cannot be converted to a coroutine, None if it can: an endpoint must
+    make a single request with the session of its class (cls._session_cls) and
+    return the response unchanged, and a static method must not make requests"""
+    try:
+        source = textwrap.dedent(inspect.getsource(func))
+    except (OSError, TypeError):
+        _logger.debug(f"The source of {func.__qualname__} is not available")
+        return None
+    function = ast.parse(source).body[0]
+    names = {n.id for n in ast.walk(function) if isinstance(n, ast.Name)}
+    sessions = {"AxiomaSession", "AsyncAxiomaSession"} & names
+    if sessions:
+        return f"uses {sessions.pop()} instead of cls.{_SESSION_ATTRIBUTE}"
+    apis = sorted(n for n in names if n.endswith("API"))
+    if apis:
+        return f"calls {apis[0]}"
+    if not is_classmethod:
+        return None
+    cls_name = function.args.args[0].arg
+    class_attributes = [
+        n.attr
+        for n in ast.walk(function)
+        if isinstance(n, ast.Attribute) and isinstance(n.value, ast.Name)
+        and n.value.id == cls_name
+    ]
+    requests = [n for n in ast.walk(function) if _is_session_request(n, cls_name)]
+    if set(class_attributes) - {_SESSION_ATTRIBUTE}:
+        return "calls other endpoints"
+    if len(requests) != 1 or len(class_attributes) != 1:
+        return "does not make a single request"
+    if not _is_returned(function, requests[0]):
+        return "uses the response of its request"
+    return None
+
+
+def _as_coroutine(func):
+    @functools.wraps(func)
+    async def endpoint(cls, *args, **kwargs):
+        return await func(cls, *args, **kwargs)
+
+    return endpoint
+
+
+def async_api(api_cls: type) -> type:
+    """Class decorator making a subclass of a sync api class the async version of it.
+
+    The endpoints of the api classes are class methods making their request with
+    the session class of the api class (_session_cls.current), the decorated class
+    uses AsyncAxiomaSession and its inherited endpoints are replaced with coroutines
+    awaiting the request. Methods that are already coroutines (e.g. defined on the
+    decorated class) are left unchanged.
+
+    Args:
+        api_cls (type): a subclass of the sync api class
+
+    Returns:
+        type: the decorated class
+
+    Raises:
+        AxiomaTypeError: an inherited method uses the response of its request, makes
+            several requests or does not use the session of the api class, it must
+            be defined as a coroutine on the decorated class
+    """
+    setattr(api_cls, _SESSION_ATTRIBUTE, AsyncAxiomaSession)
+    for name in dir(api_cls):
+        if name.startswith("_"):
+            continue
+        member = inspect.getattr_static(api_cls, name)
+        if not isinstance(member, (staticmethod, classmethod)):
+            continue
+        func = member.__func__
+        if inspect.iscoroutinefunction(func) or inspect.isgeneratorfunction(func):
+            continue
+        is_classmethod = isinstance(member, classmethod)
+        error = _endpoint_error(func, is_classmethod)
+        if error is not None:
+            raise AxiomaTypeError(
+                f"{func.__qualname__} {error} so {api_cls.__name__} cannot convert "
+                "it, define it as a coroutine on the async api class"
+            )
+        if is_classmethod:
+            setattr(api_cls, name, classmethod(_as_coroutine(func)))
+    return api_cls
+
+
+@async_api
+class AsyncAnalysesAPI(AnalysesAPI):
+    """Async version of AnalysesAPI using the active async session
+
+    """
+
+    @staticmethod
+    async def get_analysis_is_running(
+        request_id: int
+    ) -> bool:
+        """This method checks if the analysis is still running
+        Args:
+            request_id: The request id for the analysis.
+
+        Returns:
+            True if the analysis is running, else False.
+        """
+        response = await AsyncAnalysesAPI.get_analyses_status(
+            request_id=request_id
+        )
+        status = response.json().get("status", None)
+        finished_or_unknown = status and not AnalysesAPI.status_is_running(status)
+        return not finished_or_unknown
+
+
+@async_api
+class AsyncAnalysesRiskAPI(AnalysesRiskAPI, AsyncAnalysesAPI):
+    """Async version of AnalysesRiskAPI using the active async session
+
+    """
+
+
+@async_api
+class AsyncAnalysesPerformanceAPI(AnalysesPerformanceAPI):
+    """Async version of AnalysesPerformanceAPI using the active async session
+
+    """
+
+    @staticmethod
+    async def fetch_all_results(
+        request_id: int,
+        reports: Iterable[str] = None,
+        directory: PathLike = None,
+        as_csv: bool = False,
+        max_concurrency: int = None,
+    ) -> Dict[str, Any]:
+        """Async version of AnalysesPerformanceAPI.fetch_all_results, the reports are
+        requested concurrently by the event loop instead of a thread pool"""
+        names = _performance_reports(reports)
+        if directory is not None:
+            directory = Path(directory)
+            directory.mkdir(parents=True, exist_ok=True)
+        limit = asyncio.Semaphore(max_concurrency or max(len(names), 1))
+
+        async def fetch(name: str):
+            method_name, kwargs = _report_request(name, directory is not None, as_csv)
+            async with limit:
+                response = await getattr(AsyncAnalysesPerformanceAPI, method_name)(
+                    request_id, **kwargs
+                )
+                if directory is None:
+                    return response
+                path = _report_path(directory, request_id, name, response)
+                await response.adownload_to(path)
+                return path
+
+        responses = await asyncio.gather(*(fetch(name) for name in names))
+        return dict(zip(names, responses))
+
+
+@async_api
+class AsyncAnalysisDefinitionAPI(AnalysisDefinitionAPI):
+    """Async version of AnalysisDefinitionAPI using the active async session
+
+    """
+
+
+@async_api
+class AsyncBatchDefinitionsAPI(BatchDefinitionsAPI):
+    """Async version of BatchDefinitionsAPI using the active async session
+
+    """
+
+
+@async_api
+class AsyncBulkAPI(BulkAPI):
+    """Async version of BulkAPI using the active async session
+
+    """
+
+
+@async_api
+class AsyncEntitiesAPI(EntitiesAPI):
+    """Async version of EntitiesAPI using the active async session
+
+    """
+
+
+@async_api
+class AsyncMarketDataSourcesAPI(MarketDataSourcesAPI):
+    """Async version of MarketDataSourcesAPI using the active async session
+
+    """
+
+
+@async_api
+class AsyncMetaDataAPI(MetaDataAPI):
+    """Async version of MetaDataAPI using the active async session
+
+    """
+
+
+@async_api
+class AsyncPortfolioGroupsAPI(PortfolioGroupsAPI):
+    """Async version of PortfolioGroupsAPI using the active async session
+
+    """
+
+
+@async_api
+class AsyncPortfoliosAPI(PortfoliosAPI):
+    """Async version of PortfoliosAPI using the active async session
+
+    """
+
+
+@async_api
+class AsyncRiskModelDefinitionsAPI(RiskModelDefinitionsAPI):
+    """Async version of RiskModelDefinitionsAPI using the active async session
+
+    """
+
+
+@async_api
+class AsyncTemplatesAPI(TemplatesAPI):
+    """Async version of TemplatesAPI using the active async session
+
+    """
+
+
+@async_api
+class AsyncClientEventBusAPI(ClientEventBusAPI):
+    """Async version of ClientEventBusAPI using the active async session
+
+    """
+
+
+@async_api
+class AsyncAdminAPI(AdminAPI):
+    """Async version of AdminAPI using the active async session
+
+    """
@@ -27,8 +27,11 @@ class BatchDefinitionsAPI:
 
     """
 
-    @staticmethod
+    _session_cls = AxiomaSession
+
+    @classmethod
     def get_batch_definitions(
+        cls,
         filter_results: str = None,
         top: int = None,
         skip: int = None,
@@ -52,7 +55,7 @@ class BatchDefinitionsAPI:
         url = "/batch-definitions"
         params = odata_params(filter_results, top, skip, orderby)
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url,
             params=params,
             return_response=return_response,
@@ -60,8 +63,9 @@ class BatchDefinitionsAPI:
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_batch_definition(
+        cls,
         batch_definition_id: str,
         headers: dict = None,
         return_response: bool = False,
@@ -78,7 +82,7 @@ class BatchDefinitionsAPI:
         """
         url = f"/batch-definitions/{batch_definition_id}"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, return_response=return_response, headers=headers
         )
         return response
@@ -15,7 +15,7 @@ under the License.
 
 """
 import logging
-from axiomapy.session import AxiomaSession
+from axiomapy.session import APIType, AxiomaSession
 from typing import Union
 
 _logger = logging.getLogger(__name__)
@@ -29,8 +29,11 @@ class BulkAPI:
         [type]: [description]
     """
 
-    @staticmethod
+    _session_cls = AxiomaSession
+
+    @classmethod
     def patch_portfolios_payload(
+        cls,
         as_of_date: str,
             payload: Union[dict, bytes],
             headers: dict = None,
@@ -41,6 +44,8 @@ class BulkAPI:
         Args:
             as_of_date: date on which portfolios need to be updated
             payload: portfolios along with update/remove properties; can be dictionary or compressed
+                (set the Content-Encoding header). Large dictionaries are compressed by
+                the session when it has a CompressionPolicy
             headers: Optional headers, if any required (Content-Encoding for zip , Accept-Encoding)
             return_response: If set to true, the response will be returned.
 
@@ -49,14 +54,16 @@ class BulkAPI:
         """
         url = f"/positions/{as_of_date}"
         _logger.info(f"Patching to {url}")
-        response = AxiomaSession.current._patch(
-            url, payload, headers=headers, return_response=return_response
+        response = cls._session_cls.current._patch(
+            url, payload, headers=headers, return_response=return_response,
+            api_type=APIType.BULK,
         )
 
         return response
 
-    @staticmethod
+    @classmethod
     def post_rollover_positions(
+            cls,
             payload: dict,
             headers: dict = None,
             return_response: bool = True
@@ -73,8 +80,9 @@ class BulkAPI:
         """
         url = f"/positions/rollover-requests"
         _logger.info(f"Posting to {url}")
-        response = AxiomaSession.current._post(
-            url, payload, headers=headers, return_response=return_response
+        response = cls._session_cls.current._post(
+            url, payload, headers=headers, return_response=return_response,
+            api_type=APIType.BULK,
         )
 
         return response
\ No newline at end of file
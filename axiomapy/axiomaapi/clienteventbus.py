@@ -16,7 +16,7 @@ under the License.
 """
 
 import logging
-from axiomapy.session import AxiomaSession
+from axiomapy.session import APIType, AxiomaSession
 from axiomapy.utils import odata_params
 
 _logger = logging.getLogger(__name__)
@@ -27,8 +27,10 @@ class ClientEventBusAPI:
     """Access to Axioma Client Event Bus endpoints using the active session
     """
 
-    @staticmethod
-    def get_events(return_response: bool = True):
+    _session_cls = AxiomaSession
+
+    @classmethod
+    def get_events(cls, return_response: bool = True):
         """The method is to get links to event resources
 
         Args:
@@ -39,13 +41,14 @@ class ClientEventBusAPI:
         """
         url = "/events"
         _logger.info(f"Get to {url}")
-        response = AxiomaSession.current._get(
-            url, return_response=return_response
+        response = cls._session_cls.current._get(
+            url, return_response=return_response,
+            api_type=APIType.CEB,
         )
         return response
 
-    @staticmethod
-    def get_all_market_data(date: str,
+    @classmethod
+    def get_all_market_data(cls, date: str,
                             sort_order: str = 'desc',
                             filter_results: str = None,
                             top: int = None,
@@ -78,13 +81,14 @@ class ClientEventBusAPI:
         url = f"/events/market-data?$filter={filter_query}"
         _logger.info(f"Get to {url}")
         params = odata_params(o_top=top, o_skip=skip, o_orderby=order_param)
-        response = AxiomaSession.current._get(
-            url, params=params, return_response=return_response
+        response = cls._session_cls.current._get(
+            url, params=params, return_response=return_response,
+            api_type=APIType.CEB,
         )
         return response
 
-    @staticmethod
-    def get_market_data(market_data_id: str,
+    @classmethod
+    def get_market_data(cls, market_data_id: str,
                         return_response: bool = True):
         """
         This function is used to fetch a market data event
@@ -98,7 +102,8 @@ class ClientEventBusAPI:
         """
         url = f"/events/market-data/{market_data_id}"
         _logger.info(f"Get to {url}")
-        response = AxiomaSession.current._get(
-            url, return_response=return_response
+        response = cls._session_cls.current._get(
+            url, return_response=return_response,
+            api_type=APIType.CEB,
         )
         return response
@@ -28,8 +28,11 @@ class EntitiesAPI:
 
     """
 
-    @staticmethod
+    _session_cls = AxiomaSession
+
+    @classmethod
     def get_entity_links(
+        cls,
         filter_results: str = None,
         top: int = None,
         skip: int = None,
@@ -53,13 +56,14 @@ class EntitiesAPI:
         url = "/entities"
         params = odata_params(filter_results, top, skip, orderby)
         _logger.info(f"Getting entity links from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, params=params, headers=headers, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_entities(
+        cls,
         typeName1: str = "*",
         typeName2: str = "*",
         filter_results: str = None,
@@ -87,13 +91,14 @@ class EntitiesAPI:
         url = f"/entities/{typeName1}/{typeName2}"
         params = odata_params(filter_results, top, skip, orderby)
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, params=params, headers=headers, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_entity(
+        cls,
         id_: int,
         typeName1: str = "*",
         typeName2: str = "*",
@@ -114,13 +119,14 @@ class EntitiesAPI:
         """
         url = f"/entities/{typeName1}/{typeName2}/{id_}"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, headers=headers, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def delete_entity(
+        cls,
         id_: int,
         typeName1: str = "*",
         typeName2: str = "*",
@@ -140,7 +146,7 @@ class EntitiesAPI:
         """
         url = f"/entities/{typeName1}/{typeName2}/{id_}"
         _logger.info(f"Delete request to {url}")
-        response = AxiomaSession.current._delete(
+        response = cls._session_cls.current._delete(
             url, headers=headers, return_response=return_response
         )
         return response
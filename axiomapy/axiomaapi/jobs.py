@@ -0,0 +1,744 @@
+"""
+Copyright © 2024 Axioma by SimCorp.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+"""
+import asyncio
+import collections
+import concurrent.futures
+import heapq
+import inspect
+import itertools
+import logging
+import random
+import threading
+import time
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Union,
+)
+
+from axiomapy.axiomaexceptions import (
+    AxiomaJobCancelledError,
+    AxiomaJobError,
+    AxiomaJobTimeoutError,
+    AxiomaUninitialisedError,
+    AxiomaValueError,
+)
+from axiomapy.context import as_current
+from axiomapy.session import AsyncAxiomaSession, AxiomaSession
+
+from .analyses import AnalysesAPI, AnalysesPerformanceAPI, AnalysesRiskAPI
+from .enums import Status
+
+_logger = logging.getLogger(__name__)
+_logger.addHandler(logging.NullHandler())
+
+# seconds between the checks for added jobs while a JobPoller is open
+_OPEN_WAIT = 0.05
+
+_TERMINAL_STATUSES = frozenset(
+    (Status.Completed, Status.Failed, Status.PostProcessingFailed)
+)
+
+
+def parse_status(status: Union[str, Status, None]) -> Union[Status, str, None]:
+    """The Status of a status string in any case (e.g. "completed"), statuses that
+    are not members of Status are returned unchanged"""
+    if status is None or isinstance(status, Status):
+        return status
+    try:
+        return Status(status)
+    except ValueError:
+        return status
+
+
+def is_finished(status: Union[str, Status, None]) -> bool:
+    """True if the status is Completed, Failed or PostProcessingFailed"""
+    return parse_status(status) in _TERMINAL_STATUSES
+
+
+def request_id_from_response(response: Any) -> int:
+    """The request id in the location header of the response of a request
+    submitting an analysis, the last numeric segment of the location (e.g. 42 of
+    /analyses/42 or /analyses/performance/42/status)"""
+    location = response.headers["location"]
+    for segment in reversed(location.split("?")[0].rstrip("/").split("/")):
+        if segment.isdigit():
+            return int(segment)
+    raise AxiomaValueError(f"The location {location} does not contain a request id")
+
+
+class PollingPolicy:
+    """How often the status of a job is requested.
+
+    The first status request is made immediately and the interval then grows from
+    initial_interval by multiplier up to max_interval, so short jobs complete within
+    a fraction of a second while long jobs make a request every max_interval seconds.
+    Each interval is randomised by +/- jitter so jobs submitted together do not poll
+    together.
+
+    Args:
+        initial_interval (float): Seconds before the second status request
+        multiplier (float): Growth of the interval after every request
+        max_interval (float): Maximum seconds between two status requests
+        timeout (float): Default seconds to wait for a job, None to wait forever
+        jitter (float): Fraction of the interval that is randomised
+    """
+
+    def __init__(
+        self,
+        initial_interval: float = 0.1,
+        multiplier: float = 1.5,
+        max_interval: float = 10.0,
+        timeout: Optional[float] = None,
+        jitter: float = 0.1,
+    ):
+        if initial_interval <= 0 or max_interval < initial_interval:
+            raise AxiomaValueError(
+                "initial_interval must be positive and not larger than max_interval"
+            )
+        if multiplier < 1:
+            raise AxiomaValueError(f"multiplier must be at least 1, got {multiplier}")
+        if not 0 <= jitter < 1:
+            raise AxiomaValueError(f"jitter must be between 0 and 1, got {jitter}")
+        self.initial_interval = initial_interval
+        self.multiplier = multiplier
+        self.max_interval = max_interval
+        self.timeout = timeout
+        self.jitter = jitter
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(initial_interval={self.initial_interval}, "
+            f"multiplier={self.multiplier}, max_interval={self.max_interval}, "
+            f"timeout={self.timeout})"
+        )
+
+    def interval(self, attempt: int) -> float:
+        """Seconds to wait after the status request
+
+        Args:
+            attempt (int): the number of status requests made before this one
+        """
+        base = min(
+            self.max_interval, self.initial_interval * self.multiplier ** attempt
+        )
+        return base * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def intervals(self) -> Iterator[float]:
+        """The (endless) intervals between the status requests"""
+        attempt = 0
+        while True:
+            yield self.interval(attempt)
+            attempt += 1
+
+
+DEFAULT_POLLING_POLICY = PollingPolicy()
+
+
+class AnalysisJob:
+    """A submitted analysis request that can be waited for, like a future.
+
+    wait() and result() block the calling thread, awaiting the job (or calling
+    wait_async / result_async) waits without blocking the event loop. The status
+    and result functions are called with the request id, they may be the methods
+    of a sync api class or coroutines of an async api class.
+
+    Example:
+        response = AnalysesRiskAPI.post_portfolio_analyses(1, parameters)
+        job = AnalysisJob.analysis(response)
+        results = job.result(timeout=600)
+
+        # with the async session
+        job = AnalysisJob.analysis(response, api=AsyncAnalysesAPI)
+        status = await job
+
+    Args:
+        request_id (int): The id of the request
+        status_fn (Callable): Returns the status response of the request
+        result_fn (Callable): Returns the results of the request
+        policy (PollingPolicy): The intervals between the status requests and the
+            default timeout
+        cancel_fn (Callable): Optional request cancelling the job on the server,
+            made with the session (and for a coroutine on the event loop) that was
+            current when the job was created
+    """
+
+    def __init__(
+        self,
+        request_id: int,
+        status_fn: Callable[[int], Any],
+        result_fn: Callable[[int], Any] = None,
+        policy: PollingPolicy = None,
+        cancel_fn: Callable[[int], Any] = None,
+    ):
+        self.request_id = request_id
+        self.status_fn = status_fn
+        self.result_fn = result_fn
+        self.policy = policy or DEFAULT_POLLING_POLICY
+        self.cancel_fn = cancel_fn
+        self.status = None
+        self.status_response = None
+        self.polls = 0
+        # the error raised by the last status request made by a JobPoller
+        self.error = None
+        self._cancelled = threading.Event()
+        self._async_cancelled = None
+        # cancel() may be called from another thread
+        self._session = _current_session(AxiomaSession)
+        self._async_session = _current_session(AsyncAxiomaSession)
+        self._loop = _running_loop()
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(request_id={self.request_id}, "
+            f"status={self.status})"
+        )
+
+    @classmethod
+    def _create(cls, request, status_fn, result_fn, **kwargs) -> "AnalysisJob":
+        request_id = request if isinstance(request, int) else request_id_from_response(
+            request
+        )
+        return cls(request_id, status_fn, result_fn, **kwargs)
+
+    @classmethod
+    def analysis(cls, request, api: type = AnalysesAPI, **kwargs) -> "AnalysisJob":
+        """A portfolio, positions or instrument analysis
+
+        Args:
+            request (Union[int, AxiomaResponse]): the request id or the response of
+                the request submitting the analysis
+            api (type): AnalysesAPI or AsyncAnalysesAPI
+            kwargs: the other arguments of AnalysisJob
+
+        Returns:
+            AnalysisJob: the job
+        """
+        return cls._create(
+            request, api.get_analyses_status, api.get_analyses, **kwargs
+        )
+
+    @classmethod
+    def risk_model(
+        cls, request, api: type = AnalysesRiskAPI, **kwargs
+    ) -> "AnalysisJob":
+        """A risk model request, see analysis"""
+        return cls._create(
+            request,
+            api.get_risk_model_request_status,
+            api.get_risk_model_results,
+            **kwargs,
+        )
+
+    @classmethod
+    def batch(cls, request, api: type = AnalysesRiskAPI, **kwargs) -> "AnalysisJob":
+        """A batch analysis request, the result is the batch request, see analysis"""
+        return cls._create(
+            request, api.get_batch_request_status, api.get_batch_request, **kwargs
+        )
+
+    @classmethod
+    def performance(
+        cls, request, api: type = AnalysesPerformanceAPI, **kwargs
+    ) -> "AnalysisJob":
+        """A performance attribution request, the result is the summary, see
+        analysis"""
+        return cls._create(
+            request, api.get_status, api.get_results_summary, **kwargs
+        )
+
+    def done(self) -> bool:
+        """True if the last status polled is final (Completed or failed)"""
+        return is_finished(self.status)
+
+    def succeeded(self) -> bool:
+        return self.status == Status.Completed
+
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        """Stops waiting for the job, wait() and result() raise
+        AxiomaJobCancelledError. The job is cancelled on the server if the job has a
+        cancel_fn. Can be called from another thread."""
+        if self.done() or self.cancelled():
+            return
+        self._cancelled.set()
+        if self._async_cancelled is not None:
+            loop, event = self._async_cancelled
+            loop.call_soon_threadsafe(event.set)
+        if self.cancel_fn is not None:
+            self._cancel_on_server()
+        _logger.info(f"Cancelled waiting for the request {self.request_id}")
+
+    def _cancel_on_server(self):
+        if self._session is None:
+            response = self.cancel_fn(self.request_id)
+        else:
+            with as_current(self._session):
+                response = self.cancel_fn(self.request_id)
+        if not inspect.isawaitable(response):
+            return
+
+        async def send():
+            await response
+
+        # an async api, the request is sent by the event loop of the wait or the
+        # loop the job was created on
+        loop = self._async_cancelled[0] if self._async_cancelled else self._loop
+        running = _running_loop()
+        if loop is not None and loop.is_running() and loop is not running:
+            asyncio.run_coroutine_threadsafe(send(), loop)
+        elif running is not None:
+            running.create_task(send())
+        elif self._async_session is None:
+            asyncio.run(send())
+        else:
+            with as_current(self._async_session):
+                asyncio.run(send())
+
+    def _update(self, response: Any) -> Union[Status, str, None]:
+        self.polls += 1
+        self.status_response = response
+        body = response.json() if hasattr(response, "json") else response
+        self.status = parse_status((body or {}).get("status"))
+        _logger.debug(
+            f"Request {self.request_id} is {self.status} after {self.polls} polls"
+        )
+        return self.status
+
+    def poll(self) -> Union[Status, str, None]:
+        """Requests the status of the job
+
+        Returns:
+            Union[Status, str, None]: the status
+        """
+        return self._update(self.status_fn(self.request_id))
+
+    async def poll_async(self) -> Union[Status, str, None]:
+        """Async version of poll, the status function may be a coroutine"""
+        response = self.status_fn(self.request_id)
+        if inspect.isawaitable(response):
+            response = await response
+        return self._update(response)
+
+    def _check_cancelled(self):
+        if self.cancelled():
+            raise AxiomaJobCancelledError(
+                f"Waiting for the request {self.request_id} was cancelled",
+                self.request_id,
+                self.status,
+            )
+
+    def _timeout_error(self, timeout: float) -> AxiomaJobTimeoutError:
+        return AxiomaJobTimeoutError(
+            f"The request {self.request_id} did not finish within {timeout}s "
+            f"(status {self.status})",
+            self.request_id,
+            self.status,
+        )
+
+    def wait(self, timeout: Optional[float] = None) -> Union[Status, str]:
+        """Polls the status until the job is finished
+
+        Args:
+            timeout (float): Seconds to wait, defaults to the timeout of the policy
+
+        Returns:
+            Union[Status, str]: the final status (Completed or a failed status)
+
+        Raises:
+            AxiomaJobTimeoutError: the job did not finish within the timeout
+            AxiomaJobCancelledError: cancel() was called
+        """
+        timeout = self.policy.timeout if timeout is None else timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+        intervals = self.policy.intervals()
+        while True:
+            self._check_cancelled()
+            if self.done() or is_finished(self.poll()):
+                return self.status
+            delay = next(intervals)
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise self._timeout_error(timeout)
+                delay = min(delay, remaining)
+            # returns early when cancel() is called
+            self._cancelled.wait(delay)
+
+    async def wait_async(self, timeout: Optional[float] = None) -> Union[Status, str]:
+        """Async version of wait, see wait"""
+        timeout = self.policy.timeout if timeout is None else timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+        intervals = self.policy.intervals()
+        event = asyncio.Event()
+        self._async_cancelled = (asyncio.get_running_loop(), event)
+        try:
+            while True:
+                self._check_cancelled()
+                if self.done() or is_finished(await self.poll_async()):
+                    return self.status
+                delay = next(intervals)
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise self._timeout_error(timeout)
+                    delay = min(delay, remaining)
+                try:
+                    await asyncio.wait_for(event.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._async_cancelled = None
+
+    def __await__(self):
+        return self.wait_async().__await__()
+
+    def _check_succeeded(self):
+        if not self.succeeded():
+            raise AxiomaJobError(
+                f"The request {self.request_id} finished with status {self.status}",
+                self.request_id,
+                self.status,
+            )
+
+    def result(self, timeout: Optional[float] = None, **kwargs) -> Any:
+        """Waits for the job and returns its results
+
+        Args:
+            timeout (float): Seconds to wait, defaults to the timeout of the policy
+            kwargs: arguments of the result function (e.g. stream=True)
+
+        Returns:
+            Any: the results
+
+        Raises:
+            AxiomaJobError: the job failed, timed out or was cancelled
+        """
+        self.wait(timeout)
+        self._check_succeeded()
+        if self.result_fn is None:
+            return self.status_response
+        return self.result_fn(self.request_id, **kwargs)
+
+    async def result_async(self, timeout: Optional[float] = None, **kwargs) -> Any:
+        """Async version of result, see result"""
+        await self.wait_async(timeout)
+        self._check_succeeded()
+        if self.result_fn is None:
+            return self.status_response
+        result = self.result_fn(self.request_id, **kwargs)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+
+def _current_session(session_cls: type):
+    """The current session of the thread, None if there is none"""
+    try:
+        return session_cls.current
+    except AxiomaUninitialisedError:
+        return None
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _in_current_session(func: Callable) -> Callable:
+    """Wraps func to run with the current session of the calling thread, the
+    current session is thread local so it is not set in the worker threads. The
+    session is made current without entering it (which is not thread safe)."""
+    session = _current_session(AxiomaSession)
+    if session is None:
+        return func
+
+    def run(*args):
+        with as_current(session):
+            return func(*args)
+
+    return run
+
+
+class _PollEntry:
+    """A job tracked by a JobPoller"""
+
+    __slots__ = ("job", "priority", "callback", "intervals", "seq", "errors")
+
+    def __init__(self, job, priority, callback, seq):
+        self.job = job
+        self.priority = priority
+        self.callback = callback
+        self.intervals = job.policy.intervals()
+        self.seq = seq
+        # the number of consecutive status requests that raised an error
+        self.errors = 0
+
+
+class JobPoller:
+    """Tracks many outstanding jobs with one scheduler instead of a blocking loop
+    per job.
+
+    Each job is polled with the intervals of its own PollingPolicy. At most
+    max_concurrency status requests are in flight, and when more jobs are due than
+    can be polled the jobs with the lowest priority value are polled first. The
+    finished jobs are yielded (and their callbacks called) as they finish, in the
+    order they finish.
+
+    The sync iter_completed polls from a thread pool, the async as_completed from
+    the event loop (the status functions of the async api classes are awaited, sync
+    status functions are run in the default executor).
+
+    Example:
+        poller = JobPoller(max_concurrency=20)
+        for response in responses:
+            poller.add(AnalysisJob.analysis(response))
+        for job in poller.iter_completed(timeout=3600):
+            results = job.result()
+
+    Jobs can be added while the jobs are iterated, from any thread. Call open()
+    before iterating to keep waiting for jobs when all the jobs added so far are
+    finished, and close() once the last job is added.
+
+    A status request that raises an error (e.g. a dropped connection) is retried
+    after the next interval of the policy. The job stops being tracked, with the
+    error in job.error, when max_status_errors consecutive status requests failed.
+
+    Args:
+        max_concurrency (int): The maximum number of status requests in flight
+        max_status_errors (int): The number of consecutive failed status requests
+            after which a job is given up
+    """
+
+    def __init__(self, max_concurrency: int = 10, max_status_errors: int = 3):
+        if max_concurrency < 1:
+            raise AxiomaValueError(
+                f"max_concurrency must be positive, got {max_concurrency}"
+            )
+        if max_status_errors < 1:
+            raise AxiomaValueError(
+                f"max_status_errors must be positive, got {max_status_errors}"
+            )
+        self.max_concurrency = max_concurrency
+        self.max_status_errors = max_status_errors
+        # (due time, seq, entry) of the jobs waiting for their next poll
+        self._waiting = []
+        # (priority, seq, entry) of the jobs due to be polled
+        self._ready = []
+        # the jobs added and not yet moved to the ready queue by the poll loop
+        self._incoming = collections.deque()
+        self._seq = itertools.count()
+        self._open = False
+        self._wake = threading.Event()
+
+    def __len__(self):
+        """The number of jobs that are not finished"""
+        return len(self._waiting) + len(self._ready) + len(self._incoming)
+
+    def open(self) -> None:
+        """Keeps iterating when all the jobs are finished, until close() is called"""
+        self._open = True
+
+    def close(self) -> None:
+        """Stops iterating once all the jobs are finished"""
+        self._open = False
+        self._wake.set()
+
+    def add(
+        self,
+        job: AnalysisJob,
+        priority: int = 0,
+        callback: Callable[[AnalysisJob], Any] = None,
+    ) -> AnalysisJob:
+        """Tracks the job, it is polled as soon as there is capacity
+
+        Args:
+            job (AnalysisJob): the job
+            priority (int): jobs with lower values are polled first
+            callback (Callable[[AnalysisJob], Any]): called with the job when it is
+                finished, failed, cancelled or given up after max_status_errors
+                failed status requests
+
+        Returns:
+            AnalysisJob: the job
+        """
+        self._incoming.append((priority, callback, job))
+        self._wake.set()
+        return job
+
+    def add_all(self, jobs: Iterable[AnalysisJob], priority: int = 0, callback=None):
+        """Tracks the jobs, see add"""
+        for job in jobs:
+            self.add(job, priority, callback)
+
+    def _pending(self, running) -> bool:
+        return bool(
+            self._open or self._waiting or self._ready or self._incoming or running
+        )
+
+    def _promote(self, now: float):
+        """Moves the jobs added and the jobs that are due to the ready queue"""
+        self._wake.clear()
+        while self._incoming:
+            priority, callback, job = self._incoming.popleft()
+            seq = next(self._seq)
+            entry = _PollEntry(job, priority, callback, seq)
+            heapq.heappush(self._ready, (priority, seq, entry))
+        while self._waiting and self._waiting[0][0] <= now:
+            _, seq, entry = heapq.heappop(self._waiting)
+            heapq.heappush(self._ready, (entry.priority, seq, entry))
+
+    def _next_ready(self) -> Optional[_PollEntry]:
+        return heapq.heappop(self._ready)[2] if self._ready else None
+
+    def _wait_time(self, now: float, deadline: Optional[float]) -> Optional[float]:
+        """Seconds until the next job is due (None if no job is waiting)"""
+        wait = max(0.0, self._waiting[0][0] - now) if self._waiting else None
+        if self._open:
+            wait = _OPEN_WAIT if wait is None else min(wait, _OPEN_WAIT)
+        if deadline is not None:
+            remaining = max(0.0, deadline - now)
+            wait = remaining if wait is None else min(wait, remaining)
+        return wait
+
+    def _polled(self, entry: _PollEntry, error: BaseException = None) -> bool:
+        """Records the result of a status request, True if the job is finished"""
+        job = entry.job
+        job.error = error
+        entry.errors = 0 if error is None else entry.errors + 1
+        if error is not None:
+            _logger.warning(
+                f"The status request of the request {job.request_id} failed "
+                f"({entry.errors}/{self.max_status_errors}): {error}"
+            )
+        retry = error is not None and entry.errors < self.max_status_errors
+        if (retry or error is None and not job.done()) and not job.cancelled():
+            due = time.monotonic() + next(entry.intervals)
+            heapq.heappush(self._waiting, (due, entry.seq, entry))
+            return False
+        if entry.callback is not None:
+            entry.callback(job)
+        return True
+
+    def _check_deadline(self, deadline: Optional[float], timeout: float, running):
+        if deadline is not None and time.monotonic() >= deadline:
+            pending = len(self) + len(running)
+            raise AxiomaJobTimeoutError(
+                f"{pending} jobs did not finish within {timeout}s"
+            )
+
+    def iter_completed(self, timeout: Optional[float] = None) -> Iterator[AnalysisJob]:
+        """Polls the jobs and yields them as they finish
+
+        Args:
+            timeout (float): Seconds to wait for all the jobs, None to wait forever
+
+        Returns:
+            Iterator[AnalysisJob]: the finished jobs
+
+        Raises:
+            AxiomaJobTimeoutError: jobs are not finished within the timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        running = {}
+        poll = _in_current_session(lambda job: job.poll())
+        with concurrent.futures.ThreadPoolExecutor(self.max_concurrency) as pool:
+            while self._pending(running):
+                self._promote(time.monotonic())
+                while len(running) < self.max_concurrency and self._ready:
+                    entry = self._next_ready()
+                    if entry.job.cancelled():
+                        self._polled(entry)
+                        yield entry.job
+                        continue
+                    running[pool.submit(poll, entry.job)] = entry
+                wait = self._wait_time(time.monotonic(), deadline)
+                if running:
+                    done, _ = concurrent.futures.wait(
+                        running, wait, concurrent.futures.FIRST_COMPLETED
+                    )
+                    for future in done:
+                        entry = running.pop(future)
+                        if self._polled(entry, future.exception()):
+                            yield entry.job
+                elif wait is None or wait > 0:
+                    # returns early when a job is added or the poller is closed
+                    self._wake.wait(wait)
+                self._check_deadline(deadline, timeout, running)
+
+    def run(self, timeout: Optional[float] = None) -> List[AnalysisJob]:
+        """Polls the jobs until they are all finished
+
+        Args:
+            timeout (float): Seconds to wait for all the jobs, None to wait forever
+
+        Returns:
+            List[AnalysisJob]: the jobs in the order they finished
+        """
+        return list(self.iter_completed(timeout))
+
+    @staticmethod
+    async def _apoll(job: AnalysisJob):
+        if inspect.iscoroutinefunction(job.status_fn):
+            return await job.poll_async()
+        return await asyncio.get_running_loop().run_in_executor(
+            None, _in_current_session(lambda: job.poll())
+        )
+
+    async def as_completed(
+        self, timeout: Optional[float] = None
+    ) -> AsyncIterator[AnalysisJob]:
+        """Async version of iter_completed"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        running = {}
+        try:
+            while self._pending(running):
+                self._promote(time.monotonic())
+                while len(running) < self.max_concurrency and self._ready:
+                    entry = self._next_ready()
+                    if entry.job.cancelled():
+                        self._polled(entry)
+                        yield entry.job
+                        continue
+                    running[asyncio.ensure_future(self._apoll(entry.job))] = entry
+                wait = self._wait_time(time.monotonic(), deadline)
+                if running:
+                    done, _ = await asyncio.wait(
+                        running, timeout=wait, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        entry = running.pop(task)
+                        if self._polled(entry, task.exception()):
+                            yield entry.job
+                elif wait is None or wait > 0:
+                    await asyncio.sleep(_OPEN_WAIT if wait is None else wait)
+                self._check_deadline(deadline, timeout, running)
+        finally:
+            for task in running:
+                task.cancel()
+
+    async def arun(self, timeout: Optional[float] = None) -> List[AnalysisJob]:
+        """Async version of run"""
+        return [job async for job in self.as_completed(timeout)]
@@ -29,8 +29,11 @@ class MarketDataSourcesAPI:
 
     """
 
-    @staticmethod
+    _session_cls = AxiomaSession
+
+    @classmethod
     def get_market_data_sources(
+        cls,
         filter_results: str = None,
         top: int = None,
         skip: int = None,
@@ -52,13 +55,14 @@ class MarketDataSourcesAPI:
         url = "/market-data-sources"
         params = odata_params(filter_results, top, skip, orderby)
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, params=params, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_market_data_source(
+        cls,
         market_data_source_id: int,
         return_response: bool = False,
     ):
@@ -73,14 +77,15 @@ class MarketDataSourcesAPI:
         """
         url = f"/market-data-sources/{market_data_source_id}"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, return_response=return_response
         )
         return response
 
 
-    @staticmethod
+    @classmethod
     def get_market_data_instrument_attributes_at_date(
+        cls,
         market_data_source_id: int,
         as_of_date: str,
         filter_results: str = None,
@@ -109,13 +114,14 @@ class MarketDataSourcesAPI:
         )
         params = odata_params(filter_results, top, skip, orderby)
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, params=params, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def patch_market_data_instrument_attributes(
+        cls,
         market_data_source_id: int,
         instrument_attributes_upsert: List[dict] = None,
         instrument_attributes_remove: List[dict] = None,
@@ -142,13 +148,14 @@ class MarketDataSourcesAPI:
             "upsert": instrument_attributes_upsert,
             "remove": instrument_attributes_remove,
         }
-        response = AxiomaSession.current._patch(
+        response = cls._session_cls.current._patch(
             url, instrument_attributes_patch, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_market_data_instrument_scenarios_dates(
+        cls,
         market_data_source_id: int,
         return_response: bool = False,
     ):
@@ -163,13 +170,14 @@ class MarketDataSourcesAPI:
         """
         url = f"/market-data-sources/{market_data_source_id}/instrument-scenarios"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_market_data_instrument_scenarios_at_date(
+        cls,
         market_data_source_id: int,
         as_of_date: str,
         filter_results: str = None,
@@ -198,13 +206,14 @@ class MarketDataSourcesAPI:
         )
         params = odata_params(filter_results, top, skip, orderby)
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, params=params, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def patch_market_data_instrument_scenarios_at_date(
+        cls,
         market_data_source_id: int,
         as_of_date: str,
         instrument_scenarios_upsert: List[dict] = None,
@@ -236,7 +245,7 @@ class MarketDataSourcesAPI:
             "upsert": instrument_scenarios_upsert,
             "remove": instrument_scenarios_remove,
         }
-        response = AxiomaSession.current._patch(
+        response = cls._session_cls.current._patch(
             url, instrument_scenarios_patch, return_response=return_response
         )
         return response
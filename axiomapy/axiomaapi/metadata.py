@@ -27,8 +27,10 @@ class MetaDataAPI:
 
     """
 
-    @staticmethod
-    def get_templates(headers: dict = None, return_response: bool = False):
+    _session_cls = AxiomaSession
+
+    @classmethod
+    def get_templates(cls, headers: dict = None, return_response: bool = False):
         """The method lists the templates that can be used for analysis definitions
 
         Args:
@@ -40,13 +42,14 @@ class MetaDataAPI:
         """
         url = "/metadata/templates"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, headers=headers, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_template(
+        cls,
         template_name: str, headers: dict = None, return_response: bool = False
     ):
         """The method returns the template based on the template name
@@ -61,13 +64,14 @@ class MetaDataAPI:
         """
         url = f"/metadata/templates/{template_name}"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, headers=headers, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_template_schema(
+        cls,
         template_name: str, headers: dict = None, return_response: bool = False
     ):
         """The method returns the schema in use for a particular template
@@ -82,7 +86,7 @@ class MetaDataAPI:
         """
         url = f"/metadata/templates/{template_name}/schema"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, headers=headers, return_response=return_response
         )
         return response
\ No newline at end of file
@@ -0,0 +1,320 @@
+"""
+Copyright © 2024 Axioma by SimCorp.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+"""
+import asyncio
+import itertools
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Iterator, Optional
+
+import httpx
+
+from axiomapy.axiomaexceptions import AxiomaValueError
+from axiomapy.context import as_current
+from axiomapy.session import AsyncAxiomaSession, AxiomaSession
+
+_logger = logging.getLogger(__name__)
+_logger.addHandler(logging.NullHandler())
+
+DEFAULT_PAGE_SIZE = 500
+
+
+class _Page:
+    """The items of a page and how to request the next page"""
+
+    def __init__(self, response: httpx.Response, skip: int, page_size: int,
+                 items_key: str, loads: Callable = None):
+        body = (loads(response.content) if loads else response.json()) or {}
+        self.items = body.get(items_key) or []
+        self.next_url = _next_link(body, response)
+        self.skip = skip
+        self.next_skip = skip + len(self.items)
+        self.total = body.get("total", body.get("@odata.count"))
+        if self.total is not None:
+            # a short page is not the last if the server limits the page size
+            end = not self.items or self.next_skip >= self.total
+        else:
+            end = len(self.items) < page_size
+        self.is_last = self.next_url is None and end
+
+    def in_parallel(self) -> bool:
+        """True if the following pages can be requested in parallel, without a total
+        a short first page may be limited by the server so the end is only known
+        from a page past the end"""
+        if self.next_url is not None or not self.items:
+            return False
+        return not self.is_last or self.total is None
+
+
+def _next_link(body: dict, response: httpx.Response) -> Optional[str]:
+    """The absolute url of the next page if the response has a next link"""
+    href = (body.get("_links") or {}).get("next", {}).get("href") or body.get(
+        "@odata.nextLink"
+    )
+    if not href:
+        return None
+    return str(response.request.url.join(href))
+
+
+def _check_args(page_size: int, parallel_pages: int, kwargs: dict):
+    if page_size < 1:
+        raise AxiomaValueError(f"page_size must be at least 1, got {page_size}")
+    if parallel_pages < 1:
+        raise AxiomaValueError(
+            f"parallel_pages must be at least 1, got {parallel_pages}"
+        )
+    for arg in ("top", "return_response"):
+        if arg in kwargs:
+            raise AxiomaValueError(f"{arg} is set by paginate, use page_size instead")
+
+
+def _first_page(api_method: Callable, args: tuple, kwargs: dict, skip: int,
+                page_size: int):
+    return api_method(*args, top=page_size, skip=skip, return_response=True, **kwargs)
+
+
+class _Window:
+    """The $skip of the pages requested in parallel after the first page. The pages
+    are requested until the total (total or @odata.count) of the first page is
+    reached or, if the endpoint does not return a total, until a page past the end
+    (without items) is received. If the first page is short although there are more
+    items (the server limits the page size) the pages have the size of the first."""
+
+    def __init__(self, first: _Page, start: int, page_size: int, max_items: int):
+        self.next_skip = first.next_skip
+        self.page_size = min(page_size, len(first.items)) or page_size
+        end = first.total
+        if max_items is not None:
+            end = start + max_items if end is None else min(end, start + max_items)
+        self.end = end
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> int:
+        if self.end is not None and self.next_skip >= self.end:
+            raise StopIteration
+        skip = self.next_skip
+        self.next_skip += self.page_size
+        return skip
+
+
+def _window_done(page: _Page, window: _Window, pending: deque) -> bool:
+    """True if the parallel pages are done: the page is past the end or the end of
+    the window is reached"""
+    if not page.items:
+        return True
+    if window.end is not None and page.next_skip >= window.end:
+        return True
+    return not pending
+
+
+def paginate(
+    api_method: Callable,
+    *args,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    skip: int = 0,
+    max_items: int = None,
+    items_key: str = "items",
+    prefetch: bool = True,
+    parallel_pages: int = 1,
+    **kwargs,
+) -> Iterator[dict]:
+    """Iterates over the items of a list endpoint, requesting one page at a time.
+
+    The pages are requested with the top and skip arguments of the endpoint. If the
+    response has a next link (_links.next.href or @odata.nextLink) it is followed,
+    otherwise $skip is advanced until a short page is returned or the total of the
+    response (total or @odata.count) is reached. With prefetch the next page is
+    requested in a background thread (using the current session) while the items of
+    the page are consumed.
+
+    With parallel_pages > 1 the first page is requested on its own to learn the total
+    and the following pages are requested parallel_pages at a time in a thread pool
+    (if the endpoint has no total, pages are requested until a page past the end).
+    The items missing after a short page are requested before the next page, so
+    servers limiting the page size are supported. The items are still yielded in
+    order. Pages are not requested in parallel when the endpoint returns next links.
+
+    Example:
+        for position in paginate(PortfoliosAPI.get_positions_at_date,
+                                 portfolio_id=1, as_of_date="2023-01-13"):
+            ...
+
+    Args:
+        api_method (Callable): An api method that takes top, skip and return_response
+            e.g. PortfoliosAPI.get_portfolios
+        *args: Positional arguments of the api method
+        page_size (int): Number of items requested per page ($top)
+        skip (int): Number of items to skip before the first page
+        max_items (int): Stop after this number of items
+        items_key (str): The key of the items in the response
+        prefetch (bool): Request the next page while the current page is consumed
+        parallel_pages (int): Number of pages requested at the same time
+        **kwargs: Other keyword arguments of the api method (e.g. filter_results)
+
+    Returns:
+        Iterator[dict]: The items as returned by the endpoint
+    """
+    _check_args(page_size, parallel_pages, kwargs)
+    session = AxiomaSession.current
+    count = 0
+
+    def fetch(next_url, next_skip, top=page_size):
+        # the workers share the session of the calling thread without entering it
+        with as_current(session):
+            if next_url is not None:
+                response = session._get(next_url, return_response=True)
+            else:
+                response = _first_page(api_method, args, kwargs, next_skip, top)
+        return _Page(response, next_skip, top, items_key, session.json_codec.loads)
+
+    workers = parallel_pages if parallel_pages > 1 else int(prefetch)
+    executor = ThreadPoolExecutor(max_workers=workers) if workers else None
+    pending = deque()
+    try:
+        page = fetch(None, skip)
+        if parallel_pages > 1 and page.in_parallel():
+            window = _Window(page, skip, page_size, max_items)
+            while True:
+                free = parallel_pages - len(pending)
+                for next_skip in itertools.islice(window, free):
+                    pending.append((next_skip, executor.submit(
+                        fetch, None, next_skip, window.page_size)))
+                for item in page.items:
+                    if max_items is not None and count >= max_items:
+                        return
+                    count += 1
+                    yield item
+                if _window_done(page, window, pending):
+                    return
+                next_skip = pending[0][0]
+                if page.next_skip < next_skip:
+                    # a short page, the items up to the next page are requested
+                    page = fetch(None, page.next_skip, next_skip - page.next_skip)
+                else:
+                    page = pending.popleft()[1].result()
+
+        while True:
+            if not page.is_last and executor is not None:
+                pending.append((page.next_skip, executor.submit(
+                    fetch, page.next_url, page.next_skip)))
+            for item in page.items:
+                if max_items is not None and count >= max_items:
+                    return
+                count += 1
+                yield item
+            if page.is_last or not page.items:
+                return
+            if pending:
+                page = pending.popleft()[1].result()
+            else:
+                page = fetch(page.next_url, page.next_skip)
+    finally:
+        for _, future in pending:
+            future.cancel()
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+async def apaginate(
+    api_method: Callable,
+    *args,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    skip: int = 0,
+    max_items: int = None,
+    items_key: str = "items",
+    prefetch: bool = True,
+    parallel_pages: int = 1,
+    **kwargs,
+) -> AsyncIterator[dict]:
+    """Async version of paginate for the async api classes (e.g.
+    AsyncPortfoliosAPI.get_portfolios). With prefetch the next page is requested in a
+    task while the items of the page are consumed, with parallel_pages > 1 up to
+    parallel_pages requests are gathered at the same time.
+
+    Example:
+        async for portfolio in apaginate(AsyncPortfoliosAPI.get_portfolios):
+            ...
+
+    Args:
+        api_method (Callable): An async api method that takes top, skip and
+            return_response
+        *args: Positional arguments of the api method
+        page_size (int): Number of items requested per page ($top)
+        skip (int): Number of items to skip before the first page
+        max_items (int): Stop after this number of items
+        items_key (str): The key of the items in the response
+        prefetch (bool): Request the next page while the current page is consumed
+        parallel_pages (int): Number of pages requested at the same time
+        **kwargs: Other keyword arguments of the api method (e.g. filter_results)
+
+    Returns:
+        AsyncIterator[dict]: The items as returned by the endpoint
+    """
+    _check_args(page_size, parallel_pages, kwargs)
+    session = AsyncAxiomaSession.current
+    count = 0
+
+    async def fetch(next_url, next_skip, top=page_size):
+        if next_url is not None:
+            response = await session._get(next_url, return_response=True)
+        else:
+            response = await _first_page(api_method, args, kwargs, next_skip, top)
+        return _Page(response, next_skip, top, items_key, session.json_codec.loads)
+
+    pending = deque()
+    try:
+        page = await fetch(None, skip)
+        if parallel_pages > 1 and page.in_parallel():
+            window = _Window(page, skip, page_size, max_items)
+            while True:
+                free = parallel_pages - len(pending)
+                for next_skip in itertools.islice(window, free):
+                    pending.append((next_skip, asyncio.ensure_future(
+                        fetch(None, next_skip, window.page_size))))
+                for item in page.items:
+                    if max_items is not None and count >= max_items:
+                        return
+                    count += 1
+                    yield item
+                if _window_done(page, window, pending):
+                    return
+                next_skip = pending[0][0]
+                if page.next_skip < next_skip:
+                    # a short page, the items up to the next page are requested
+                    page = await fetch(None, page.next_skip, next_skip - page.next_skip)
+                else:
+                    page = await pending.popleft()[1]
+
+        while True:
+            if not page.is_last and prefetch:
+                pending.append((page.next_skip, asyncio.ensure_future(
+                    fetch(page.next_url, page.next_skip))))
+            for item in page.items:
+                if max_items is not None and count >= max_items:
+                    return
+                count += 1
+                yield item
+            if page.is_last or not page.items:
+                return
+            if pending:
+                page = await pending.popleft()[1]
+            else:
+                page = await fetch(page.next_url, page.next_skip)
+    finally:
+        for _, task in pending:
+            task.cancel()
@@ -0,0 +1,719 @@
+"""
+Copyright © 2024 Axioma by SimCorp.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+"""
+import asyncio
+import concurrent.futures
+import functools
+import logging
+import queue
+import threading
+from collections import namedtuple
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, AsyncIterator, Iterable, Iterator, List, Optional, Tuple, Union
+
+from axiomapy.axiomaexceptions import AxiomaJobError
+from axiomapy.downloads import PathLike
+from axiomapy.session import AxiomaResponse
+
+from .analyses import AnalysesAPI, AnalysesPerformanceAPI, AnalysesRiskAPI
+from .asyncapis import AsyncAnalysesAPI, AsyncAnalysesRiskAPI
+from .jobs import (
+    AnalysisJob,
+    JobPoller,
+    PollingPolicy,
+    _in_current_session,
+    request_id_from_response,
+)
+
+_logger = logging.getLogger(__name__)
+_logger.addHandler(logging.NullHandler())
+
+PipelineResult = namedtuple(
+    "PipelineResult", ["portfolio_id", "request_id", "status", "output", "error"]
+)
+PipelineResult.__doc__ = """The outcome of a work item of a pipeline, error is the
+exception raised when submitting, polling or persisting the analysis (or an
+AxiomaJobError if the analysis failed) and output what the sink returned"""
+
+PerformanceResult = namedtuple(
+    "PerformanceResult",
+    ["portfolio_id", "request_id", "status", "precompute_request_ids", "error"],
+)
+PerformanceResult.__doc__ = """The outcome of the performance attribution of a
+portfolio, request_id is None if the attribution was not submitted because a
+precompute job or a request failed (error)"""
+
+_FEED_DONE = object()
+
+
+class ResultSink:
+    """Persists the results of the analyses of a pipeline. Subclasses implement
+    write, and awrite for the async pipeline if the response should be streamed."""
+
+    def write(
+        self, portfolio_id: int, request_id: int, response: AxiomaResponse
+    ) -> Any:
+        """Persists the streamed response of AnalysesAPI.get_analyses
+
+        Args:
+            portfolio_id (int): the portfolio of the analysis
+            request_id (int): the request id of the analysis
+            response (AxiomaResponse): the streamed results
+
+        Returns:
+            Any: the output of the pipeline result, e.g. the path written
+        """
+        raise NotImplementedError
+
+    async def awrite(
+        self, portfolio_id: int, request_id: int, response: AxiomaResponse
+    ) -> Any:
+        """Async version of write, by default the response is read and passed to
+        write"""
+        await response.response.aread()
+        return self.write(portfolio_id, request_id, response)
+
+
+class DirectorySink(ResultSink):
+    """Streams the results of each analysis to a file of the directory
+
+    Args:
+        directory (PathLike): The directory of the files
+        file_name (str): The name of the files, formatted with portfolio_id,
+            request_id and extension (csv or json)
+    """
+
+    def __init__(
+        self,
+        directory: PathLike,
+        file_name: str = "{portfolio_id}_{request_id}.{extension}",
+    ):
+        self.directory = Path(directory)
+        self.file_name = file_name
+
+    def path(
+        self, portfolio_id: int, request_id: int, response: AxiomaResponse
+    ) -> Path:
+        is_csv = "CSV" in response.headers.get("content-type", "").upper()
+        return self.directory / self.file_name.format(
+            portfolio_id=portfolio_id,
+            request_id=request_id,
+            extension="csv" if is_csv else "json",
+        )
+
+    def write(
+        self, portfolio_id: int, request_id: int, response: AxiomaResponse
+    ) -> Path:
+        path = self.path(portfolio_id, request_id, response)
+        response.download_to(path)
+        return path
+
+    async def awrite(
+        self, portfolio_id: int, request_id: int, response: AxiomaResponse
+    ) -> Path:
+        path = self.path(portfolio_id, request_id, response)
+        await response.adownload_to(path)
+        return path
+
+
+class _PipelineRun:
+    """The state of a run of a pipeline shared by its worker threads: the work items
+    are fed to submit by a feed thread, the jobs polled by a poll thread and the
+    results put on a queue read by results.
+
+    Args:
+        max_submissions (int): The maximum number of work items being submitted
+        max_polls (int): The maximum number of status requests in flight
+        timeout (float): Seconds to wait for the jobs, None to wait forever
+    """
+
+    def __init__(self, max_submissions: int, max_polls: int, timeout: float):
+        self.max_submissions = max_submissions
+        self.timeout = timeout
+        self.queue = queue.Queue()
+        self.poller = JobPoller(max_polls)
+        self.poller.open()
+        self.slots = threading.Semaphore(max_submissions)
+        self.stop = threading.Event()
+        self.jobs: List[AnalysisJob] = []
+        self.count = 0
+        # the worker threads use the session of the thread running the pipeline
+        self._submit = _in_current_session(self.submit)
+        self._poll = _in_current_session(self.poll)
+        self._feed = None
+
+    def submit(self, portfolio_id: int, parameters: dict):
+        """Submits the jobs of a work item and releases its slot"""
+        raise NotImplementedError
+
+    def track(self, job: AnalysisJob, callback):
+        """Polls the job, it is cancelled if the run stopped"""
+        self.jobs.append(job)
+        self.poller.add(job, callback=callback)
+        if self.stop.is_set():
+            job.cancel()
+
+    def fed(self):
+        """Called once every work item was passed to submit"""
+
+    def feed(self, work_items: Iterable[Tuple[int, dict]]):
+        try:
+            with concurrent.futures.ThreadPoolExecutor(
+                self.max_submissions
+            ) as submissions:
+                for portfolio_id, parameters in work_items:
+                    self.slots.acquire()
+                    if self.stop.is_set():
+                        break
+                    submissions.submit(self._submit, portfolio_id, parameters)
+                    self.count += 1
+        except Exception as e:
+            self.queue.put(e)
+        finally:
+            self.fed()
+            self.queue.put(_FEED_DONE)
+
+    def poll(self):
+        try:
+            for _ in self.poller.iter_completed(self.timeout):
+                pass
+        except Exception as e:
+            self.queue.put(e)
+
+    def results(self, work_items: Iterable[Tuple[int, dict]]) -> Iterator[Any]:
+        """Runs the work items and yields their results as they are put on the
+        queue, the run is stopped if the results are not consumed to the end"""
+        self._feed = threading.Thread(target=self.feed, args=(work_items,), daemon=True)
+        self._feed.start()
+        threading.Thread(target=self._poll, daemon=True).start()
+        received = 0
+        fed = False
+        try:
+            while not fed or received < self.count:
+                result = self.queue.get()
+                if result is _FEED_DONE:
+                    fed = True
+                elif isinstance(result, Exception):
+                    raise result
+                else:
+                    received += 1
+                    yield result
+        finally:
+            self.shutdown()
+
+    def shutdown(self):
+        """Stops the run, the poll thread finishes on its own once the cancelled
+        jobs are due"""
+        self.stop.set()
+        self.slots.release()
+        for job in list(self.jobs):
+            job.cancel()
+        self._feed.join()
+
+
+class _RiskRun(_PipelineRun):
+    """A run of a RiskAnalysisPipeline"""
+
+    def __init__(self, pipeline: "RiskAnalysisPipeline"):
+        super().__init__(pipeline.max_submissions, pipeline.max_polls, pipeline.timeout)
+        self.pipeline = pipeline
+        self.downloads = concurrent.futures.ThreadPoolExecutor(pipeline.max_downloads)
+        self._download = _in_current_session(self.download)
+
+    def submit(self, portfolio_id: int, parameters: dict):
+        try:
+            response = AnalysesRiskAPI.post_portfolio_analyses(portfolio_id, parameters)
+            request_id = request_id_from_response(response)
+        except Exception as e:
+            self.queue.put(PipelineResult(portfolio_id, None, None, None, e))
+            return
+        finally:
+            self.slots.release()
+        _logger.info(f"Submitted the analysis {request_id} of {portfolio_id}")
+        job = AnalysisJob.analysis(request_id, policy=self.pipeline.policy)
+        self.track(job, functools.partial(self.finished, portfolio_id))
+
+    def finished(self, portfolio_id: int, job: AnalysisJob):
+        if job.succeeded():
+            self.downloads.submit(self._download, portfolio_id, job)
+        else:
+            self.queue.put(self.pipeline._failed(portfolio_id, job))
+
+    def download(self, portfolio_id: int, job: AnalysisJob):
+        try:
+            response = AnalysesAPI.get_analyses(
+                job.request_id, as_csv=self.pipeline.as_csv, stream=True
+            )
+            output = self.pipeline.sink.write(portfolio_id, job.request_id, response)
+            result = PipelineResult(
+                portfolio_id, job.request_id, job.status, output, None
+            )
+        except Exception as e:
+            result = PipelineResult(portfolio_id, job.request_id, job.status, None, e)
+        self.queue.put(result)
+
+    def fed(self):
+        self.poller.close()
+
+    def shutdown(self):
+        super().shutdown()
+        self.downloads.shutdown(wait=True)
+
+
+class _AsyncRiskRun:
+    """A run of RiskAnalysisPipeline.arun, the submissions, polls and downloads are
+    tasks of the event loop"""
+
+    def __init__(self, pipeline: "RiskAnalysisPipeline"):
+        self.pipeline = pipeline
+        self.queue = asyncio.Queue()
+        self.poller = JobPoller(pipeline.max_polls)
+        self.poller.open()
+        self.submissions = asyncio.Semaphore(pipeline.max_submissions)
+        self.downloads = asyncio.Semaphore(pipeline.max_downloads)
+        self.tasks = set()
+        self.jobs: List[AnalysisJob] = []
+        self.count = 0
+
+    def start(self, coroutine):
+        task = asyncio.ensure_future(coroutine)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def submit(self, portfolio_id: int, parameters: dict):
+        try:
+            response = await AsyncAnalysesRiskAPI.post_portfolio_analyses(
+                portfolio_id, parameters
+            )
+            request_id = request_id_from_response(response)
+        except Exception as e:
+            await self.queue.put(PipelineResult(portfolio_id, None, None, None, e))
+            return
+        finally:
+            self.submissions.release()
+        job = AnalysisJob.analysis(
+            request_id, api=AsyncAnalysesAPI, policy=self.pipeline.policy
+        )
+        self.jobs.append(job)
+        self.poller.add(job, callback=functools.partial(self.finished, portfolio_id))
+
+    def finished(self, portfolio_id: int, job: AnalysisJob):
+        if job.succeeded():
+            self.start(self.download(portfolio_id, job))
+        else:
+            self.queue.put_nowait(self.pipeline._failed(portfolio_id, job))
+
+    async def download(self, portfolio_id: int, job: AnalysisJob):
+        async with self.downloads:
+            try:
+                response = await AsyncAnalysesAPI.get_analyses(
+                    job.request_id, as_csv=self.pipeline.as_csv, stream=True
+                )
+                output = await self.pipeline.sink.awrite(
+                    portfolio_id, job.request_id, response
+                )
+                result = PipelineResult(
+                    portfolio_id, job.request_id, job.status, output, None
+                )
+            except Exception as e:
+                result = PipelineResult(
+                    portfolio_id, job.request_id, job.status, None, e
+                )
+        await self.queue.put(result)
+
+    async def feed(self, work_items: Iterable[Tuple[int, dict]]):
+        try:
+            for portfolio_id, parameters in work_items:
+                await self.submissions.acquire()
+                self.start(self.submit(portfolio_id, parameters))
+                self.count += 1
+            # the jobs are added once the submissions are complete
+            for _ in range(self.pipeline.max_submissions):
+                await self.submissions.acquire()
+        except Exception as e:
+            await self.queue.put(e)
+        finally:
+            self.poller.close()
+            await self.queue.put(_FEED_DONE)
+
+    async def poll(self):
+        try:
+            async for _ in self.poller.as_completed(self.pipeline.timeout):
+                pass
+        except Exception as e:
+            await self.queue.put(e)
+
+    async def results(
+        self, work_items: Iterable[Tuple[int, dict]]
+    ) -> AsyncIterator[PipelineResult]:
+        self.start(self.feed(work_items))
+        self.start(self.poll())
+        received = 0
+        fed = False
+        try:
+            while not fed or received < self.count:
+                result = await self.queue.get()
+                if result is _FEED_DONE:
+                    fed = True
+                elif isinstance(result, Exception):
+                    raise result
+                else:
+                    received += 1
+                    yield result
+        finally:
+            # stops the run if the results are not consumed to the end, the
+            # submitted jobs are cancelled so their callbacks start no downloads
+            for job in list(self.jobs):
+                job.cancel()
+            for task in list(self.tasks):
+                task.cancel()
+
+
+class RiskAnalysisPipeline:
+    """Submits portfolio risk analyses, waits for them and persists their results
+    with the three phases overlapping: the results of the first analyses are
+    downloaded while later analyses are still being submitted.
+
+    Each phase has its own concurrency limit. The analyses are submitted with
+    AnalysesRiskAPI.post_portfolio_analyses (the request id is parsed from the
+    location header), polled by one JobPoller and their results streamed from
+    AnalysesAPI.get_analyses to the sink. The work items are read as capacity
+    frees up so the iterable can be a generator of any length.
+
+    Example:
+        pipeline = RiskAnalysisPipeline(DirectorySink("results"), as_csv=True)
+        for result in pipeline.run((p, parameters) for p in portfolio_ids):
+            if result.error is not None:
+                ...
+
+    Args:
+        sink (ResultSink): Persists the results of the analyses
+        max_submissions (int): The maximum number of submit requests in flight
+        max_polls (int): The maximum number of status requests in flight
+        max_downloads (int): The maximum number of results downloaded at a time
+        as_csv (bool): Download the results as CSV rather than JSON
+        policy (PollingPolicy): The polling policy of the analyses
+        timeout (float): Seconds to wait for the analyses, None to wait forever
+    """
+
+    def __init__(
+        self,
+        sink: ResultSink,
+        max_submissions: int = 4,
+        max_polls: int = 10,
+        max_downloads: int = 4,
+        as_csv: bool = False,
+        policy: PollingPolicy = None,
+        timeout: float = None,
+    ):
+        self.sink = sink
+        self.max_submissions = max_submissions
+        self.max_polls = max_polls
+        self.max_downloads = max_downloads
+        self.as_csv = as_csv
+        self.policy = policy
+        self.timeout = timeout
+
+    @staticmethod
+    def _failed(portfolio_id: int, job: AnalysisJob) -> PipelineResult:
+        error = job.error
+        if error is None:
+            error = AxiomaJobError(
+                f"The analysis {job.request_id} of the portfolio {portfolio_id} "
+                f"finished with status {job.status}",
+                job.request_id,
+                job.status,
+            )
+        return PipelineResult(portfolio_id, job.request_id, job.status, None, error)
+
+    def run(self, work_items: Iterable[Tuple[int, dict]]) -> Iterator[PipelineResult]:
+        """Runs the analyses of the work items
+
+        Args:
+            work_items (Iterable[Tuple[int, dict]]): the portfolio ids and the
+                analysis parameters
+
+        Returns:
+            Iterator[PipelineResult]: the results in the order they are persisted
+
+        Raises:
+            AxiomaJobTimeoutError: analyses did not finish within the timeout
+        """
+        yield from _RiskRun(self).results(work_items)
+
+    def arun(
+        self, work_items: Iterable[Tuple[int, dict]]
+    ) -> AsyncIterator[PipelineResult]:
+        """Async version of run using the async session, see run"""
+        return _AsyncRiskRun(self).results(work_items)
+
+
+def run_risk_analyses(
+    work_items: Iterable[Tuple[int, dict]],
+    sink: Union[ResultSink, PathLike],
+    **kwargs,
+) -> List[PipelineResult]:
+    """Runs the analyses of the work items with a RiskAnalysisPipeline and returns
+    all the results
+
+    Args:
+        work_items (Iterable[Tuple[int, dict]]): the portfolio ids and the analysis
+            parameters
+        sink (Union[ResultSink, PathLike]): the sink or the directory of the results
+        kwargs: the other arguments of RiskAnalysisPipeline
+
+    Returns:
+        List[PipelineResult]: the results in the order they are persisted
+    """
+    if not isinstance(sink, ResultSink):
+        sink = DirectorySink(sink)
+    return list(RiskAnalysisPipeline(sink, **kwargs).run(work_items))
+
+
+def missing_precomputed_dates(body: Any) -> List[str]:
+    """The dates of a post_missing_precomputed response, either a list of dates (or
+    of objects with a date or asOfDate) or an object with such a list, e.g. items
+
+    Args:
+        body (Any): the json of the response
+
+    Returns:
+        List[str]: the dates that are not precomputed
+    """
+    if isinstance(body, Mapping):
+        body = next(
+            (body[key] for key in ("dates", "missingDates", "items") if key in body),
+            [],
+        )
+    dates = []
+    for item in body or []:
+        if isinstance(item, Mapping):
+            item = item.get("asOfDate", item.get("date"))
+        dates.append(item)
+    return dates
+
+
+def precompute_parameters(analysis_parameters: dict, date: str) -> dict:
+    """The parameters of the precompute job of a date of a performance attribution,
+    the analysis parameters with the asOfDate instead of the start and end dates"""
+    parameters = {
+        key: value
+        for key, value in analysis_parameters.items()
+        if key not in ("startDate", "endDate")
+    }
+    parameters["asOfDate"] = date
+    return parameters
+
+
+class _Attribution:
+    """The progress of the performance attribution of a portfolio"""
+
+    __slots__ = ("portfolio_id", "parameters", "remaining", "precompute_ids", "error")
+
+    def __init__(self, portfolio_id: int, parameters: dict):
+        self.portfolio_id = portfolio_id
+        self.parameters = parameters
+        # the precompute jobs in progress, plus one until they are all submitted
+        self.remaining = 1
+        self.precompute_ids = []
+        self.error = None
+
+    def result(
+        self, job: AnalysisJob = None, error: BaseException = None
+    ) -> PerformanceResult:
+        request_id = None if job is None else job.request_id
+        status = None if job is None else job.status
+        return PerformanceResult(
+            self.portfolio_id,
+            request_id,
+            status,
+            list(self.precompute_ids),
+            error or self.error,
+        )
+
+
+class _AttributionRun(_PipelineRun):
+    """A run of a PerformanceAttributionPipeline. The missing dates of a work item
+    are precomputed by prepare and its attribution submitted by attribute once the
+    last precompute job finished."""
+
+    def __init__(self, pipeline: "PerformanceAttributionPipeline"):
+        super().__init__(pipeline.max_submissions, pipeline.max_polls, pipeline.timeout)
+        self.pipeline = pipeline
+        self.precomputes = threading.Semaphore(pipeline.max_precomputes)
+        self.lock = threading.Lock()
+        self.attributions = concurrent.futures.ThreadPoolExecutor(
+            pipeline.max_submissions
+        )
+        self._attribute = _in_current_session(self.attribute)
+
+    def submit(self, portfolio_id: int, parameters: dict):
+        state = _Attribution(portfolio_id, parameters)
+        try:
+            self.prepare(state)
+        except Exception as e:
+            self.step_done(state, e)
+        else:
+            self.step_done(state)
+        finally:
+            self.slots.release()
+
+    def prepare(self, state: _Attribution):
+        """Submits the precompute jobs of the missing dates of the attribution"""
+        dates = self.pipeline.missing_dates(state.portfolio_id, state.parameters)
+        _logger.info(f"{len(dates)} dates of {state.portfolio_id} are not precomputed")
+        for date in dates:
+            self.precomputes.acquire()
+            if self.stop.is_set() or state.error is not None:
+                self.precomputes.release()
+                break
+            try:
+                response = AnalysesPerformanceAPI.post_precompute(
+                    state.portfolio_id, precompute_parameters(state.parameters, date)
+                )
+                request_id = request_id_from_response(response)
+            except Exception:
+                self.precomputes.release()
+                raise
+            with self.lock:
+                state.remaining += 1
+                state.precompute_ids.append(request_id)
+            job = AnalysisJob.performance(request_id, policy=self.pipeline.policy)
+            self.track(job, functools.partial(self.precomputed, state))
+
+    def precomputed(self, state: _Attribution, job: AnalysisJob):
+        self.precomputes.release()
+        error = None if job.succeeded() else self.pipeline._failed(state, job)
+        self.step_done(state, error)
+
+    def step_done(self, state: _Attribution, error: Optional[BaseException] = None):
+        """Records a finished step (the preparation or a precompute job) of the
+        attribution, which is submitted once all the steps succeeded"""
+        with self.lock:
+            if error is not None and state.error is None:
+                state.error = error
+            state.remaining -= 1
+            ready = state.remaining == 0
+        if not ready or self.stop.is_set():
+            return
+        if state.error is not None:
+            self.queue.put(state.result())
+        else:
+            self.attributions.submit(self._attribute, state)
+
+    def attribute(self, state: _Attribution):
+        try:
+            response = AnalysesPerformanceAPI.post_performance_analysis(
+                state.portfolio_id, state.parameters
+            )
+            request_id = request_id_from_response(response)
+        except Exception as e:
+            self.queue.put(state.result(error=e))
+            return
+        _logger.info(f"Submitted the attribution {request_id} of {state.portfolio_id}")
+        job = AnalysisJob.performance(request_id, policy=self.pipeline.policy)
+        self.track(job, functools.partial(self.attributed, state))
+
+    def attributed(self, state: _Attribution, job: AnalysisJob):
+        error = None if job.succeeded() else self.pipeline._failed(state, job)
+        self.queue.put(state.result(job, error))
+
+    def shutdown(self):
+        # the attributions are submitted by the callbacks of the poller so it is
+        # only closed once every portfolio has a result
+        self.stop.set()
+        self.precomputes.release()
+        super().shutdown()
+        self.poller.close()
+        self.attributions.shutdown(wait=True)
+
+
+class PerformanceAttributionPipeline:
+    """Runs the performance attributions of many portfolios: finds the dates that are
+    not precomputed, precomputes them and starts the attribution of each portfolio
+    as soon as its dates are precomputed, so the attribution of one portfolio runs
+    while the precompute jobs of the others are still running.
+
+    The missing dates are requested with post_missing_precomputed (with the analysis
+    parameters), the precompute job of each date is submitted with post_precompute
+    and the precompute and attribution jobs are polled by one JobPoller. A portfolio
+    with a failed precompute job is reported without submitting its attribution.
+
+    Example:
+        pipeline = PerformanceAttributionPipeline(max_precomputes=20)
+        for result in pipeline.run((p, pa_parameters) for p in portfolio_ids):
+            if result.error is None:
+                summary = AnalysesPerformanceAPI.get_results_summary(result.request_id)
+
+    Args:
+        max_submissions (int): The maximum number of requests submitting jobs (or
+            requesting the missing dates) in flight
+        max_precomputes (int): The maximum number of precompute jobs running
+        max_polls (int): The maximum number of status requests in flight
+        policy (PollingPolicy): The polling policy of the jobs
+        timeout (float): Seconds to wait for the jobs, None to wait forever
+    """
+
+    def __init__(
+        self,
+        max_submissions: int = 4,
+        max_precomputes: int = 8,
+        max_polls: int = 10,
+        policy: PollingPolicy = None,
+        timeout: float = None,
+    ):
+        self.max_submissions = max_submissions
+        self.max_precomputes = max_precomputes
+        self.max_polls = max_polls
+        self.policy = policy
+        self.timeout = timeout
+
+    def missing_dates(self, portfolio_id: int, parameters: dict) -> List[str]:
+        """The dates of the attribution that are not precomputed"""
+        response = AnalysesPerformanceAPI.post_missing_precomputed(
+            portfolio_id, parameters
+        )
+        return missing_precomputed_dates(response.json())
+
+    def run(
+        self, work_items: Iterable[Tuple[int, dict]]
+    ) -> Iterator[PerformanceResult]:
+        """Runs the performance attributions of the work items
+
+        Args:
+            work_items (Iterable[Tuple[int, dict]]): the portfolio ids and the
+                parameters of the attributions (startDate, endDate,
+                performanceAttributionSettingsId...)
+
+        Returns:
+            Iterator[PerformanceResult]: the results in the order the attributions
+                finish
+
+        Raises:
+            AxiomaJobTimeoutError: jobs did not finish within the timeout
+        """
+        yield from _AttributionRun(self).results(work_items)
+
+    @staticmethod
+    def _failed(state: _Attribution, job: AnalysisJob) -> BaseException:
+        if job.error is not None:
+            return job.error
+        return AxiomaJobError(
+            f"The performance request {job.request_id} of the portfolio "
+            f"{state.portfolio_id} finished with status {job.status}",
+            job.request_id,
+            job.status,
+        )
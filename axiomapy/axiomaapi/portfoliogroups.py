@@ -27,8 +27,11 @@ class PortfolioGroupsAPI:
 
     """
 
-    @staticmethod
+    _session_cls = AxiomaSession
+
+    @classmethod
     def get_portfolio_groups(
+        cls,
         filter_results: str = None,
         top: int = None,
         skip: int = None,
@@ -50,13 +53,14 @@ class PortfolioGroupsAPI:
         url = "/portfolio-groups"
         params = odata_params(filter_results, top, skip, orderby)
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, params=params, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_portfolio_group(
+        cls,
         portfolio_group_id: int,
         return_response: bool = False,
     ):
@@ -71,13 +75,14 @@ class PortfolioGroupsAPI:
         """
         url = f"/portfolio-groups/{portfolio_group_id}"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def post_portfolio_group(
+        cls,
         portfolio: dict, return_response: bool = False,
     ):
         """This method creates a new portfolio group
@@ -91,13 +96,14 @@ class PortfolioGroupsAPI:
         """
         url = "/portfolio-groups"
         _logger.info(f"Posting to {url}")
-        response = AxiomaSession.current._post(
+        response = cls._session_cls.current._post(
             url, portfolio, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def put_portfolio_group(
+        cls,
         portfolio_group_id: int,
         portfolio: dict,
         return_response: bool = False,
@@ -114,13 +120,14 @@ class PortfolioGroupsAPI:
         """
         url = f"/portfolio-groups/{portfolio_group_id}"
         _logger.info(f"Putting to {url}")
-        response = AxiomaSession.current._put(
+        response = cls._session_cls.current._put(
             url, portfolio, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def delete_portfolio_group(
+        cls,
         portfolio_group_id: int, return_response: bool = False,
     ):
         """This method deletes a portfolio group based on the id provided
@@ -134,11 +141,13 @@ class PortfolioGroupsAPI:
         """
         url = f"/portfolio-groups/{portfolio_group_id}"
         _logger.info(f"Deleting at {url}")
-        response = AxiomaSession.current._delete(url, return_response=return_response)
+        response = cls._session_cls.current._delete(
+            url, return_response=return_response
+        )
         return response
 
-    @staticmethod
-    def patch_portfolio_groups(portfolio_group_id: int,
+    @classmethod
+    def patch_portfolio_groups(cls, portfolio_group_id: int,
                                portfolios_dict: dict,
                                return_response: bool = False):
         """This method patches a portfolio group based on the json provided
@@ -153,6 +162,6 @@ class PortfolioGroupsAPI:
         """
         url = f"/portfolio-groups/{portfolio_group_id}/portfolios"
         _logger.info(f"Patching portfolios at {url}")
-        response = AxiomaSession.current._patch(url, portfolios_dict,
+        response = cls._session_cls.current._patch(url, portfolios_dict,
                                                 return_response=return_response)
         return response
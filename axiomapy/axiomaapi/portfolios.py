@@ -15,8 +15,9 @@ under the License.
 
 """
 import logging
-from typing import List
+from typing import List, Union
 
+from axiomapy.entitybase import EntityCollectionBase
 from axiomapy.session import AxiomaSession
 from axiomapy.utils import odata_params
 
@@ -29,8 +30,11 @@ class PortfoliosAPI:
 
     """
 
-    @staticmethod
+    _session_cls = AxiomaSession
+
+    @classmethod
     def get_portfolios(
+        cls,
         filter_results: str = None,
         top: int = None,
         skip: int = None,
@@ -52,13 +56,14 @@ class PortfoliosAPI:
         url = "/portfolios"
         params = odata_params(filter_results, top, skip, orderby)
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, params=params, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_portfolio(
+        cls,
         portfolio_id: int, return_response: bool = False,
     ):
         """This method retrieves a portfolio
@@ -72,11 +77,12 @@ class PortfoliosAPI:
         """
         url = f"/portfolios/{portfolio_id}"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(url, return_response=return_response)
+        response = cls._session_cls.current._get(url, return_response=return_response)
         return response
 
-    @staticmethod
+    @classmethod
     def post_portfolio(
+        cls,
         portfolio: dict, return_response: bool = False,
     ):
         """This method creates a new portfolio
@@ -90,13 +96,14 @@ class PortfoliosAPI:
         """
         url = "/portfolios"
         _logger.info(f"Posting to {url}")
-        response = AxiomaSession.current._post(
+        response = cls._session_cls.current._post(
             url, portfolio, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def put_portfolio(
+        cls,
         portfolio_id: int, portfolio: dict, return_response: bool = False,
     ):
         """This method updates an existing portfolio with the provided data
@@ -111,13 +118,14 @@ class PortfoliosAPI:
         """
         url = f"/portfolios/{portfolio_id}"
         _logger.info(f"Putting to {url}")
-        response = AxiomaSession.current._put(
+        response = cls._session_cls.current._put(
             url, portfolio, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def delete_portfolio(
+        cls,
         portfolio_id: int, return_response: bool = False,
     ):
         """This method deletes an existing portfolio
@@ -131,11 +139,14 @@ class PortfoliosAPI:
         """
         url = f"/portfolios/{portfolio_id}"
         _logger.info(f"Deleting at {url}")
-        response = AxiomaSession.current._delete(url, return_response=return_response)
+        response = cls._session_cls.current._delete(
+            url, return_response=return_response
+        )
         return response
 
-    @staticmethod
+    @classmethod
     def patch_portfolios(
+        cls,
         portfolios_upsert: List[dict] = None,
         portfolios_remove: List[dict] = None,
         return_response: bool = False,
@@ -157,13 +168,14 @@ class PortfoliosAPI:
         url = "/portfolios"
         _logger.info(f"Patching to {url}")
         portfolios_patch = {"upsert": portfolios_upsert, "remove": portfolios_remove}
-        response = AxiomaSession.current._patch(
+        response = cls._session_cls.current._patch(
             url, portfolios_patch, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_position_dates(
+        cls,
         portfolio_id: int,
         start_date: str = None,
         end_date: str = None,
@@ -193,11 +205,12 @@ class PortfoliosAPI:
         else:
             url = f"/portfolios/{portfolio_id}/positions"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(url, return_response=return_response)
+        response = cls._session_cls.current._get(url, return_response=return_response)
         return response
 
-    @staticmethod
+    @classmethod
     def get_positions_at_date(
+        cls,
         portfolio_id: int,
         as_of_date: str,
         filter_results: str = None,
@@ -223,13 +236,14 @@ class PortfoliosAPI:
         url = f"/portfolios/{portfolio_id}/positions/{as_of_date}"
         params = odata_params(filter_results, top, skip, orderby)
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, params=params, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def delete_positions(
+        cls,
         portfolio_id: int, as_of_date: str, return_response: bool = False,
     ):
         """This method is used to delete the portfolio entry on a particular date
@@ -244,11 +258,14 @@ class PortfoliosAPI:
         """
         url = f"/portfolios/{portfolio_id}/positions/{as_of_date}"
         _logger.info(f"Deleting from {url}")
-        response = AxiomaSession.current._delete(url, return_response=return_response)
+        response = cls._session_cls.current._delete(
+            url, return_response=return_response
+        )
         return response
 
-    @staticmethod
+    @classmethod
     def post_position(
+        cls,
         portfolio_id: int,
         as_of_date: str,
         position: dict,
@@ -267,17 +284,18 @@ class PortfoliosAPI:
         """
         url = f"/portfolios/{portfolio_id}/positions/{as_of_date}"
         _logger.info(f"Posting from {url}")
-        response = AxiomaSession.current._post(
+        response = cls._session_cls.current._post(
             url, position, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def patch_positions(
+        cls,
         portfolio_id: int,
         as_of_date: str,
-        positions_upsert: List[dict] = None,
-        positions_remove: List[dict] = None,
+        positions_upsert: Union[List[dict], EntityCollectionBase] = None,
+        positions_remove: Union[List[dict], EntityCollectionBase] = None,
         return_response: bool = False,
     ):
         """This method is used to patch the existing positions according to the supplied operations
@@ -285,7 +303,8 @@ class PortfoliosAPI:
         Args:
             portfolio_id:the id of the portfolio to update positions in
             as_of_date:The date of the positions
-            positions_upsert:The positions that needs to be updated or created
+            positions_upsert:The positions that needs to be updated or created, a
+                collection (e.g. PositionColumns) is converted with to_dict
             positions_remove:The positions that needs to be removed
             return_response:If set to true, the response will be returned
 
@@ -296,16 +315,21 @@ class PortfoliosAPI:
             positions_upsert = []
         if(positions_remove is None):
             positions_remove = []
+        if isinstance(positions_upsert, EntityCollectionBase):
+            positions_upsert = positions_upsert.to_dict()
+        if isinstance(positions_remove, EntityCollectionBase):
+            positions_remove = positions_remove.to_dict()
         url = f"/portfolios/{portfolio_id}/positions/{as_of_date}"
         _logger.info(f"Patching from {url}")
         positions_patch = {"upsert": positions_upsert, "remove": positions_remove}
-        response = AxiomaSession.current._patch(
+        response = cls._session_cls.current._patch(
             url, positions_patch, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def rollover_request(
+        cls,
         portfolio_id: int,
         as_of_date: str,
         rollover_date: str,
@@ -329,11 +353,14 @@ class PortfoliosAPI:
         url = f"/portfolios/{portfolio_id}/positions/{as_of_date}/rollover-requests"
         _logger.info(f"Posting to {url}")
         body = {"rollOverToDate": rollover_date, "attributes": attributes}
-        response = AxiomaSession.current._post(url, body, return_response=return_response)
+        response = cls._session_cls.current._post(
+            url, body, return_response=return_response
+        )
         return response
 
-    @staticmethod
+    @classmethod
     def get_portfolio_benchmark(
+        cls,
         portfolio_id: str, return_response: bool = False,
     ):
         """This method returns the benchmark for the portfolio
@@ -347,11 +374,12 @@ class PortfoliosAPI:
         """
         url = f"/portfolios/{portfolio_id}/benchmark"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(url, return_response=return_response)
+        response = cls._session_cls.current._get(url, return_response=return_response)
         return response
 
-    @staticmethod
+    @classmethod
     def put_portfolio_benchmark(
+        cls,
         portfolio_id: int, benchmark: dict, return_response: bool = False,
     ):
         """This method sets the benchmark for the given portfolio
@@ -366,13 +394,14 @@ class PortfoliosAPI:
         """
         url = f"/portfolios/{portfolio_id}/benchmark"
         _logger.info(f"Putting to {url}")
-        response = AxiomaSession.current._put(
+        response = cls._session_cls.current._put(
             url, benchmark, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def delete_portfolio_benchmark(
+        cls,
         portfolio_id: int, return_response: bool = False,
     ):
         """This method deletes the benchmark from the portfolio
@@ -386,11 +415,14 @@ class PortfoliosAPI:
         """
         url = f"/portfolios/{portfolio_id}/benchmark"
         _logger.info(f"Deleting at {url}")
-        response = AxiomaSession.current._delete(url, return_response=return_response)
+        response = cls._session_cls.current._delete(
+            url, return_response=return_response
+        )
         return response
 
-    @staticmethod
+    @classmethod
     def get_portfolio_position(
+        cls,
         portfolio_id: int,
         as_of_date: str,
         position_id: int,
@@ -409,13 +441,14 @@ class PortfoliosAPI:
         """
         url = f"/portfolios/{portfolio_id}/positions/{as_of_date}/{position_id}"
         _logger.info(f"Get from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def put_portfolio_position(
+        cls,
         portfolio_id: int,
         as_of_date: str,
         position_id: int,
@@ -436,13 +469,14 @@ class PortfoliosAPI:
         """
         url = f"/portfolios/{portfolio_id}/positions/{as_of_date}/{position_id}"
         _logger.info(f"Put request at {url}")
-        response = AxiomaSession.current._put(
+        response = cls._session_cls.current._put(
             url, position, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def delete_portfolio_position(
+            cls,
             portfolio_id: int,
             as_of_date: str,
             position_id: int,
@@ -461,13 +495,14 @@ class PortfoliosAPI:
         """
         url = f"/portfolios/{portfolio_id}/positions/{as_of_date}/{position_id}"
         _logger.info(f"Delete from {url}")
-        response = AxiomaSession.current._delete(
+        response = cls._session_cls.current._delete(
             url, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_valuation_dates(
+        cls,
         portfolio_id: int, return_response: bool = False,
     ):
         """This method lists the dates there are Valuations for the portfolio, latest first
@@ -481,11 +516,12 @@ class PortfoliosAPI:
         """
         url = f"/portfolios/{portfolio_id}/valuations"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(url, return_response=return_response)
+        response = cls._session_cls.current._get(url, return_response=return_response)
         return response
 
-    @staticmethod
+    @classmethod
     def get_valuation_at_date(
+        cls,
         portfolio_id: int,
         as_of_date: str,
         filter_results: str = None,
@@ -511,13 +547,14 @@ class PortfoliosAPI:
         url = f"/portfolios/{portfolio_id}/valuations/{as_of_date}"
         params = odata_params(filter_results, top, skip, orderby)
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, params=params, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def delete_valuation(
+        cls,
         portfolio_id: int, as_of_date: str, return_response: bool = False,
     ):
         """The method deletes the specified valuation from the portfolio for a given date
@@ -532,11 +569,14 @@ class PortfoliosAPI:
         """
         url = f"/portfolios/{portfolio_id}/valuations/{as_of_date}"
         _logger.info(f"Deleting from {url}")
-        response = AxiomaSession.current._delete(url, return_response=return_response)
+        response = cls._session_cls.current._delete(
+            url, return_response=return_response
+        )
         return response
 
-    @staticmethod
+    @classmethod
     def post_valuation(
+        cls,
         portfolio_id: int,
         as_of_date: str,
         valuation: dict,
@@ -555,13 +595,14 @@ class PortfoliosAPI:
         """
         url = f"/portfolios/{portfolio_id}/valuations/{as_of_date}"
         _logger.info(f"Posting from {url}")
-        response = AxiomaSession.current._post(
+        response = cls._session_cls.current._post(
             url, valuation, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def put_valuation(
+        cls,
         portfolio_id: int,
         as_of_date: str,
         valuation: dict,
@@ -580,13 +621,14 @@ class PortfoliosAPI:
         """
         url = f"/portfolios/{portfolio_id}/valuations/{as_of_date}"
         _logger.info(f"Put request at {url}")
-        response = AxiomaSession.current._put(
+        response = cls._session_cls.current._put(
             url, valuation, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def patch_valuations(
+        cls,
         portfolio_id: int,
         as_of_date: str,
         valuations_upsert: List[dict] = None,
@@ -613,7 +655,7 @@ class PortfoliosAPI:
         url = f"/portfolios/{portfolio_id}/valuations"
         _logger.info(f"Patching from {url}")
         valuations_patch = {"upsert": valuations_upsert, "remove": valuations_remove}
-        response = AxiomaSession.current._patch(
+        response = cls._session_cls.current._patch(
             url, valuations_patch, return_response=return_response
         )
         return response
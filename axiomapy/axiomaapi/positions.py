@@ -0,0 +1,612 @@
+"""
+Copyright © 2024 Axioma by SimCorp.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+"""
+import logging
+from enum import Enum
+from numbers import Real
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Sequence, Tuple, Union
+
+import numpy as np
+
+from axiomapy.axiomaexceptions import AxiomaValueError
+from axiomapy.entitybase import EntityBase, EntityCollectionBase, get_enum_value
+
+from .enums import QuantityType
+
+_logger = logging.getLogger(__name__)
+_logger.addHandler(logging.NullHandler())
+
+Column = Union[np.ndarray, "_Categorical"]
+# the key of the quantities in the integral columns, the other keys are attribute
+# names
+_QUANTITIES = None
+
+
+class _Categorical:
+    """A column of repeated values (e.g. scales, instrument mappings or attributes)
+    stored as int32 codes into the distinct values"""
+
+    __slots__ = ("codes", "categories")
+
+    def __init__(self, codes: np.ndarray, categories: tuple):
+        self.codes = codes
+        self.categories = categories
+
+    @classmethod
+    def from_values(cls, values: Sequence) -> "_Categorical":
+        index = {}
+        codes = np.fromiter(
+            (index.setdefault(v, len(index)) for v in values),
+            dtype=np.int32,
+            count=len(values),
+        )
+        return cls(codes, tuple(index))
+
+    def map(self, fn) -> "_Categorical":
+        """Applies fn to the distinct values, merging values that map to the same
+        value"""
+        index = {}
+        remap = np.array(
+            [index.setdefault(fn(c), len(index)) for c in self.categories],
+            dtype=np.int32,
+        )
+        return _Categorical(remap[self.codes] if len(remap) else self.codes,
+                            tuple(index))
+
+    def take(self, index) -> "_Categorical":
+        return _Categorical(self.codes[index], self.categories)
+
+    def code(self, value) -> int:
+        """The code of the value or -1 if the value is not in the column"""
+        try:
+            return self.categories.index(value)
+        except ValueError:
+            return -1
+
+    def values(self) -> np.ndarray:
+        categories = np.empty(len(self.categories), dtype=object)
+        categories[:] = self.categories
+        return categories[self.codes]
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes
+
+
+def _is_scalar(value) -> bool:
+    return value is None or isinstance(value, (str, Enum, Real))
+
+
+def _dense(values, count: int, name: str) -> Sequence:
+    """Repeats a scalar count times and checks the length of a sequence"""
+    if _is_scalar(values):
+        return [values] * count
+    if len(values) != count:
+        raise AxiomaValueError(
+            f"{name} has {len(values)} values, expected one per position ({count})"
+        )
+    return values
+
+
+def _float_column(values: Sequence) -> np.ndarray:
+    return np.array(values, dtype=np.float64)
+
+
+def _is_integral(values: Sequence) -> bool:
+    """True if the values that are not missing are all ints, the float64 column of
+    the values is converted back to ints in the payload"""
+    present = [v for v in values if v is not None]
+    return bool(present) and all(
+        isinstance(v, (int, np.integer)) and not isinstance(v, bool) for v in present
+    )
+
+
+def _payload_values(column: Column, integral: bool) -> list:
+    """The values of the column in the payload, None where missing"""
+    values = _as_objects(column).tolist()
+    if integral:
+        values = [None if v is None else int(v) for v in values]
+    return values
+
+
+def _string_column(values: Sequence) -> np.ndarray:
+    return np.array(["" if v is None else v for v in values], dtype=str)
+
+
+def _attribute_column(values: Sequence) -> Column:
+    """Numbers are stored as float64 (NaN when missing), other values as categories"""
+    numeric = [v for v in values if v is not None]
+    if numeric and all(
+        isinstance(v, Real) and not isinstance(v, bool) for v in numeric
+    ):
+        return _float_column(values)
+    return _Categorical.from_values(values)
+
+
+def _as_objects(column: Column) -> np.ndarray:
+    """The values of the column, None where missing"""
+    if isinstance(column, _Categorical):
+        return column.values()
+    values = column.astype(object)
+    if column.dtype.kind == "f":
+        values[np.isnan(column)] = None
+    elif column.dtype.kind == "U":
+        values[column == ""] = None
+    return values
+
+
+def _differs(left: Column, right: Column) -> np.ndarray:
+    """Elementwise inequality of two aligned columns, missing values are equal"""
+    if isinstance(left, np.ndarray) and isinstance(right, np.ndarray):
+        if left.dtype.kind == "f" and right.dtype.kind == "f":
+            return ~((left == right) | (np.isnan(left) & np.isnan(right)))
+        if left.dtype.kind == "U" and right.dtype.kind == "U":
+            return left != right
+    if (
+        isinstance(left, _Categorical)
+        and isinstance(right, _Categorical)
+        and left.categories == right.categories
+    ):
+        return left.codes != right.codes
+    return _as_objects(left) != _as_objects(right)
+
+
+def _take(column: Column, index) -> Column:
+    return column.take(index) if isinstance(column, _Categorical) else column[index]
+
+
+def _missing(column: Column, count: int) -> Column:
+    """A column of count missing values of the same kind as column"""
+    if isinstance(column, _Categorical):
+        return _Categorical(np.zeros(count, dtype=np.int32), (None,))
+    if column.dtype.kind == "f":
+        return np.full(count, np.nan)
+    return np.full(count, "", dtype=column.dtype)
+
+
+class PositionColumns(EntityCollectionBase):
+    """A columnar collection of the positions of a portfolio for large portfolios.
+
+    The client ids, quantities, scales (QuantityType), identifiers, instrument mappings
+    and attributes are stored as numpy arrays instead of one dictionary (or entity)
+    per position. Repeated values (scales, instrument mappings and non numeric
+    attributes) are stored as codes into the distinct values and numeric attributes
+    as float64. The positions are converted back to the upsert payload format
+    (to_dict) when they are sent, quantities and attributes that were all ints are
+    sent as ints and missing client ids are omitted.
+
+    Example:
+        positions = PositionColumns.from_positions(
+            paginate(PortfoliosAPI.get_positions_at_date, portfolio_id=1,
+                     as_of_date="2023-01-13")
+        )
+        equities = positions.filter(attributes={"Asset Class": "Equity"})
+        upsert, remove = equities.diff(previous)
+        PortfoliosAPI.patch_positions(1, "2023-01-14", positions_upsert=upsert,
+                                      positions_remove=remove)
+
+    Args:
+        client_ids (Sequence[str]): The client id of each position (None if missing)
+        quantities (Sequence[float]): The quantity of each position (None if missing)
+        scales (Union[QuantityType, Sequence[QuantityType]]): The scale of the
+            quantities, one scale for all positions or one per position
+        identifiers (Mapping[str, Sequence[str]]): The identifiers by identifier type
+            (e.g. {"ISIN": [...], "Ticker": [...]}), None if a position does not have
+            the identifier
+        instrument_mappings (Union[str, Sequence[str]]): The instrument mapping, one
+            for all positions or one per position
+        attributes (Mapping[str, Sequence[Any]]): The values of the attributes by
+            attribute name, None if a position does not have the attribute
+    """
+
+    def __init__(
+        self,
+        client_ids: Sequence[str] = (),
+        quantities: Sequence[float] = (),
+        scales: Union[QuantityType, str, Sequence] = QuantityType.NumberOfInstruments,
+        identifiers: Mapping[str, Sequence[str]] = None,
+        instrument_mappings: Union[str, Sequence[str]] = None,
+        attributes: Mapping[str, Sequence[Any]] = None,
+    ):
+        super().__init__()
+        count = len(client_ids)
+        # missing client ids are empty strings, like missing identifiers
+        self._client_ids = _string_column(client_ids).reshape(count)
+        quantities = _dense(quantities, count, "quantities")
+        self._quantities = _float_column(quantities)
+        integral = {_QUANTITIES} if _is_integral(quantities) else set()
+        self._scales = _Categorical.from_values(_dense(scales, count, "scales")).map(
+            lambda scale: get_enum_value(QuantityType, scale)
+        )
+        self._instrument_mappings = _Categorical.from_values(
+            _dense(instrument_mappings, count, "instrument_mappings")
+        )
+        self._identifiers: Dict[str, np.ndarray] = {
+            identifier_type: _string_column(_dense(values, count, identifier_type))
+            for identifier_type, values in (identifiers or {}).items()
+        }
+        self._attributes: Dict[str, Column] = {}
+        for name, values in (attributes or {}).items():
+            values = _dense(values, count, name)
+            self._attributes[name] = _attribute_column(values)
+            if _is_integral(values):
+                integral.add(name)
+        self._integral = frozenset(integral)
+
+    @classmethod
+    def from_positions(
+        cls, positions: Iterable[Union[dict, EntityBase]]
+    ) -> "PositionColumns":
+        """Creates the columns from positions in the format returned by
+        PortfoliosAPI.get_positions_at_date (e.g. the items of the response or
+        paginate over the endpoint)
+
+        Args:
+            positions (Iterable[Union[dict, EntityBase]]): the positions
+
+        Returns:
+            PositionColumns: the columns of the positions
+        """
+        client_ids, quantities, scales, mappings = [], [], [], []
+        identifiers: Dict[str, Tuple[List[int], List[str]]] = {}
+        attributes: Dict[str, Tuple[List[int], List[Any]]] = {}
+        for row, position in enumerate(positions):
+            if isinstance(position, EntityBase):
+                position = position.to_dict()
+            client_ids.append(position.get("clientId"))
+            quantity = position.get("quantity") or {}
+            quantities.append(quantity.get("value"))
+            scales.append(quantity.get("scale"))
+            mappings.append(position.get("instrumentMapping"))
+            for identifier in position.get("identifiers") or ():
+                rows, values = identifiers.setdefault(identifier["type"], ([], []))
+                rows.append(row)
+                values.append(identifier["value"])
+            for name, value in (position.get("attributes") or {}).items():
+                rows, values = attributes.setdefault(name, ([], []))
+                rows.append(row)
+                values.append(value)
+
+        count = len(client_ids)
+
+        def dense(rows: List[int], values: List[Any]) -> List[Any]:
+            column = [None] * count
+            for row, value in zip(rows, values):
+                column[row] = value
+            return column
+
+        return cls(
+            client_ids,
+            quantities,
+            scales,
+            identifiers={k: dense(*v) for k, v in identifiers.items()},
+            instrument_mappings=mappings,
+            attributes={k: dense(*v) for k, v in attributes.items()},
+        )
+
+    @classmethod
+    def _from_columns(
+        cls,
+        client_ids: np.ndarray,
+        quantities: np.ndarray,
+        scales: _Categorical,
+        instrument_mappings: _Categorical,
+        identifiers: Dict[str, np.ndarray],
+        attributes: Dict[str, Column],
+        integral: frozenset,
+    ) -> "PositionColumns":
+        columns = cls.__new__(cls)
+        EntityCollectionBase.__init__(columns)
+        columns._client_ids = client_ids
+        columns._quantities = quantities
+        columns._scales = scales
+        columns._instrument_mappings = instrument_mappings
+        columns._identifiers = identifiers
+        columns._attributes = attributes
+        columns._integral = integral
+        return columns
+
+    def _take(self, index) -> "PositionColumns":
+        return self._from_columns(
+            self._client_ids[index],
+            self._quantities[index],
+            self._scales.take(index),
+            self._instrument_mappings.take(index),
+            {k: v[index] for k, v in self._identifiers.items()},
+            {k: _take(v, index) for k, v in self._attributes.items()},
+            self._integral,
+        )
+
+    def __len__(self):
+        return len(self._client_ids)
+
+    def __iter__(self) -> Iterator[dict]:
+        return self.get_items()
+
+    def __getitem__(self, index) -> Union[dict, "PositionColumns"]:
+        """An int returns the position as a dictionary, a slice, boolean mask or array
+        of indices returns the selected positions as PositionColumns"""
+        if isinstance(index, (int, np.integer)):
+            row = index + len(self) if index < 0 else index
+            if not 0 <= row < len(self):
+                raise IndexError(f"Position index {index} out of range")
+            return next(self._take(slice(row, row + 1)).get_items())
+        return self._take(index)
+
+    def __str__(self):
+        return f"{self.__class__.__name__}({len(self)} positions)"
+
+    @property
+    def client_ids(self) -> np.ndarray:
+        """The client ids, an empty string if a position does not have a client id"""
+        return self._client_ids
+
+    @property
+    def quantities(self) -> np.ndarray:
+        return self._quantities
+
+    @property
+    def scales(self) -> np.ndarray:
+        """The scale (QuantityType) of each position"""
+        return self._scales.values()
+
+    @property
+    def instrument_mappings(self) -> np.ndarray:
+        return self._instrument_mappings.values()
+
+    @property
+    def identifier_types(self) -> List[str]:
+        return list(self._identifiers)
+
+    @property
+    def attribute_names(self) -> List[str]:
+        return list(self._attributes)
+
+    @property
+    def nbytes(self) -> int:
+        """The memory used by the arrays of the columns"""
+        columns = [self._client_ids, self._quantities, self._scales,
+                   self._instrument_mappings]
+        columns.extend(self._identifiers.values())
+        columns.extend(self._attributes.values())
+        return sum(c.nbytes for c in columns)
+
+    def identifiers(self, identifier_type: str) -> np.ndarray:
+        """The identifiers of the type, an empty string if the position does not have
+        an identifier of that type
+
+        Args:
+            identifier_type (str): e.g. ISIN
+        """
+        if identifier_type not in self._identifiers:
+            return np.full(len(self), "", dtype=str)
+        return self._identifiers[identifier_type]
+
+    def attribute(self, name: str) -> np.ndarray:
+        """The values of the attribute, float64 for numeric attributes (NaN when
+        missing) otherwise objects (None when missing)
+
+        Args:
+            name (str): the name of the attribute
+        """
+        column = self._attributes.get(name)
+        if column is None:
+            return np.full(len(self), None, dtype=object)
+        if isinstance(column, _Categorical):
+            return column.values()
+        return column
+
+    def mask(
+        self,
+        scale: Union[QuantityType, str] = None,
+        instrument_mapping: str = None,
+        attributes: Mapping[str, Any] = None,
+    ) -> np.ndarray:
+        """A boolean mask of the positions that match all of the criteria
+
+        Args:
+            scale (Union[QuantityType, str]): the scale of the quantity
+            instrument_mapping (str): the instrument mapping
+            attributes (Mapping[str, Any]): the values of attributes
+
+        Returns:
+            np.ndarray: True for the matching positions
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if scale is not None:
+            scale = get_enum_value(QuantityType, scale)
+            mask &= self._scales.codes == self._scales.code(scale)
+        if instrument_mapping is not None:
+            codes = self._instrument_mappings
+            mask &= codes.codes == codes.code(instrument_mapping)
+        for name, value in (attributes or {}).items():
+            column = self._attributes.get(name)
+            if isinstance(column, _Categorical):
+                mask &= column.codes == column.code(value)
+            elif column is not None:
+                mask &= column == value
+            else:
+                mask[:] = False
+        return mask
+
+    def filter(
+        self,
+        mask: np.ndarray = None,
+        scale: Union[QuantityType, str] = None,
+        instrument_mapping: str = None,
+        attributes: Mapping[str, Any] = None,
+    ) -> "PositionColumns":
+        """The positions selected by the mask that match the criteria (see mask)
+
+        Example:
+            positions.filter(positions.quantities > 0, attributes={"Sector": "IT"})
+
+        Returns:
+            PositionColumns: the selected positions
+        """
+        selected = self.mask(scale, instrument_mapping, attributes)
+        if mask is not None:
+            selected &= mask
+        return self._take(selected)
+
+    def sum(self, by: str = None) -> Union[float, Dict[Any, float]]:
+        """The total quantity, optionally grouped by scale or by the values of an
+        attribute (quantities of different scales should not be added, filter the
+        positions by scale first). Missing quantities are ignored.
+
+        Args:
+            by (str): "scale", "instrumentMapping" or the name of an attribute
+
+        Returns:
+            Union[float, Dict[Any, float]]: the total or the totals by group
+        """
+        quantities = np.nan_to_num(self._quantities, nan=0.0)
+        if by is None:
+            return float(quantities.sum())
+        if by == "scale":
+            column = self._scales
+        elif by == "instrumentMapping":
+            column = self._instrument_mappings
+        else:
+            column = self._attributes.get(by)
+            if column is None:
+                return {None: float(quantities.sum())} if len(self) else {}
+            if not isinstance(column, _Categorical):
+                raise AxiomaValueError(f"Cannot group by the numeric attribute {by}")
+        totals = np.bincount(
+            column.codes, weights=quantities, minlength=len(column.categories)
+        )
+        used = np.bincount(column.codes, minlength=len(column.categories)) > 0
+        return {
+            category: float(total)
+            for category, total, is_used in zip(column.categories, totals, used)
+            if is_used
+        }
+
+    def diff(
+        self, previous: "PositionColumns"
+    ) -> Tuple["PositionColumns", "PositionColumns"]:
+        """Compares the positions to previous positions by client id
+
+        Args:
+            previous (PositionColumns): e.g. the positions stored for the date
+
+        Returns:
+            Tuple[PositionColumns, PositionColumns]: The positions that are new or
+            changed (upsert) and the previous positions that are not in these
+            positions (remove)
+        """
+        # positions without a client id are always upserted and never removed
+        keyed = np.flatnonzero(previous._client_ids != "")
+        order = keyed[np.argsort(previous._client_ids[keyed], kind="stable")]
+        sorted_ids = previous._client_ids[order]
+        found = np.zeros(len(self), dtype=bool)
+        matched = np.zeros(len(self), dtype=np.intp)
+        if len(order):
+            positions = np.searchsorted(sorted_ids, self._client_ids)
+            positions = np.minimum(positions, len(order) - 1)
+            found = (sorted_ids[positions] == self._client_ids) & (
+                self._client_ids != ""
+            )
+            matched = order[positions]
+
+        rows = np.flatnonzero(found)
+        before = previous._take(matched[rows])
+        after = self._take(rows)
+        changed = (
+            _differs(after._quantities, before._quantities)
+            | _differs(after._scales, before._scales)
+            | _differs(after._instrument_mappings, before._instrument_mappings)
+        )
+        for own, other in ((after._identifiers, before._identifiers),
+                           (after._attributes, before._attributes)):
+            for name in own.keys() | other.keys():
+                left = own.get(name)
+                right = other.get(name)
+                if left is None:
+                    left = _missing(right, len(rows))
+                if right is None:
+                    right = _missing(left, len(rows))
+                changed |= _differs(left, right)
+
+        upsert = ~found
+        upsert[rows[changed]] = True
+        remove = ~np.isin(previous._client_ids, self._client_ids)
+        remove &= previous._client_ids != ""
+        return self._take(upsert), previous._take(remove)
+
+    def get_items(self) -> Iterator[dict]:
+        """The positions in the upsert payload format, missing values are omitted"""
+        client_ids = self._client_ids.tolist()
+        quantities = _payload_values(
+            self._quantities, _QUANTITIES in self._integral
+        )
+        scales = self._scales.values().tolist()
+        mappings = self._instrument_mappings.values().tolist()
+        identifiers = {k: v.tolist() for k, v in self._identifiers.items()}
+        attributes = {
+            k: _payload_values(v, k in self._integral)
+            for k, v in self._attributes.items()
+        }
+        for row, client_id in enumerate(client_ids):
+            position = {"clientId": client_id} if client_id else {}
+            row_identifiers = [
+                {"type": identifier_type, "value": values[row]}
+                for identifier_type, values in identifiers.items()
+                if values[row]
+            ]
+            if row_identifiers:
+                position["identifiers"] = row_identifiers
+            quantity = {}
+            if quantities[row] is not None:
+                quantity["value"] = quantities[row]
+            if scales[row] is not None:
+                quantity["scale"] = scales[row].value
+            if quantity:
+                position["quantity"] = quantity
+            if mappings[row] is not None:
+                position["instrumentMapping"] = mappings[row]
+            row_attributes = {
+                name: values[row]
+                for name, values in attributes.items()
+                if values[row] is not None
+            }
+            if row_attributes:
+                position["attributes"] = row_attributes
+            yield position
+
+    def to_dict(self, translate=True, filter_none=True, cloning=False) -> List[dict]:
+        """The positions in the upsert payload format of PortfoliosAPI.patch_positions.
+        The arguments are accepted for compatibility with the other collections, the
+        payload always uses the api names and omits missing values.
+
+        Returns:
+            List[dict]: the positions
+        """
+        return list(self.get_items())
+
+    def clone(self) -> "PositionColumns":
+        return self._from_columns(
+            self._client_ids.copy(),
+            self._quantities.copy(),
+            _Categorical(self._scales.codes.copy(), self._scales.categories),
+            _Categorical(self._instrument_mappings.codes.copy(),
+                         self._instrument_mappings.categories),
+            {k: v.copy() for k, v in self._identifiers.items()},
+            {k: (_Categorical(v.codes.copy(), v.categories)
+                 if isinstance(v, _Categorical) else v.copy())
+             for k, v in self._attributes.items()},
+            self._integral,
+        )
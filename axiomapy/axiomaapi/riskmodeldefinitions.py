@@ -28,8 +28,11 @@ class RiskModelDefinitionsAPI:
 
     """
 
-    @staticmethod
+    _session_cls = AxiomaSession
+
+    @classmethod
     def get_risk_model_definitions(
+        cls,
         filter_results: str = None,
         top: int = None,
         skip: int = None,
@@ -53,7 +56,7 @@ class RiskModelDefinitionsAPI:
         url = "/risk-model-definitions"
         params = odata_params(filter_results, top, skip, orderby)
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url,
             params=params,
             headers=headers,
@@ -61,8 +64,9 @@ class RiskModelDefinitionsAPI:
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_risk_model_definition(
+        cls,
         risk_model_definition_id: str,
         headers: dict = None,
         return_response: bool = False,
@@ -79,7 +83,7 @@ class RiskModelDefinitionsAPI:
         """
         url = f"/risk-model-definitions/{risk_model_definition_id}"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, headers=headers, return_response=return_response
         )
         return response
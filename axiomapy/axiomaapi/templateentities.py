@@ -0,0 +1,198 @@
+"""
+Copyright © 2024 Axioma by SimCorp.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+"""
+import json
+import keyword
+import logging
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+import inflection
+
+from axiomapy.axiomaexceptions import AxiomaValueError
+from axiomapy.entitybase import TemplatedEntityBase
+
+from .metadata import MetaDataAPI
+
+_logger = logging.getLogger(__name__)
+_logger.addHandler(logging.NullHandler())
+
+_JSON_TYPES = {
+    "string": str,
+    "number": float,
+    "integer": int,
+    "boolean": bool,
+    "array": list,
+    "object": dict,
+}
+# properties of the entities that are not generated from the schema
+_TEMPLATE_PROPERTIES = ("templateName", "content")
+
+_class_cache: Dict[str, Type[TemplatedEntityBase]] = {}
+_class_cache_lock = threading.Lock()
+
+
+def _property_type(schema: dict) -> Any:
+    """The python type of a property schema, Any if the type is not known"""
+    json_type = schema.get("type")
+    if isinstance(json_type, list):
+        json_type = next((t for t in json_type if t != "null"), None)
+    return Optional[_JSON_TYPES.get(json_type, Any)]
+
+
+def _class_property_name(model_name: str, taken: set) -> str:
+    """A snake case identifier for the model property name that does not clash with
+    the attributes of TemplatedEntityBase or the other properties"""
+    name = re.sub(r"\W+", "_", model_name).strip("_")
+    name = inflection.underscore(name) if name else "property"
+    if name[0].isdigit():
+        name = f"p_{name}"
+    if keyword.iskeyword(name) or hasattr(TemplatedEntityBase, name):
+        name = f"{name}_"
+    unique = name
+    suffix = 2
+    while unique in taken:
+        unique = f"{name}_{suffix}"
+        suffix += 1
+    taken.add(unique)
+    return unique
+
+
+def _make_property(name: str, prop_type: Any, doc: str = None) -> property:
+    slot = f"_{name}"
+
+    def fget(self):
+        return object.__getattribute__(self, slot)
+
+    def fset(self, value):
+        object.__setattr__(self, slot, value)
+
+    fget.__name__ = fset.__name__ = name
+    fget.__annotations__ = {"return": prop_type}
+    return property(fget, fset, doc=doc)
+
+
+def _split_schema(schema: dict) -> Tuple[dict, dict]:
+    """The top level and content properties of a template schema. The properties of
+    a schema without a content property are the content properties."""
+    properties = schema.get("properties") or {}
+    content = properties.get("content") or {}
+    if "properties" in content:
+        top_level = {
+            k: v for k, v in properties.items() if k not in _TEMPLATE_PROPERTIES
+        }
+        return top_level, content["properties"]
+    return {}, {k: v for k, v in properties.items() if k not in _TEMPLATE_PROPERTIES}
+
+
+def template_entity_class(
+    schema: dict, template_name: str = None, class_name: str = None,
+) -> Type[TemplatedEntityBase]:
+    """Creates a TemplatedEntityBase subclass from the JSON schema of a template (as
+    returned by MetaDataAPI.get_template_schema).
+
+    The class defines __slots__ (the instances have no __dict__), a typed property per
+    property of the schema and the _TEMPLATE_MAPPING between the model names of the
+    content properties and the class properties (e.g. "Coupon Rate" -> coupon_rate).
+    Properties of the schema that are not in the content (e.g. name) are properties
+    of the class that are serialised with their camel case names.
+
+    Example:
+        Bond = template_entity_class(MetaDataAPI.get_template_schema("Bond"))
+        bonds = [Bond.from_dict(e, copy=False) for e in entities]
+
+    Args:
+        schema (dict): the JSON schema of the template
+        template_name (str): the name of the template, defaults to the title of the
+            schema
+        class_name (str): the name of the class, defaults to the template name in
+            camel case
+
+    Returns:
+        Type[TemplatedEntityBase]: the entity class of the template
+    """
+    template_name = template_name or schema.get("title")
+    if not template_name:
+        raise AxiomaValueError("The schema has no title, pass the template_name")
+    if class_name is None:
+        class_name = inflection.camelize(re.sub(r"\W+", "_", template_name))
+        if not class_name.isidentifier():
+            class_name = f"Template{class_name}"
+
+    top_level, content = _split_schema(schema)
+    taken = set()
+    properties: Dict[str, property] = {}
+    mapping: List[Tuple[str, str]] = []
+    for model_name, prop_schema in top_level.items():
+        name = _class_property_name(model_name, taken)
+        properties[name] = _make_property(
+            name, _property_type(prop_schema), prop_schema.get("description")
+        )
+    for model_name, prop_schema in content.items():
+        name = _class_property_name(model_name, taken)
+        properties[name] = _make_property(
+            name, _property_type(prop_schema), prop_schema.get("description")
+        )
+        mapping.append((model_name, name))
+
+    slots = tuple(f"_{name}" for name in properties)
+
+    def __init__(self, **kwargs):
+        for slot in slots:
+            object.__setattr__(self, slot, None)
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+
+    doc = schema.get("description") or f"Entity of the {template_name} template"
+    namespace = {
+        "__slots__": slots,
+        "__init__": __init__,
+        "__module__": __name__,
+        "__doc__": doc,
+        "_TEMPLATE_NAME": template_name,
+        "_TEMPLATE_MAPPING": mapping,
+    }
+    namespace.update(properties)
+    return type(class_name, (TemplatedEntityBase,), namespace)
+
+
+def get_template_entity_class(
+    template_name: str, refresh: bool = False
+) -> Type[TemplatedEntityBase]:
+    """The entity class of the template, generated from the schema returned by
+    MetaDataAPI.get_template_schema using the current session. The classes are cached
+    by template name.
+
+    Args:
+        template_name (str): the name of the template
+        refresh (bool): request the schema again and replace the cached class
+
+    Returns:
+        Type[TemplatedEntityBase]: the entity class of the template
+    """
+    if not refresh:
+        cls = _class_cache.get(template_name)
+        if cls is not None:
+            return cls
+    response = MetaDataAPI.get_template_schema(template_name)
+    schema = response.json()
+    if schema is None:
+        # the schema is not served as application/json, e.g. application/schema+json
+        schema = json.loads(response.content)
+    cls = template_entity_class(schema, template_name=template_name)
+    with _class_cache_lock:
+        _class_cache[template_name] = cls
+    return cls
@@ -28,8 +28,11 @@ class TemplatesAPI:
     """Access api methods of templates using the active session
     """
 
-    @staticmethod
+    _session_cls = AxiomaSession
+
+    @classmethod
     def get_templates(
+        cls,
         filter_results: str = None,
         top: int = None,
         skip: int = None,
@@ -51,13 +54,14 @@ class TemplatesAPI:
         url = "/templates"
         params = odata_params(filter_results, top, skip, orderby)
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, params=params, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_templates_by_type(
+        cls,
         typeName1: str = "any", headers: dict = None, return_response: bool = False,
     ):
         """The method fetches a template for a given type
@@ -72,13 +76,14 @@ class TemplatesAPI:
         """
         url = f"/templates/{typeName1}"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, headers=headers, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_templates_by_type2(
+        cls,
         typeName1: str = "any",
         typeName2: str = "any",
         headers: dict = None,
@@ -97,13 +102,14 @@ class TemplatesAPI:
         """
         url = f"/templates/{typeName1}/{typeName2}"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, headers=headers, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_entities(
+        cls,
         template_name: str,
         typeName1: str = "any",
         typeName2: str = "any",
@@ -124,13 +130,14 @@ class TemplatesAPI:
         """
         url = f"/templates/{typeName1}/{typeName2}/{template_name}"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, headers=headers, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def get_entity(
+        cls,
         id_: int,
         template_name: str,
         typeName1: str = "any",
@@ -153,13 +160,14 @@ class TemplatesAPI:
         """
         url = f"/templates/{typeName1}/{typeName2}/{template_name}/{id_}"
         _logger.info(f"Getting from {url}")
-        response = AxiomaSession.current._get(
+        response = cls._session_cls.current._get(
             url, headers=headers, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def post_entity(
+        cls,
         entity: dict,
         template_name: str,
         typeName1: str = "any",
@@ -182,13 +190,14 @@ class TemplatesAPI:
         """
         url = f"/templates/{typeName1}/{typeName2}/{template_name}"
         _logger.info(f"Posting to {url}")
-        response = AxiomaSession.current._post(
+        response = cls._session_cls.current._post(
             url, entity, headers=headers, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def put_entity(
+        cls,
         entity: dict,
         id_: int,
         template_name: str,
@@ -213,13 +222,14 @@ class TemplatesAPI:
         """
         url = f"/templates/{typeName1}/{typeName2}/{template_name}/{id_}"
         _logger.info(f"Putting to {url}")
-        response = AxiomaSession.current._put(
+        response = cls._session_cls.current._put(
             url, entity, headers=headers, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def delete_entity(
+        cls,
         id_: int,
         template_name: str,
         typeName1: str = "any",
@@ -242,13 +252,14 @@ class TemplatesAPI:
         """
         url = f"/templates/{typeName1}/{typeName2}/{template_name}/{id_}"
         _logger.info(f"Deleting {url}")
-        response = AxiomaSession.current._delete(
+        response = cls._session_cls.current._delete(
             url, headers=headers, return_response=return_response
         )
         return response
 
-    @staticmethod
+    @classmethod
     def patch_entities(
+        cls,
         template_name: str,
         entities_upsert: List[dict] = None,
         entities_remove: List[dict] = None,
@@ -284,7 +295,7 @@ class TemplatesAPI:
         entities_patch = {"upsert": entities_upsert, "remove": entities_remove}
         if import_settings is not None:
             entities_patch["importSettings"] = import_settings
-        response = AxiomaSession.current._patch(
+        response = cls._session_cls.current._patch(
             url,
             entities_patch,
             headers=headers,
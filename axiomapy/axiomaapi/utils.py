@@ -14,67 +14,48 @@ specific language governing permissions and limitations
 under the License.
 
 """
-import time
+import logging
 
-from axiomapy.axiomaapi import AnalysesAPI, AnalysesRiskAPI, enums
+from axiomapy.axiomaapi import AnalysesRiskAPI
+from axiomapy.axiomaapi.jobs import AnalysisJob, PollingPolicy
+from axiomapy.axiomaexceptions import AxiomaJobTimeoutError
+
+_logger = logging.getLogger(__name__)
+_logger.addHandler(logging.NullHandler())
+
+
+def _wait(job: AnalysisJob, timelimit: float):
+    """Waits for the job, the last status is returned if it does not finish within
+    the time limit"""
+    try:
+        job.wait(timeout=timelimit)
+    except AxiomaJobTimeoutError:
+        _logger.warning(
+            f"The request {job.request_id} is {job.status} after {timelimit}s"
+        )
+    _logger.info(f"The request {job.request_id} is {job.status}")
+    return job
 
 
 def request_model(data, timelimit=500):
     headers = AnalysesRiskAPI.post_risk_model_request(risk_model_parameters=data)
-    requestId = int(headers.headers["location"].split("/")[-1])
-    # Recursively checking the status of the risk model job
-    itns = int(timelimit / 5)
-    for idx in range(itns):
-        status = AnalysesRiskAPI.get_risk_model_request_status(requestId)
-        stat = status.json()["status"]
-        print(stat)
-        if stat in [
-            enums.FinishedStatuses.Completed,
-            enums.FinishedStatuses.Failed,
-        ]:
-            break
-        time.sleep(5)
-        print("Still waiting", idx * 5, "seconds")
-
-    return stat, headers
+    job = _wait(AnalysisJob.risk_model(headers), timelimit)
+    return job.status, headers
 
 
 def request_instrument_analytics(data, timelimit=500):
     headers = AnalysesRiskAPI.post_instrument_analyses(data)
-    requestId = int(headers.headers["location"].split("/")[-1])
-
-    # Recursively checking the status of the job
-    itns = int(timelimit / 5)
-    for idx in range(itns):
-        status = AnalysesAPI.get_analyses_status(requestId)
-        stat = status.json()["status"]
-        print(stat)
-        if stat.lower() in [
-            enums.FinishedStatuses.Completed,
-            enums.FinishedStatuses.Failed,
-        ]:
-            break
-        time.sleep(5)
-        print("Still waiting", idx * 5, "seconds")
-    return stat, headers
+    job = _wait(AnalysisJob.analysis(headers, api=AnalysesRiskAPI), timelimit)
+    return job.status, headers
 
 
 def request_aggregation(data, portfolio_id, timelimit=500, polling_freq=5):
     headers = AnalysesRiskAPI.post_portfolio_analyses(
         analyses_parameters=data, portfolio_id=portfolio_id
     )
-    requestId = int(headers.headers["location"].split("/")[-1])
-    # Recursively checking the status of the job
-    itns = int(timelimit / polling_freq)
-    for idx in range(itns):
-        status = AnalysesAPI.get_analyses_status(requestId)
-        stat = status.json()["status"]
-        print(stat)
-        if stat.title() in [
-            enums.FinishedStatuses.Completed,
-            enums.FinishedStatuses.Failed,
-        ]:
-            break
-        time.sleep(polling_freq)
-        print("Still waiting", idx * polling_freq, "seconds")
-    return status, headers
+    # polling_freq is the longest interval between the status requests
+    policy = PollingPolicy(max_interval=max(polling_freq, 0.1))
+    job = _wait(
+        AnalysisJob.analysis(headers, api=AnalysesRiskAPI, policy=policy), timelimit
+    )
+    return job.status_response, headers
@@ -153,3 +153,20 @@ class AxiomaPatchError(AxiomaError):
             ",\n".join(self._upsert), ",\n".join(self._remove)
         )
         return result
+
+
+class AxiomaJobError(AxiomaError):
+    """An analysis job failed, timed out or was cancelled"""
+
+    def __init__(self, message="", request_id=None, status=None):
+        super().__init__(message=message)
+        self.request_id = request_id
+        self.status = status
+
+
+class AxiomaJobTimeoutError(AxiomaJobError):
+    pass
+
+
+class AxiomaJobCancelledError(AxiomaJobError):
+    pass
@@ -0,0 +1,162 @@
+"""
+Copyright © 2024 Axioma by SimCorp.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+"""
+import gzip
+import importlib.util
+import logging
+from typing import Callable, Iterable, List, Optional, Tuple, Union
+
+from axiomapy.axiomaexceptions import AxiomaValueError
+
+_logger = logging.getLogger(__name__)
+_logger.addHandler(logging.NullHandler())
+
+DEFAULT_MIN_SIZE = 64 * 1024
+
+# the packages httpx needs to decode each content encoding of a response
+_DECODER_PACKAGES = {
+    "gzip": (),
+    "deflate": (),
+    "br": ("brotli", "brotlicffi"),
+    "zstd": ("zstandard",),
+}
+
+
+def supported_content_encodings() -> List[str]:
+    """The content encodings of the responses that can be decoded (gzip and deflate,
+    br if brotli is installed and zstd if zstandard is installed)
+
+    Returns:
+        List[str]: the encodings in order of preference
+    """
+    encodings = ["zstd", "br", "gzip", "deflate"]
+    return [
+        e
+        for e in encodings
+        if not _DECODER_PACKAGES[e]
+        or any(importlib.util.find_spec(p) is not None for p in _DECODER_PACKAGES[e])
+    ]
+
+
+def accept_encoding_header(encodings: Union[str, Iterable[str], None]) -> Optional[str]:
+    """The Accept-Encoding header of the encodings
+
+    Args:
+        encodings (Union[str, Iterable[str]]): "auto" for all the supported encodings,
+            a header value or the encodings (e.g. ["zstd", "gzip"]). None keeps the
+            default of httpx
+
+    Returns:
+        Optional[str]: the header value
+
+    Raises:
+        AxiomaValueError: an encoding is unknown or can not be decoded
+    """
+    if encodings is None:
+        return None
+    if encodings == "auto":
+        return ", ".join(supported_content_encodings())
+    if isinstance(encodings, str):
+        encodings = [e.split(";")[0].strip() for e in encodings.split(",")]
+    supported = supported_content_encodings() + ["identity"]
+    for encoding in encodings:
+        if encoding not in supported:
+            raise AxiomaValueError(
+                f"The {encoding!r} content encoding can not be decoded, the supported "
+                f"encodings are {', '.join(supported)}"
+            )
+    return ", ".join(encodings)
+
+
+def _gzip_compressor(level: Optional[int]) -> Callable[[bytes], bytes]:
+    level = 6 if level is None else level
+    return lambda body: gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def _zstd_compressor(level: Optional[int]) -> Callable[[bytes], bytes]:
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError(
+            "zstd compression requires the zstandard package, "
+            "pip install axioma-py[zstd]"
+        ) from e
+    compressor = zstandard.ZstdCompressor(level=3 if level is None else level)
+    return compressor.compress
+
+
+_COMPRESSORS = {"gzip": _gzip_compressor, "zstd": _zstd_compressor}
+
+
+class CompressionPolicy:
+    """Compresses the JSON bodies of the requests of a session that are larger than
+    min_size and sets the Content-Encoding header. Requests that already have a
+    Content-Encoding header (e.g. a payload compressed by the caller) are sent
+    unchanged.
+
+    Example:
+        AxiomaSession.use_session(..., compression=CompressionPolicy("gzip"))
+
+    Args:
+        encoding (str): "gzip" or "zstd" (requires the zstandard package)
+        min_size (int): Bodies smaller than this number of bytes are not compressed
+        level (int): The compression level, defaults to 6 for gzip and 3 for zstd
+        methods (Iterable[str]): The http methods of the requests that are compressed
+    """
+
+    def __init__(
+        self,
+        encoding: str = "gzip",
+        min_size: int = DEFAULT_MIN_SIZE,
+        level: Optional[int] = None,
+        methods: Iterable[str] = ("POST", "PUT", "PATCH"),
+    ):
+        if encoding not in _COMPRESSORS:
+            raise AxiomaValueError(
+                f"Unknown encoding {encoding!r}, expected one of "
+                f"{', '.join(_COMPRESSORS)}"
+            )
+        if min_size < 0:
+            raise AxiomaValueError(f"min_size must not be negative, got {min_size}")
+        self.encoding = encoding
+        self.min_size = min_size
+        self.level = level
+        self.methods = frozenset(m.upper() for m in methods)
+        self._compress = _COMPRESSORS[encoding](level)
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(encoding={self.encoding!r}, "
+            f"min_size={self.min_size}, level={self.level})"
+        )
+
+    def should_compress(self, method: str, body: bytes) -> bool:
+        return method.upper() in self.methods and len(body) >= self.min_size
+
+    def compress(self, body: bytes) -> Tuple[bytes, str]:
+        """Compresses the body
+
+        Args:
+            body (bytes): the encoded request body
+
+        Returns:
+            Tuple[bytes, str]: the compressed body and its Content-Encoding
+        """
+        compressed = self._compress(body)
+        _logger.debug(
+            f"Compressed the request body with {self.encoding} from {len(body)} to "
+            f"{len(compressed)} bytes"
+        )
+        return compressed, self.encoding
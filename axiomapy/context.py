@@ -13,6 +13,7 @@ KIND, either express or implied.  See the License for the
 specific language governing permissions and limitations
 under the License.
 """
+import contextlib
 import contextvars
 import logging
 from threading import local
@@ -38,12 +39,49 @@ context_stacks_var = contextvars.ContextVar("context_stacks", default={})
 entered_var = contextvars.ContextVar("context_stacks", default={})
 
 
+def _context_root(clz: type) -> type:
+    """Returns the class that manages the context for clz, i.e. the first class in the
+    mro that lists BaseContext as a direct base. Each root has its own current instance
+    so e.g. a sync and an async session can be current at the same time.
+
+    Args:
+        clz (type): a subclass of BaseContext
+
+    Returns:
+        type: the context root (or clz if none is found)
+    """
+    for base in clz.__mro__:
+        if BaseContext in base.__bases__:
+            return base
+    return clz
+
+
+@contextlib.contextmanager
+def as_current(instance: T):
+    """Makes instance the current instance of its context root in this thread, e.g.
+    to share a session with worker threads. Unlike entering the instance, its
+    _on_enter and _on_exit are not called (so a session is not closed on exit) and
+    it is safe to use from many threads at once. The previous current instance of
+    the thread is restored on exit.
+
+    Args:
+        instance (T): an instance of a subclass of BaseContext
+    """
+    key = f"{_context_root(type(instance)).__name__}_current"
+    previous = getattr(thread_local, key, None)
+    setattr(thread_local, key, instance)
+    try:
+        yield instance
+    finally:
+        setattr(thread_local, key, previous)
+
+
 # use meta class to create a property on the type (not instance)
 class BaseMeta(type):
     @property
     def current(cls: Type[T]) -> T:
         # current = current_session_var.get()
-        current = getattr(thread_local, "_current", None)
+        current = getattr(thread_local, f"{_context_root(cls).__name__}_current", None)
 
         if current is None:
             raise AxiomaUninitialisedError(f"{cls.__name__} is not initialised")
@@ -53,7 +91,7 @@ class BaseMeta(type):
     # set current
     @current.setter
     def current(cls: Type[T], session: T):
-        setattr(thread_local, "_current", session)
+        setattr(thread_local, f"{_context_root(cls).__name__}_current", session)
         # current_session_var.set(session)
         _logger.debug(f"Set session to {getattr(session, 'name', 'None' )}")
 
@@ -157,21 +195,7 @@ class BaseContext(metaclass=BaseMeta):
         Returns:
             BaseMeta -- [description]
         """
-        seen = set()
-        stack = [self.__class__]
-        cls = None
-
-        while stack:
-            base = stack.pop()
-            if BaseContext in base.__bases__:
-                cls = base
-                break
-
-            if base not in seen:
-                seen.add(base)
-                stack.extend(b for b in base.__bases__ if issubclass(b, BaseContext))
-
-        return cls or self.__class__
+        return _context_root(self.__class__)
 
     @property
     def is_entered(self) -> bool:
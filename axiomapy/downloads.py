@@ -0,0 +1,451 @@
+"""
+Copyright © 2024 Axioma by SimCorp.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+"""
+import io
+import logging
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, AsyncIterable, Iterable, List, Optional, Union
+
+from axiomapy.axiomaexceptions import AxiomaValueError
+
+_logger = logging.getLogger(__name__)
+_logger.addHandler(logging.NullHandler())
+
+PathLike = Union[str, os.PathLike]
+
+_LOCAL_HEADER = struct.Struct("<4sHHHHHIIIHH")
+_LOCAL_SIGNATURE = b"PK\x03\x04"
+_DESCRIPTOR_SIGNATURE = b"PK\x07\x08"
+# the records after the members, the extraction stops at the first one
+_END_SIGNATURES = (b"PK\x01\x02", b"PK\x05\x06", b"PK\x06\x06", b"PK\x06\x07")
+_FLAG_DESCRIPTOR = 0x08
+_FLAG_UTF8 = 0x800
+_STORED, _DEFLATED = 0, 8
+_ZIP64_EXTRA = 0x0001
+
+_HEADER, _DATA, _DESCRIPTOR, _DONE = range(4)
+
+
+def _part_path(path: Path) -> Path:
+    return path.with_name(path.name + ".part")
+
+
+def download_to(chunks: Iterable[bytes], path: PathLike) -> int:
+    """Writes the chunks (e.g. the iter_bytes() of a streamed response) to a file.
+    The chunks are written to path.part which is renamed to path once complete so
+    an interrupted download does not leave a truncated file at path.
+
+    Args:
+        chunks (Iterable[bytes]): the bytes to write
+        path (PathLike): the file
+
+    Returns:
+        int: the number of bytes written
+    """
+    path = Path(path)
+    part = _part_path(path)
+    size = 0
+    try:
+        with open(part, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+                size += len(chunk)
+        os.replace(part, path)
+    except BaseException:
+        part.unlink(missing_ok=True)
+        raise
+    _logger.debug(f"Downloaded {size} bytes to {path}")
+    return size
+
+
+async def adownload_to(chunks: AsyncIterable[bytes], path: PathLike) -> int:
+    """Async version of download_to"""
+    path = Path(path)
+    part = _part_path(path)
+    size = 0
+    try:
+        with open(part, "wb") as f:
+            async for chunk in chunks:
+                f.write(chunk)
+                size += len(chunk)
+        os.replace(part, path)
+    except BaseException:
+        part.unlink(missing_ok=True)
+        raise
+    _logger.debug(f"Downloaded {size} bytes to {path}")
+    return size
+
+
+def _member_path(directory: Path, name: str) -> Path:
+    """The path of a member below directory, the drive, absolute and parent parts
+    of the name are dropped like zipfile.extract does"""
+    name = os.path.splitdrive(name.replace("/", os.path.sep))[1]
+    parts = [p for p in name.split(os.path.sep) if p not in ("", os.curdir, os.pardir)]
+    if not parts:
+        raise AxiomaValueError(f"The zip member name {name!r} is not valid")
+    return directory.joinpath(*parts)
+
+
+class ZipStreamExtractor:
+    """Extracts the members of a zip archive as its bytes are received, using the
+    local header of each member rather than the central directory at the end of the
+    archive. Only the current chunk and the member being written are open at a time,
+    the archive is not held in memory or written to disk.
+
+    Example:
+        extractor = ZipStreamExtractor("results")
+        for chunk in response.iter_bytes():
+            extractor.feed(chunk)
+        paths = extractor.close()
+
+    Args:
+        directory (PathLike): The directory the members are extracted to
+    """
+
+    def __init__(self, directory: PathLike):
+        self.directory = Path(directory)
+        self.paths: List[Path] = []
+        self._buffer = bytearray()
+        self._state = _HEADER
+        self._file = None
+        self._member = None
+
+    def feed(self, chunk: bytes) -> List[Path]:
+        """Extracts the next part of the archive
+
+        Args:
+            chunk (bytes): the next bytes of the archive
+
+        Returns:
+            List[Path]: the paths of the members completed by the chunk
+        """
+        if self._state == _DONE:
+            return []
+        self._buffer += chunk
+        done = len(self.paths)
+        while self._state != _DONE and self._step():
+            pass
+        return self.paths[done:]
+
+    def close(self) -> List[Path]:
+        """Signals the end of the archive
+
+        Returns:
+            List[Path]: the paths of all the extracted members
+
+        Raises:
+            AxiomaValueError: the archive is incomplete
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._state not in (_HEADER, _DONE) or self._buffer:
+            raise AxiomaValueError("The zip archive is incomplete")
+        return self.paths
+
+    def _step(self) -> bool:
+        if self._state == _HEADER:
+            return self._read_header()
+        if self._state == _DATA:
+            return self._read_data()
+        return self._read_descriptor()
+
+    def _read_header(self) -> bool:
+        buffer = self._buffer
+        if len(buffer) < 4:
+            return False
+        signature = bytes(buffer[:4])
+        if signature in _END_SIGNATURES:
+            self._state = _DONE
+            self._buffer = bytearray()
+            return False
+        if signature != _LOCAL_SIGNATURE:
+            raise AxiomaValueError("The response is not a zip archive")
+        if len(buffer) < _LOCAL_HEADER.size:
+            return False
+        (
+            _,
+            _,
+            flags,
+            method,
+            _,
+            _,
+            crc,
+            compressed_size,
+            _,
+            name_size,
+            extra_size,
+        ) = _LOCAL_HEADER.unpack_from(buffer)
+        end = _LOCAL_HEADER.size + name_size + extra_size
+        if len(buffer) < end:
+            return False
+        raw_name = bytes(buffer[_LOCAL_HEADER.size:_LOCAL_HEADER.size + name_size])
+        extra = bytes(buffer[_LOCAL_HEADER.size + name_size:end])
+        del buffer[:end]
+
+        name = raw_name.decode("utf-8" if flags & _FLAG_UTF8 else "cp437")
+        zip64, compressed_size = self._zip64_size(extra, compressed_size)
+        descriptor = bool(flags & _FLAG_DESCRIPTOR)
+        if method not in (_STORED, _DEFLATED):
+            raise AxiomaValueError(
+                f"The zip member {name} uses an unsupported compression method {method}"
+            )
+        if descriptor and method == _STORED:
+            raise AxiomaValueError(
+                f"The size of the stored zip member {name} is not known, it can not be "
+                "extracted while streaming"
+            )
+        path = _member_path(self.directory, name)
+        is_dir = name.endswith("/")
+        if is_dir:
+            path.mkdir(parents=True, exist_ok=True)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(path, "wb")
+        self._member = {
+            "path": path,
+            "is_dir": is_dir,
+            "crc": crc,
+            "actual_crc": 0,
+            "remaining": None if descriptor else compressed_size,
+            "descriptor": descriptor,
+            "zip64": zip64,
+            "decompressor": zlib.decompressobj(-15) if method == _DEFLATED else None,
+        }
+        self._state = _DATA
+        return True
+
+    @staticmethod
+    def _zip64_size(extra: bytes, compressed_size: int):
+        """Whether the member has a zip64 extra field, and its compressed size"""
+        pos = 0
+        while pos + 4 <= len(extra):
+            header_id, size = struct.unpack_from("<HH", extra, pos)
+            if header_id == _ZIP64_EXTRA:
+                # the uncompressed size comes first when both are in the field
+                if compressed_size == 0xFFFFFFFF and size >= 16:
+                    compressed_size = struct.unpack_from("<Q", extra, pos + 12)[0]
+                elif compressed_size == 0xFFFFFFFF:
+                    compressed_size = struct.unpack_from("<Q", extra, pos + 4)[0]
+                return True, compressed_size
+            pos += 4 + size
+        return False, compressed_size
+
+    def _write(self, data: bytes):
+        member = self._member
+        decompressor = member["decompressor"]
+        if decompressor is not None:
+            data = decompressor.decompress(data)
+        if data and not member["is_dir"]:
+            member["actual_crc"] = zlib.crc32(data, member["actual_crc"])
+            self._file.write(data)
+
+    def _read_data(self) -> bool:
+        member = self._member
+        buffer = self._buffer
+        if member["remaining"] is not None:
+            if member["remaining"] and not buffer:
+                return False
+            data = bytes(buffer[:member["remaining"]])
+            del buffer[:len(data)]
+            member["remaining"] -= len(data)
+            if data:
+                self._write(data)
+            if member["remaining"]:
+                return False
+        else:
+            if not buffer:
+                return False
+            decompressor = member["decompressor"]
+            data = bytes(buffer)
+            buffer.clear()
+            self._write(data)
+            if not decompressor.eof:
+                return False
+            buffer += decompressor.unused_data
+        if member["descriptor"]:
+            self._state = _DESCRIPTOR
+        else:
+            self._finish(member["crc"])
+        return True
+
+    def _read_descriptor(self) -> bool:
+        buffer = self._buffer
+        start = 4 if buffer[:4] == _DESCRIPTOR_SIGNATURE else 0
+        size = start + (20 if self._member["zip64"] else 12)
+        if len(buffer) < max(size, 4):
+            return False
+        crc = struct.unpack_from("<I", buffer, start)[0]
+        del buffer[:size]
+        self._finish(crc)
+        return True
+
+    def _finish(self, crc: int):
+        member = self._member
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if not member["is_dir"]:
+            if member["actual_crc"] != crc:
+                raise AxiomaValueError(
+                    f"Bad CRC-32 for the zip member {member['path']}"
+                )
+            self.paths.append(member["path"])
+        self._member = None
+        self._state = _HEADER
+
+
+def extract_zip(chunks: Iterable[bytes], directory: PathLike) -> List[Path]:
+    """Extracts a zip archive received in chunks (e.g. the iter_bytes() of a
+    multipart/x-zip response) member by member as it arrives
+
+    Args:
+        chunks (Iterable[bytes]): the bytes of the archive
+        directory (PathLike): the directory the members are extracted to
+
+    Returns:
+        List[Path]: the paths of the extracted files
+    """
+    extractor = ZipStreamExtractor(directory)
+    for chunk in chunks:
+        extractor.feed(chunk)
+    return extractor.close()
+
+
+async def aextract_zip(
+    chunks: AsyncIterable[bytes], directory: PathLike
+) -> List[Path]:
+    """Async version of extract_zip"""
+    extractor = ZipStreamExtractor(directory)
+    async for chunk in chunks:
+        extractor.feed(chunk)
+    return extractor.close()
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.csv
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            "Writing parquet files requires the pyarrow package, "
+            "pip install axioma-py[parquet]"
+        ) from e
+    return pyarrow
+
+
+def items_to_parquet(
+    items: Iterable[dict],
+    path: PathLike,
+    batch_size: int = 10000,
+    schema: Any = None,
+) -> int:
+    """Writes dictionaries (e.g. the items of a streamed JSON response) to a parquet
+    file, one row group per batch_size items, so at most a batch is held in memory.
+
+    Args:
+        items (Iterable[dict]): the rows
+        path (PathLike): the parquet file
+        batch_size (int): the number of rows of a row group
+        schema (pyarrow.Schema): the schema of the file, by default the schema
+            inferred from the first batch
+
+    Returns:
+        int: the number of rows written
+    """
+    pa = _import_pyarrow()
+    if batch_size < 1:
+        raise AxiomaValueError(f"batch_size must be positive, got {batch_size}")
+    writer = None
+    rows = 0
+    batch = []
+
+    def write_batch():
+        nonlocal writer
+        table = pa.Table.from_pylist(
+            batch, schema=schema if writer is None else writer.schema
+        )
+        if writer is None:
+            writer = pa.parquet.ParquetWriter(str(path), table.schema)
+        writer.write_table(table)
+
+    try:
+        for item in items:
+            batch.append(item)
+            if len(batch) == batch_size:
+                write_batch()
+                rows += len(batch)
+                batch = []
+        if batch or writer is None:
+            write_batch()
+            rows += len(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+class _ChunkReader(io.RawIOBase):
+    """A readable file over an iterable of chunks"""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._chunk = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._chunk:
+            self._chunk = next(self._chunks, None)
+            if self._chunk is None:
+                self._chunk = b""
+                return 0
+        size = min(len(buffer), len(self._chunk))
+        buffer[:size] = self._chunk[:size]
+        self._chunk = self._chunk[size:]
+        return size
+
+
+def csv_to_parquet(
+    chunks: Iterable[bytes], path: PathLike, block_size: Optional[int] = None
+) -> int:
+    """Converts a CSV document received in chunks (e.g. the iter_bytes() of a
+    streamed text/csv response) to a parquet file, one block at a time
+
+    Args:
+        chunks (Iterable[bytes]): the bytes of the CSV document
+        path (PathLike): the parquet file
+        block_size (int): the number of bytes of CSV converted at a time (the
+            pyarrow default is 1MB)
+
+    Returns:
+        int: the number of rows written
+    """
+    pa = _import_pyarrow()
+    read_options = pa.csv.ReadOptions(block_size=block_size) if block_size else None
+    reader = pa.csv.open_csv(
+        io.BufferedReader(_ChunkReader(chunks)), read_options=read_options
+    )
+    rows = 0
+    with pa.parquet.ParquetWriter(str(path), reader.schema) as writer:
+        for batch in reader:
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    return rows
@@ -19,23 +19,26 @@ Copyright 2019 Goldman Sachs under Apache License 2.0
 """
 
 import builtins
-import copy
 import keyword
 from abc import ABC, abstractmethod
 from collections import namedtuple
 from datetime import date, datetime
+from copy import deepcopy
 from enum import Enum
-from functools import wraps
+from functools import lru_cache, wraps
 from inspect import Parameter, signature
+from operator import attrgetter
 from typing import (
     Any,
     Callable,
     Dict,
+    Hashable,
     Iterable,
     List,
     MutableMapping,
     MutableSequence,
     MutableSet,
+    Optional,
     Tuple,
     Type,
     TypeVar,
@@ -124,7 +127,47 @@ def none_or_instance(arg: Any, type_: Type):
 
 Prop_info = namedtuple("Prop_info", ["is_iterable", "is_entity", "is_enum"])
 
+# How a class property is serialised, prop_type is None when the type hints could not
+# be resolved when the plan was built (resolved when a value is serialised instead)
+Serialisation_info = namedtuple(
+    "Serialisation_info",
+    ["name", "key", "prop_type", "do_not_serialise", "do_not_clone"],
+)
+
+# returned by a value converter when the property is left out of the dictionary
+_OMIT = object()
+
+
+def _entity_dict(entity, options: dict):
+    # an entity without values is left out
+    return entity.to_dict(**options) or _OMIT
+
+
+def _entity_dicts(entities, options: dict) -> list:
+    dicts = (entity.to_dict(**options) for entity in entities)
+    return [d for d in dicts if len(d) > 0]  # empty ones shouldn't really happen...
+
+
+# how the values of each property type are serialised, the other types are unchanged
+_VALUE_CONVERTERS = {
+    PropTypeEnums.EnumType: lambda value, options: value.value,
+    PropTypeEnums.CommonBaseType: _entity_dict,
+    PropTypeEnums.IterableEnumType: lambda value, options: [e.value for e in value],
+    PropTypeEnums.IterableCommonBaseType: _entity_dicts,
+    PropTypeEnums.DictOfCommonBase: (
+        lambda value, options: _entity_dicts(value.values(), options)
+    ),
+    PropTypeEnums.Date: lambda value, options: date_arg_fmt(value, format="%Y-%m-%d"),
+    PropTypeEnums.DateTime: (
+        lambda value, options: date_arg_fmt(value, format="%Y-%m-%dT00:00:00")
+    ),
+}
+
+
+_BUILTINS = frozenset(dir(builtins))
 
+
+@lru_cache(maxsize=4096)
 def _normalise_arg(argv: str) -> str:
     """appends '_' to a the arg if it is a keyword
 
@@ -134,15 +177,67 @@ def _normalise_arg(argv: str) -> str:
     Returns:
         str: [description]
     """
-    if keyword.iskeyword(argv) or argv in dir(builtins):
+    if keyword.iskeyword(argv) or argv in _BUILTINS:
         return argv + "_"
     else:
         return argv
 
 
+@lru_cache(maxsize=4096)
+def _underscore(name: str) -> str:
+    """Cached inflection.underscore, the names are the (bounded) model and class
+    property names"""
+    return inflection.underscore(name)
+
+
+@lru_cache(maxsize=4096)
+def _camelize(name: str) -> str:
+    """Cached inflection.camelize (lower camel case)"""
+    return inflection.camelize(name, False)
+
+
 _TFunc = TypeVar("_TFunc", bound=Callable[..., Any])
 
 
+def _slot_names(klass: type) -> Tuple[str, ...]:
+    slots = klass.__dict__.get("__slots__", ())
+    return (slots,) if isinstance(slots, str) else tuple(slots)
+
+
+class PropertyRegistry:
+    """The public properties of an entity class with their setters and the caches
+    derived from them (serialisation plan, key resolutions, constructor arguments).
+    Each class has its own registry, built on first use by EntityBase._registry().
+
+    Args:
+        cls (type): the entity class
+    """
+
+    def __init__(self, cls: type):
+        self.properties: Dict[str, property] = {
+            name: getattr(cls, name)
+            for name in dir(cls)
+            if not name.startswith("_") and isinstance(getattr(cls, name), property)
+        }
+        self.names = set(self.properties)
+        self.setters: Dict[str, Callable] = {
+            name: prop.fset
+            for name, prop in self.properties.items()
+            if prop.fset is not None
+        }
+        self.serialisation_plan: Optional[Tuple[Serialisation_info, ...]] = None
+        self.model_keys: Optional[Dict[str, str]] = None
+        self.settable_properties: Optional[Dict[str, Optional[str]]] = None
+        self.key_resolutions: Dict[str, Tuple[Optional[str], str]] = {}
+        self.constructor_args: Optional[Tuple[str, ...]] = None
+        self.slots: Tuple[str, ...] = tuple(
+            slot
+            for klass in reversed(cls.__mro__)
+            for slot in _slot_names(klass)
+            if slot not in ("__dict__", "__weakref__")
+        )
+
+
 def do_not_clone(func: _TFunc) -> _TFunc:
     """A decorator to be used on properties that should be ignored when cloning
 
@@ -191,7 +286,7 @@ def camel_case_translate(f: _TFunc) -> _TFunc:
             arg = _normalise_arg(arg)
 
             if not arg.isupper():
-                snake_case_arg = inflection.underscore(arg)
+                snake_case_arg = _underscore(arg)
                 if snake_case_arg != arg:
                     if snake_case_arg in kwargs:
                         raise ValueError(
@@ -210,6 +305,8 @@ def camel_case_translate(f: _TFunc) -> _TFunc:
 
 
 class CommonBase(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def clone(self, **kwargs):
         raise NotImplementedError("Class must implement method")
@@ -234,7 +331,8 @@ class EntityBase(CommonBase):
         [type] -- [description]
     """
 
-    __properties = set()
+    __slots__ = ()
+    __registry = None
 
     def __init__(self: S, **kwargs) -> S:
         pass
@@ -259,14 +357,20 @@ class EntityBase(CommonBase):
         Returns:
             set -- with properties
         """
-        if not cls.__properties:
-            s = set(
-                i
-                for i in dir(cls)
-                if isinstance(getattr(cls, i), property) and not i.startswith("_")
-            )
-            cls.__properties = s
-        return cls.__properties
+        return cls._registry().names
+
+    @classmethod
+    def _registry(cls) -> PropertyRegistry:
+        """The property registry of this class (not inherited from a parent class)
+
+        Returns:
+            PropertyRegistry: the registry of the class
+        """
+        registry = cls.__dict__.get("_EntityBase__registry")
+        if registry is None:
+            registry = PropertyRegistry(cls)
+            cls.__registry = registry
+        return registry
 
     @classmethod
     def _translate_to_class_prop(cls, prop_name: str, reverse: bool = False) -> str:
@@ -284,8 +388,8 @@ class EntityBase(CommonBase):
             True)
         """
         if reverse:
-            return inflection.camelize(prop_name, False)
-        return inflection.underscore(prop_name)
+            return _camelize(prop_name)
+        return _underscore(prop_name)
 
     @classmethod
     def _get_prop_type(cls, prop) -> PropTypeEnums:
@@ -365,6 +469,56 @@ class EntityBase(CommonBase):
 
         return PropTypeEnums.OtherType
 
+    @classmethod
+    def _serialisation_plan(cls) -> Tuple[Serialisation_info, ...]:
+        """The serialisation info of each class property. Built on first use per class
+        so the type hints and decorators are not inspected on every to_dict call.
+
+        Returns:
+            Tuple[Serialisation_info, ...]: info for each property
+        """
+        registry = cls._registry()
+        plan = registry.serialisation_plan
+        if plan is None:
+            plan = tuple(
+                cls.__serialisation_info(name, prop)
+                for name, prop in sorted(registry.properties.items())
+            )
+            registry.serialisation_plan = plan
+        return plan
+
+    @classmethod
+    def _serialisation_keys(cls) -> Dict[str, str]:
+        """The model (camel case) key of each class property
+
+        Returns:
+            Dict[str, str]: the model keys by class property name
+        """
+        registry = cls._registry()
+        keys = registry.model_keys
+        if keys is None:
+            keys = {
+                name: cls._translate_to_class_prop(name, reverse=True)
+                for name in registry.names
+            }
+            registry.model_keys = keys
+        return keys
+
+    @classmethod
+    def __serialisation_info(cls, name: str, prop: property) -> Serialisation_info:
+        fget = prop.fget
+        try:
+            prop_type = cls._get_prop_type(name)
+        except Exception:
+            prop_type = None
+        return Serialisation_info(
+            name=name,
+            key=cls._serialisation_keys()[name],
+            prop_type=prop_type,
+            do_not_serialise=getattr(fget, "do_not_serialise", False),
+            do_not_clone=getattr(fget, "do_not_clone", False),
+        )
+
     @classmethod
     def __get_prop_type(cls, prop) -> Prop_info:
         """ TO DELETE """
@@ -400,7 +554,7 @@ class EntityBase(CommonBase):
             [type]: [description]
         """
 
-        return self.__dict__.values()
+        return self._instance_attributes().values()
 
     def keys(self):
         """Do not use
@@ -409,7 +563,25 @@ class EntityBase(CommonBase):
             [type]: [description]
         """
 
-        return self.__dict__.keys()
+        return self._instance_attributes().keys()
+
+    def _instance_attributes(self) -> dict:
+        """The attributes of the instance: the instance dictionary or, for classes
+        that define __slots__ for all their attributes, the slots that are set
+
+        Returns:
+            dict: attribute values by name
+        """
+        try:
+            return object.__getattribute__(self, "__dict__")
+        except AttributeError:
+            attributes = {}
+            for slot in self._registry().slots:
+                try:
+                    attributes[slot] = object.__getattribute__(self, slot)
+                except AttributeError:
+                    pass
+            return attributes
 
     def get(self, name, default=None):
         """Gets an attribute of the class by name
@@ -436,26 +608,51 @@ class EntityBase(CommonBase):
         Returns:
             str: [description]
         """
-        cls_props = super().__getattribute__("class_properties")()
-        inst_props = set(key for key in self.__dict__.keys())
+        registry = type(self).__dict__.get("_EntityBase__registry")
+        resolution = registry.key_resolutions.get(key) if registry is not None else None
+        if resolution is None:
+            resolution = self._key_resolution(key)
+        class_key, snake_case_key = resolution
+        if class_key is not None:
+            return class_key
+
+        inst_props = self._instance_attributes()
+        if key in inst_props:
+            return key
+        if snake_case_key in self.class_properties() or snake_case_key in inst_props:
+            return snake_case_key
+        return key
+
+    @classmethod
+    def _key_resolution(cls, key: str) -> Tuple[Optional[str], str]:
+        """The part of resolving a key to a class property that only depends on the
+        class, cached per class.
 
-        properties = cls_props.union(inst_props)
-        snake_case_key = self._translate_to_class_prop(key)
-        key_is_property = key in properties
-        snake_case_key_is_property = snake_case_key in properties
+        Args:
+            key (str): a property or attribute name in class or model format
 
-        if snake_case_key_is_property and not key_is_property:
-            return snake_case_key
-        else:
-            return key
+        Returns:
+            Tuple[Optional[str], str]: the class key (None if it depends on the
+            attributes of the instance) and the snake case key
+        """
+        registry = cls._registry()
+        resolutions = registry.key_resolutions
+        resolution = resolutions.get(key)
+        if resolution is None:
+            snake_case_key = cls._translate_to_class_prop(key)
+            if key in registry.names or snake_case_key == key:
+                resolution = (key, key)
+            else:
+                resolution = (None, snake_case_key)
+            resolutions[key] = resolution
+        return resolution
 
     def __getattr__(self, key):
         class_key = self._resolve_class_property(key)
         return super().__getattribute__(class_key)
 
     def __setattr__(self, key, value):
-        class_key = self._resolve_class_property(key)
-        return super().__setattr__(class_key, value)
+        return super().__setattr__(self._resolve_class_property(key), value)
 
     def _delete_attribute(self, name):
         """
@@ -479,10 +676,10 @@ class EntityBase(CommonBase):
         setattr(self, name, val)
 
     def __contains__(self, name: str):
-        return name in self.__dict__
+        return name in self._instance_attributes()
 
     def __len__(self):
-        return len(self.__dict__)
+        return len(self._instance_attributes())
 
     def __eq__(self, other):
         return type(self) == type(other) and all(
@@ -571,66 +768,29 @@ class EntityBase(CommonBase):
             dict: [description]
         """
 
-        cls_props_mask = set("_" + prop for prop in cls_props)
-        instance_attr = set()  # set(key for key in self.__dict__.keys())
+        all_props = cls_props is self.class_properties()
+        skip = attrgetter("do_not_clone" if cloning else "do_not_serialise")
+        plan = [
+            info
+            for info in self._serialisation_plan()
+            if not skip(info) and (all_props or info.name in cls_props)
+        ]
+        options = dict(translate=translate, filter_none=filter_none, cloning=cloning)
         as_dict = {}
-        for att in cls_props.union(instance_attr - cls_props_mask):
-            do_not_serialise = getattr(
-                getattr(type(self), att).fget, "do_not_serialise", False
-            )
-            do_not_clone = getattr(getattr(type(self), att).fget, "do_not_clone", False)
-            if not (do_not_serialise and not cloning) and not (
-                cloning and do_not_clone
-            ):
-                att_value = getattr(self, att, None)
-                att_value_dict = att_value
-                if att_value is not None:
-                    prop_type: PropTypeEnums
+        for info in plan:
+            att = info.name
+            att_value = getattr(self, att, None)
+            if att_value is not None:
+                prop_type = info.prop_type
+                if prop_type is None:
                     prop_type = self._get_prop_type(att)
-
-                    if prop_type == PropTypeEnums.EnumType:
-                        att_value_dict = att_value.value
-                    elif prop_type == PropTypeEnums.CommonBaseType:
-                        att_value_dict = att_value.to_dict(
-                            translate=translate,
-                            filter_none=filter_none,
-                            cloning=cloning,
-                        )
-                        if len(att_value_dict) == 0:  # as above
-                            continue
-                    elif prop_type == PropTypeEnums.IterableEnumType:
-                        att_value_dict = []
-                        for enum in att_value:
-                            att_value_dict.append(enum.value)
-                    elif prop_type == PropTypeEnums.IterableCommonBaseType:
-                        att_value_dict = []
-                        for entity in att_value:
-                            d = entity.to_dict(
-                                translate=translate,
-                                filter_none=filter_none,
-                                cloning=cloning,
-                            )
-                            if len(d) > 0:  # shouldn't really happen...
-                                att_value_dict.append(d)
-                    elif prop_type == PropTypeEnums.DictOfCommonBase:
-                        att_value_dict = []
-                        for entity in att_value.values():
-                            d = entity.to_dict(
-                                translate=translate,
-                                filter_none=filter_none,
-                                cloning=cloning,
-                            )
-                            if len(d) > 0:  # shouldn't really happen...
-                                att_value_dict.append(d)
-                    elif prop_type == PropTypeEnums.Date:
-                        att_value_dict = date_arg_fmt(att_value, format="%Y-%m-%d")
-                    elif prop_type == PropTypeEnums.DateTime:
-                        att_value_dict = date_arg_fmt(
-                            att_value, format="%Y-%m-%dT00:00:00"
-                        )
-                if not (filter_none and att_value_dict is None):
-                    as_dict[att] = att_value_dict
-        # as_dict = { att:  for att in cls_props.union(instance_attr-cls_props_mask)}
+                convert = _VALUE_CONVERTERS.get(prop_type)
+                if convert is not None:
+                    att_value = convert(att_value, options)
+                    if att_value is _OMIT:
+                        continue
+            if not (filter_none and att_value is None):
+                as_dict[att] = att_value
         return as_dict
 
     def to_dict(self, translate=True, filter_none=True, cloning=False) -> dict:
@@ -651,16 +811,10 @@ class EntityBase(CommonBase):
             cloning=cloning,
         )
 
-        snake_case_dict = {
-            key: value
-            for key, value in snake_case_dict.items()
-            if not (filter_none and value is None)
-        }
         if translate:
-            # to do need to
+            keys = self._serialisation_keys()
             camel_case_dict = {
-                inflection.camelize(key, False): value
-                for key, value in snake_case_dict.items()
+                keys[key]: value for key, value in snake_case_dict.items()
             }
             return camel_case_dict
         else:
@@ -709,19 +863,18 @@ class EntityBase(CommonBase):
 
         # the class...?
 
-        self_properties = self.class_properties()
         if isinstance(other, EntityBase):
             other_props = other.class_properties()
         else:
             other_props = other.keys()
 
+        settable_property = self._settable_property
         for p in other_props:
             v = other[p]
             if not (ignore_none and v is None):
-                p_res = self._resolve_class_property(p)
-                if p_res in self_properties:
-                    if getattr(type(self), p_res).fset is not None:
-                        setattr(self, p_res, v)
+                p_res = settable_property(p)
+                if p_res is not None:
+                    setattr(self, p_res, v)
 
     def replace(self, other: Union[dict, Type["EntityBase"]]) -> None:
         """sets all properties as for the default instance then
@@ -753,28 +906,84 @@ class EntityBase(CommonBase):
         return new
 
     @classmethod
-    def from_dict(cls: Type[S], definition: dict) -> S:
+    def _constructor_args(cls) -> Tuple[str, ...]:
+        """The required arguments of the constructor (cached per class)"""
+        registry = cls._registry()
+        args = registry.constructor_args
+        if args is None:
+            args = tuple(
+                k
+                for k, v in signature(cls.__init__).parameters.items()
+                if k not in ("kwargs", "_kwargs") and v.default == Parameter.empty
+            )[1:]
+            registry.constructor_args = args
+        return args
+
+    @classmethod
+    def _settable_property(cls, key: str) -> Optional[str]:
+        """The class property with a setter that a (model or class) key resolves to.
+        The results are cached per class, the cache is seeded with the class and model
+        (camel case) names of the properties.
+
+        Args:
+            key (str): a key of a dictionary representation
+
+        Returns:
+            Optional[str]: the class property or None if the key is not a property
+            that can be set
+        """
+        registry = cls._registry()
+        keys = registry.settable_properties
+        if keys is None:
+            keys = {}
+            for prop, model_key in cls._serialisation_keys().items():
+                for name in (prop, model_key):
+                    keys[name] = cls._resolve_settable_property(name)
+            registry.settable_properties = keys
+        try:
+            return keys[key]
+        except KeyError:
+            prop = keys[key] = cls._resolve_settable_property(key)
+            return prop
+
+    @classmethod
+    def _resolve_settable_property(cls, key: str) -> Optional[str]:
+        registry = cls._registry()
+        if key not in registry.names:
+            key = cls._translate_to_class_prop(key)
+            if key not in registry.names:
+                return None
+        return key if key in registry.setters else None
+
+    @classmethod
+    def from_dict(cls: Type[S], definition: dict, copy: bool = True) -> S:
         """Create an instance of the class from the dictionary
 
         Arguments:
             definition {dict} -- dictionary to build the class instance from
 
+        Keyword Arguments:
+            copy {bool} -- copy the definition so the instance does not share any
+                           (nested) objects with it. Pass False when the definition is
+                           not used afterwards, e.g. a parsed response (default: {True})
+
         Returns:
             [type] -- class instance]
         """
-        # make a copy so the input object is unchanged.
-        def_copy = copy.deepcopy(definition)
-        args = [
-            k
-            for k, v in signature(cls.__init__).parameters.items()
-            if k not in ("kwargs", "_kwargs") and v.default == Parameter.empty
-        ][1:]
-        required = {}
-        for arg in args:
-            required[arg] = def_copy.pop(arg, None)
-            required[arg] = def_copy.pop(arg, required[arg])
+        if copy:
+            # make a copy so the input object is unchanged.
+            definition = deepcopy(definition)
+        args = cls._constructor_args()
+        required = {arg: definition.get(arg) for arg in args}
         instance = cls(**required)
-        instance._update(def_copy)
+
+        settable_property = cls._settable_property
+        for key, value in definition.items():
+            if key in required:
+                continue
+            prop = settable_property(key)
+            if prop is not None:
+                setattr(instance, prop, value)
         return instance
 
     @staticmethod
@@ -837,8 +1046,10 @@ class TemplatedEntityBase(EntityBase):
 
     """
 
+    __slots__ = ()
     _TEMPLATE_NAME: str = ""
     _TEMPLATE_MAPPING: List[Tuple[str, str]] = []
+    __content_class_keys = None
 
     def __init__(self: R,) -> R:
         super().__init__()
@@ -913,16 +1124,24 @@ class TemplatedEntityBase(EntityBase):
         Returns:
             Union[str, None]: relevant class attribute/property
         """
-        content_map = cls.get_content_map()
-        class_content_map = {i[1]: i for i in content_map}
-        model_content_map = {i[0]: i for i in content_map}
+        return cls._content_class_keys().get(key, key)
 
-        if key in class_content_map and key not in model_content_map:
-            return key
-        elif key in model_content_map:
-            return model_content_map[key][1]
-        else:
-            return key
+    @classmethod
+    def _content_class_keys(cls) -> Dict[str, str]:
+        """The class property of each model and class key of the content map, rebuilt
+        only when the content map of the class changes.
+
+        Returns:
+            Dict[str, str]: class property by model or class key
+        """
+        content_map = cls.get_content_map()
+        cached = cls.__dict__.get("_TemplatedEntityBase__content_class_keys")
+        if cached is None or cached[0] is not content_map:
+            keys = {i[1]: i[1] for i in content_map}
+            keys.update({i[0]: i[1] for i in content_map})
+            cached = (content_map, keys)
+            cls.__content_class_keys = cached
+        return cached[1]
 
     def _resolve_class_property(self, key: str) -> str:
         """given a property or attribute that may be in model format, resolve it
@@ -938,6 +1157,10 @@ class TemplatedEntityBase(EntityBase):
         content_key = self._get_content_class_key(key)
         return super()._resolve_class_property(content_key)
 
+    @classmethod
+    def _resolve_settable_property(cls, key: str) -> Optional[str]:
+        return super()._resolve_settable_property(cls._get_content_class_key(key))
+
     def to_dict(self, translate=True, filter_none=True, cloning=False) -> dict:
         """Creates an instance of this class as a dictionary
 
@@ -967,9 +1190,9 @@ class TemplatedEntityBase(EntityBase):
             class_dict["content"] = content_dict
 
         if translate:
-            # to do need to
+            keys = self._serialisation_keys()
             translated_dict = {
-                self._translate_to_class_prop(key, reverse=True): value
+                keys.get(key) or self._translate_to_class_prop(key, reverse=True): value
                 for key, value in class_dict.items()
             }
             return translated_dict
@@ -1086,6 +1309,14 @@ class EntitySequence(MutableSequence[T], EntityCollectionBase):
 
 
 class EntitySet(MutableSet[T], EntityCollectionBase):
+    """The base type for which a set of entities should subclass. The elements are
+    indexed by the key returned by _element_key_ so membership, add, replace and
+    discard do not scan the set. The elements are kept in the order they were added.
+
+    Arguments:
+        MutableSet {[type]} -- [description]
+    """
+
     def __init__(
         self,
         element_iterable: Iterable[EntityBase] = None,
@@ -1095,23 +1326,37 @@ class EntitySet(MutableSet[T], EntityCollectionBase):
             element_iterable = []
         if(removed_elements is None):
             removed_elements = []
-        self._elements = list(element_iterable)
+        self._elements = dict()
+        for element in element_iterable:
+            self._elements.setdefault(self._element_key_(element), element)
 
     @abstractmethod
-    def _element_eq_(self, value1, value2) -> bool:
+    def _element_key_(self, value) -> Hashable:
+        """The key that identifies the element in the set, two elements with the same
+        key are equal
+
+        Arguments:
+            value {[type]} -- entity instance
+
+        Raises:
+            NotImplementedError: -- abstract
+        """
         raise NotImplementedError
 
+    def _element_eq_(self, value1, value2) -> bool:
+        return self._element_key_(value1) == self._element_key_(value2)
+
     def __iter__(self):
-        return iter(self._elements)
+        return iter(self._elements.values())
 
     def __contains__(self, value: EntityBase):
-        return any(self._element_eq_(element, value) for element in self._elements)
+        return self._element_key_(value) in self._elements
 
     def __len__(self):
         return len(self._elements)
 
     def get_items(self):
-        return self._elements
+        return list(self._elements.values())
 
     def add(self, value: EntityBase):
         """Add an entity to the set if it is not present
@@ -1119,17 +1364,16 @@ class EntitySet(MutableSet[T], EntityCollectionBase):
         Arguments:
             value {EntityBase} -- The entity to add to the set
         """
-        if value not in self:
-            self._elements.append(value)
+        self._elements.setdefault(self._element_key_(value), value)
 
     def union(self, other):
-        return type(self)(other + self)
+        return self | other
 
     def intersection(self, other):
-        return type(self)(other & self)
+        return self & other
 
     def difference(self, other):
-        return type(self)(other - self)
+        return self - other
 
     def discard(self, value: EntityBase):
         """Remove the item from the set
@@ -1137,13 +1381,7 @@ class EntitySet(MutableSet[T], EntityCollectionBase):
         Arguments:
             value {EntityBase} -- [description]
         """
-        indices = [
-            i
-            for i in range(len(self._elements))
-            if self._element_eq_(self._elements[i], value)
-        ]
-        for i in indices:
-            self._elements.pop(i)
+        self._elements.pop(self._element_key_(value), None)
 
     def replace(self, value, add_if_missing=False):
         """Replace (remove existing and add new) the element in the set, optionally
@@ -1155,17 +1393,23 @@ class EntitySet(MutableSet[T], EntityCollectionBase):
         Keyword Arguments:
             add_if_missing {bool} -- add() if not in set (default: {False})
         """
-        if value in self or add_if_missing:
-            self.discard(value)
-            self.add(value)
+        key = self._element_key_(value)
+        if self._elements.pop(key, None) is not None or add_if_missing:
+            self._elements[key] = value
 
     def update_entity(self, value):
-        updates = [
-            i.overwrite()
-            for i in self._elements
-            if self._element_eq_(self._elements[i], value)
-        ]
-        return updates[0] if len(updates) > 0 else None
+        """Overwrites the properties of the matching element with those of value
+
+        Arguments:
+            value {[type]} -- the entity to update from
+
+        Returns:
+            [type] -- the updated element or None if value is not in the set
+        """
+        element = self._elements.get(self._element_key_(value))
+        if element is not None:
+            element.overwrite(value)
+        return element
 
     def update(self, entity_set):
         """Updates (overwrites) the underlying entity with this entity's properties
@@ -0,0 +1,138 @@
+"""
+Copyright © 2024 Axioma by SimCorp.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+"""
+import json
+import logging
+from typing import Any, Union
+
+from axiomapy.axiomaexceptions import AxiomaValueError
+
+_logger = logging.getLogger(__name__)
+_logger.addHandler(logging.NullHandler())
+
+# the codecs tried (in order) when the codec is "auto", the default is "json"
+_AUTO_ORDER = ("orjson", "ujson", "json")
+
+
+class JsonCodec:
+    """Encodes the request bodies and decodes the response bodies of a session using
+    the standard library json module. Subclasses use faster json libraries.
+
+    Example:
+        AxiomaSession.use_session(..., json_codec="orjson")
+    """
+
+    name = "json"
+    content_type = "application/json"
+
+    def dumps(self, obj: Any) -> bytes:
+        """Encodes obj as UTF-8 JSON
+
+        Args:
+            obj (Any): the request body
+
+        Returns:
+            bytes: the encoded body
+        """
+        return json.dumps(
+            obj, ensure_ascii=False, separators=(",", ":"), allow_nan=False
+        ).encode("utf-8")
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """Decodes a JSON document
+
+        Args:
+            data (Union[bytes, str]): the response body
+
+        Returns:
+            Any: the decoded document
+        """
+        return json.loads(data)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}()"
+
+
+class OrjsonCodec(JsonCodec):
+    """JsonCodec using orjson (pip install orjson). Non string keys are converted to
+    strings like the json module and numpy arrays are encoded as lists."""
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+        self._options = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj, option=self._options)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._orjson.loads(data)
+
+
+class UjsonCodec(JsonCodec):
+    """JsonCodec using ujson (pip install ujson)"""
+
+    name = "ujson"
+
+    def __init__(self):
+        import ujson
+
+        self._ujson = ujson
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._ujson.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._ujson.loads(data)
+
+
+_CODECS = {"orjson": OrjsonCodec, "ujson": UjsonCodec, "json": JsonCodec}
+
+
+def get_json_codec(codec: Union[str, JsonCodec, None] = "json") -> JsonCodec:
+    """The json codec for the name (or the codec passed).
+
+    The standard library json module ("json" or None) is the default, the faster
+    libraries are opt-in: "orjson", "ujson" or "auto" to select orjson if it is
+    installed, then ujson, and otherwise the standard library.
+
+    Args:
+        codec (Union[str, JsonCodec]): "auto", "orjson", "ujson", "json" or a codec
+
+    Returns:
+        JsonCodec: the codec
+
+    Raises:
+        AxiomaValueError: the codec name is unknown
+        ImportError: the library of the codec is not installed
+    """
+    if isinstance(codec, JsonCodec):
+        return codec
+    if codec is None:
+        return JsonCodec()
+    if codec == "auto":
+        for name in _AUTO_ORDER:
+            try:
+                return _CODECS[name]()
+            except ImportError:
+                continue
+    if codec not in _CODECS:
+        raise AxiomaValueError(
+            f"Unknown json codec {codec!r}, expected one of auto, {', '.join(_CODECS)}"
+        )
+    return _CODECS[codec]()
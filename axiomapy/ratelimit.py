@@ -0,0 +1,199 @@
+"""
+Copyright © 2024 Axioma by SimCorp.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+"""
+import asyncio
+import logging
+import math
+import re
+import threading
+import time
+from typing import Mapping, Optional
+
+import httpx
+
+from axiomapy.axiomaexceptions import AxiomaValueError
+
+_logger = logging.getLogger(__name__)
+_logger.addHandler(logging.NullHandler())
+
+# families of the requests sent to the BULK and CEB apis
+_API_FAMILIES = {"BULK": "bulk", "CEB": "ceb"}
+# the [api_type]/api/[api_version]/ prefix of the path of a full url
+_API_PREFIX = re.compile(r"^/*(?:[^/]+/)?api/[^/]+/")
+# longest sleep of an async task waiting for a concurrency slot
+_MAX_SLOT_POLL = 0.05
+
+
+class RateLimit:
+    """A token bucket (requests per second with a burst) and a limit on the number of
+    requests in flight. The limit is thread safe and can be shared by threads and
+    asyncio tasks, use it as a context manager (with or async with) around a request.
+
+    The tokens are reserved under a lock and the caller sleeps outside of it, so the
+    requests start in the order they were reserved at no more than rate per second.
+
+    Args:
+        rate (float): Requests per second, None for no limit
+        burst (int): Number of requests that can be sent at once, defaults to the rate
+            rounded up
+        max_concurrency (int): Maximum number of requests in flight, None for no limit
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+    ):
+        if rate is not None and rate <= 0:
+            raise AxiomaValueError(f"The rate must be positive, got {rate}")
+        if max_concurrency is not None and max_concurrency < 1:
+            raise AxiomaValueError(
+                f"max_concurrency must be at least 1, got {max_concurrency}"
+            )
+        self.rate = rate
+        self.burst = burst if burst is not None else (math.ceil(rate) if rate else None)
+        self.max_concurrency = max_concurrency
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst or 0)
+        self._updated = time.monotonic()
+        self._slots = (
+            threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        )
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(rate={self.rate}, burst={self.burst}, "
+            f"max_concurrency={self.max_concurrency})"
+        )
+
+    def _reserve(self) -> float:
+        """Takes a token from the bucket
+
+        Returns:
+            float: seconds to wait until the token is available
+        """
+        if self.rate is None:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        """Blocks until the request can be sent"""
+        delay = self._reserve()
+        if delay > 0:
+            _logger.debug(f"Rate limited, waiting {delay:.3f}s")
+            time.sleep(delay)
+        if self._slots is not None:
+            self._slots.acquire()
+
+    async def aacquire(self) -> None:
+        """Waits (without blocking the event loop) until the request can be sent"""
+        delay = self._reserve()
+        if delay > 0:
+            _logger.debug(f"Rate limited, waiting {delay:.3f}s")
+            await asyncio.sleep(delay)
+        if self._slots is not None:
+            poll = 0.001
+            while not self._slots.acquire(blocking=False):
+                await asyncio.sleep(poll)
+                poll = min(poll * 2, _MAX_SLOT_POLL)
+
+    def release(self) -> None:
+        """Releases the concurrency slot taken by acquire"""
+        if self._slots is not None:
+            self._slots.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+    async def __aenter__(self):
+        await self.aacquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
+
+
+class RateLimiter:
+    """Selects the RateLimit for a request by endpoint family.
+
+    The family of a request to the BULK api is "bulk", to the CEB api "ceb" and
+    otherwise the first segment of the url (e.g. "portfolios", "analyses"). Families
+    without a limit use the default limit.
+
+    Example:
+        RateLimiter(
+            {
+                "analyses": RateLimit(rate=2, max_concurrency=4),
+                "bulk": RateLimit(rate=1),
+            },
+            default=RateLimit(rate=20),
+        )
+
+    Args:
+        limits (Mapping[str, RateLimit]): The limits by family
+        default (RateLimit): The limit of the other requests, None for no limit
+    """
+
+    def __init__(
+        self,
+        limits: Mapping[str, RateLimit] = None,
+        default: Optional[RateLimit] = None,
+    ):
+        self.limits = dict(limits or {})
+        self.default = default if default is not None else RateLimit()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.limits!r}, default={self.default!r})"
+
+    @staticmethod
+    def family(url: str, api_type: str = None) -> str:
+        """The endpoint family of the request
+
+        Args:
+            url (str): the url of the endpoint relative to the api (e.g. /portfolios/1)
+                or the full url (e.g. the next link of a page)
+            api_type (str): the api the request is sent to (REST, BULK or CEB)
+        """
+        if api_type is not None:
+            family = _API_FAMILIES.get(getattr(api_type, "value", api_type))
+            if family is not None:
+                return family
+        path = _API_PREFIX.sub("", httpx.URL(url).path)
+        segment = path.lstrip("/").split("/", 1)[0]
+        return segment.lower() or "default"
+
+    def limit_for(self, url: str, api_type: str = None) -> RateLimit:
+        """The RateLimit of the request
+
+        Args:
+            url (str): the url of the endpoint relative to the api (e.g. /portfolios/1)
+                or the full url
+            api_type (str): the api the request is sent to (REST, BULK or CEB)
+        """
+        return self.limits.get(self.family(url, api_type), self.default)
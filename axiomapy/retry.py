@@ -0,0 +1,189 @@
+"""
+Copyright © 2024 Axioma by SimCorp.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+"""
+import logging
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Iterable, Optional
+
+import httpx
+
+_logger = logging.getLogger(__name__)
+_logger.addHandler(logging.NullHandler())
+
+# errors raised before the request reached the server, safe to retry for any method
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+# errors after the request may have been processed, only retried if idempotent
+_TRANSIENT_ERRORS = (
+    httpx.ReadTimeout,
+    httpx.ReadError,
+    httpx.WriteError,
+    httpx.RemoteProtocolError,
+)
+
+
+class RetryPolicy:
+    """Decides which requests are retried and how long to wait between the attempts.
+
+    The wait before retry n (starting at 0) is a random value between 0 and
+    min(backoff_max, backoff_factor * 2 ** n) ("full jitter") so that clients
+    throttled at the same time do not retry at the same time. A Retry-After header
+    on a retried response takes precedence (capped at retry_after_max).
+
+    Responses with a status in retry_statuses are only retried for the
+    idempotent_methods, with the exception of 429 (Too Many Requests) which means
+    the request was not processed. Connection errors are retried for any method, read
+    errors and read timeouts only for the idempotent methods.
+
+    Args:
+        max_retries (int): Number of times to retry a request, 0 disables retries
+        backoff_factor (float): Seconds of the first backoff, doubled on every retry
+        backoff_max (float): Maximum seconds to wait between two attempts
+        retry_statuses (Iterable[int]): The response statuses that are retried
+        idempotent_methods (Iterable[str]): The methods that are safe to send twice
+        respect_retry_after (bool): Wait as long as requested by a Retry-After header
+        retry_after_max (float): Maximum seconds to wait for a Retry-After header
+        connect_timeout (float): Seconds to wait for a connection, defaults to the
+            request timeout of the session
+        read_timeout (float): Seconds to wait for data, defaults to the request timeout
+            of the session
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 0,
+        backoff_factor: float = 0.5,
+        backoff_max: float = 30.0,
+        retry_statuses: Iterable[int] = (429, 500, 502, 503, 504),
+        idempotent_methods: Iterable[str] = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE"),
+        respect_retry_after: bool = True,
+        retry_after_max: float = 120.0,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+    ):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.retry_statuses = frozenset(retry_statuses)
+        self.idempotent_methods = frozenset(m.upper() for m in idempotent_methods)
+        self.respect_retry_after = respect_retry_after
+        self.retry_after_max = retry_after_max
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(max_retries={self.max_retries}, "
+            f"backoff_factor={self.backoff_factor}, backoff_max={self.backoff_max})"
+        )
+
+    def timeout(self, default: float) -> httpx.Timeout:
+        """The client timeout using the connect and read timeouts of the policy
+
+        Args:
+            default (float): the request timeout of the session
+
+        Returns:
+            httpx.Timeout: timeout for the httpx client
+        """
+        return httpx.Timeout(
+            default,
+            connect=default if self.connect_timeout is None else self.connect_timeout,
+            read=default if self.read_timeout is None else self.read_timeout,
+        )
+
+    def is_idempotent(self, method: str) -> bool:
+        return method.upper() in self.idempotent_methods
+
+    def should_retry_response(
+        self, method: str, response: httpx.Response, attempt: int
+    ) -> bool:
+        """Returns True if the response should be retried
+
+        Args:
+            method (str): the http method of the request
+            response (httpx.Response): the response received
+            attempt (int): the number of retries made so far
+        """
+        if attempt >= self.max_retries:
+            return False
+        if response.status_code not in self.retry_statuses:
+            return False
+        return response.status_code == 429 or self.is_idempotent(method)
+
+    def should_retry_error(
+        self, method: str, error: httpx.RequestError, attempt: int
+    ) -> bool:
+        """Returns True if the request should be retried after the error
+
+        Args:
+            method (str): the http method of the request
+            error (httpx.RequestError): the error raised when sending the request
+            attempt (int): the number of retries made so far
+        """
+        if attempt >= self.max_retries:
+            return False
+        if isinstance(error, _NOT_SENT_ERRORS):
+            return True
+        return isinstance(error, _TRANSIENT_ERRORS) and self.is_idempotent(method)
+
+    def backoff(self, attempt: int) -> float:
+        """Seconds to wait before the retry, with full jitter
+
+        Args:
+            attempt (int): the number of retries made so far
+        """
+        ceiling = min(self.backoff_max, self.backoff_factor * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    def retry_after(self, response: httpx.Response) -> Optional[float]:
+        """Seconds requested by the Retry-After header (in seconds or a http date)
+
+        Args:
+            response (httpx.Response): the response to be retried
+
+        Returns:
+            Optional[float]: the seconds to wait or None if not set or not valid
+        """
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            seconds = float(value)
+        except ValueError:
+            try:
+                when = parsedate_to_datetime(value)
+            except (TypeError, ValueError):
+                return None
+            if when.tzinfo is None:
+                when = when.replace(tzinfo=timezone.utc)
+            seconds = (when - datetime.now(timezone.utc)).total_seconds()
+        return max(0.0, seconds)
+
+    def delay(self, attempt: int, response: httpx.Response = None) -> float:
+        """Seconds to wait before the retry
+
+        Args:
+            attempt (int): the number of retries made so far
+            response (httpx.Response): the response to be retried, None if the
+                request raised an error
+        """
+        if response is not None and self.respect_retry_after:
+            retry_after = self.retry_after(response)
+            if retry_after is not None:
+                return min(retry_after, self.retry_after_max)
+        return self.backoff(attempt)
@@ -19,14 +19,26 @@ Copyright 2019 Goldman Sachs under Apache License 2.0
 """
 
 
+import asyncio
+import functools
 import inspect
 import logging
-import os.path
+import time
 from collections.abc import Mapping
 from configparser import ConfigParser
 from enum import unique
 from pathlib import Path
-from typing import Optional
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Union,
+)
 import posixpath
 import httpx
 
@@ -36,14 +48,38 @@ from axiomapy.axiomaexceptions import (
     AxiomaRequestError,
     AxiomaRequestStatusError,
     AxiomaRequestValidationError,
+    AxiomaTypeError,
 )
 
+from axiomapy.compression import CompressionPolicy, accept_encoding_header
 from axiomapy.context import BaseContext
-from axiomapy.entitybase import EnumBase
+from axiomapy.downloads import (
+    PathLike,
+    adownload_to,
+    aextract_zip,
+    csv_to_parquet,
+    download_to,
+    extract_zip,
+    items_to_parquet,
+)
+from axiomapy.jsoncodec import JsonCodec, get_json_codec
+from axiomapy.ratelimit import RateLimit, RateLimiter
+from axiomapy.retry import RetryPolicy
+from axiomapy.streaming import (
+    aiter_lines,
+    aiter_response_items,
+    iter_csv_records,
+    iter_csv_rows,
+    iter_lines,
+    iter_response_items,
+)
+from axiomapy.entitybase import EntityBase, EnumBase
 
 _logger = logging.getLogger(__name__)
 _logger.addHandler(logging.NullHandler())
-from typing import Union
+
+# used when the session has no rate limiter
+_UNLIMITED = RateLimit()
 
 API_VERSION = "v1"
 DEFAULT_APP = "REST_API"
@@ -79,11 +115,16 @@ class AxiomaResponse(Mapping):
     """
 
     def __init__(
-        self, response: httpx.Response, streaming: bool = False
+        self,
+        response: httpx.Response,
+        streaming: bool = False,
+        json_codec: JsonCodec = None,
     ) -> "AxiomaResponse":
         self._response = response
         self._is_streaming = streaming
+        self._json_codec = json_codec
         self._res_json = None
+        self._bytes_decoded = 0
         self._props = [
             p
             for p in dir(AxiomaResponse)
@@ -103,7 +144,10 @@ class AxiomaResponse(Mapping):
             and not self._is_streaming
             and self._res_json is None
         ):
-            self._res_json = self._response.json()
+            if self._json_codec is not None:
+                self._res_json = self._json_codec.loads(self._response.content)
+            else:
+                self._res_json = self._response.json()
         return self._res_json
 
     @property
@@ -126,6 +170,26 @@ class AxiomaResponse(Mapping):
     def is_streaming(self) -> bool:
         return self._is_streaming
 
+    @property
+    def content_encoding(self) -> Optional[str]:
+        """The Content-Encoding of the response body (e.g. gzip), None if the body is
+        not compressed"""
+        return self._response.headers.get("Content-Encoding")
+
+    @property
+    def bytes_on_wire(self) -> int:
+        """The number of (compressed) bytes of the body received so far"""
+        return self._response.num_bytes_downloaded
+
+    @property
+    def bytes_decoded(self) -> int:
+        """The number of decompressed bytes of the body, for a streamed response the
+        bytes iterated so far"""
+        try:
+            return len(self._response.content)
+        except httpx.ResponseNotRead:
+            return self._bytes_decoded
+
     def __getitem__(self, key):
         if key in self._props:
             return getattr(self, key)
@@ -151,11 +215,200 @@ class AxiomaResponse(Mapping):
     def close(self):
         self.response.close()
 
-    def iter_bytes(self):
-        return self.response.iter_bytes()
+    def iter_bytes(self, chunk_size: int = None) -> Iterator[bytes]:
+        """Iterates over the decompressed body of a streamed response, one chunk is
+        decompressed at a time"""
+        for chunk in self.response.iter_bytes(chunk_size):
+            self._bytes_decoded += len(chunk)
+            yield chunk
+
+    def iter_lines(self, keepends: bool = False) -> Iterator[str]:
+        """Iterates over the lines of a streamed text response, decoding one chunk
+        at a time. The response is closed when the lines are consumed.
+
+        Args:
+            keepends (bool): keep the line endings
+
+        Returns:
+            Iterator[str]: the lines
+        """
+        try:
+            yield from iter_lines(self.iter_bytes(), self._encoding(), keepends)
+        finally:
+            self.close()
+
+    async def aiter_lines(self, keepends: bool = False) -> AsyncIterator[str]:
+        """Async version of iter_lines for streamed responses of the async session"""
+        try:
+            lines = aiter_lines(self.aiter_bytes(), self._encoding(), keepends)
+            async for line in lines:
+                yield line
+        finally:
+            await self.aclose()
+
+    def iter_csv_rows(self, **fmtparams) -> Iterator[List[str]]:
+        """Iterates over the rows (including the header row) of a streamed CSV
+        response, e.g. AnalysesAPI.get_analyses(as_csv=True, stream=True). The
+        response is closed when the rows are consumed.
+
+        Args:
+            fmtparams: the dialect and formatting parameters of csv.reader
+
+        Returns:
+            Iterator[List[str]]: the rows
+        """
+        try:
+            yield from iter_csv_rows(self.iter_bytes(), self._encoding(), **fmtparams)
+        finally:
+            self.close()
+
+    def iter_records(
+        self,
+        types: Dict[str, Callable[[str], Any]] = None,
+        infer_types: bool = False,
+        infer_rows: int = 100,
+        **fmtparams,
+    ) -> Iterator[Dict[str, Any]]:
+        """Iterates over the records of a streamed CSV response as dictionaries
+        keyed by the header row. The response is closed when the records are
+        consumed.
+
+        Example:
+            response = AnalysesAPI.get_analyses(request_id, as_csv=True, stream=True)
+            for record in response.iter_records(types={"Weight": float}):
+                ...
+
+        Args:
+            types (Dict[str, Callable[[str], Any]]): the type of columns by name
+            infer_types (bool): infer the type (int, float or str) of each of the
+                other columns from its first infer_rows values, otherwise they are
+                strings
+            infer_rows (int): the number of rows the types are inferred from
+            fmtparams: the dialect and formatting parameters of csv.reader
+
+        Returns:
+            Iterator[Dict[str, Any]]: the records
+        """
+        try:
+            yield from iter_csv_records(
+                self.iter_bytes(),
+                types,
+                self._encoding(),
+                infer_types=infer_types,
+                infer_rows=infer_rows,
+                **fmtparams,
+            )
+        finally:
+            self.close()
+
+    def _encoding(self) -> str:
+        return self._response.encoding or "utf-8"
+
+    async def aiter_bytes(self, chunk_size: int = None) -> AsyncIterator[bytes]:
+        """Async version of iter_bytes"""
+        async for chunk in self.response.aiter_bytes(chunk_size):
+            self._bytes_decoded += len(chunk)
+            yield chunk
+
+    def iter_items(self, items_key: str = "items", cls: type = None) -> Iterator[Any]:
+        """Iterates over the items array of a streamed JSON response, parsing one
+        item at a time. The response is closed when the items are consumed.
+
+        Args:
+            items_key (str): the key of the items array in the response
+            cls (type): a type with a from_dict method (e.g. an EntityBase) to create
+                the items, None for the parsed JSON
+
+        Returns:
+            Iterator[Any]: the items
+        """
+        return iter_response_items(
+            self.response, items_key, cls, chunks=self.iter_bytes()
+        )
+
+    def aiter_items(
+        self, items_key: str = "items", cls: type = None
+    ) -> AsyncIterator[Any]:
+        """Async version of iter_items for streamed responses of the async session"""
+        return aiter_response_items(
+            self.response, items_key, cls, chunks=self.aiter_bytes()
+        )
+
+    async def aclose(self):
+        await self.response.aclose()
+
+    def download_to(self, path: PathLike) -> int:
+        """Writes the body to a file one chunk at a time (pass stream=True to the
+        request so the body is not read into memory first) and closes the response
+
+        Args:
+            path (PathLike): the file
+
+        Returns:
+            int: the number of bytes written
+        """
+        try:
+            return download_to(self.iter_bytes(), path)
+        finally:
+            self.close()
+
+    async def adownload_to(self, path: PathLike) -> int:
+        """Async version of download_to for responses of the async session"""
+        try:
+            return await adownload_to(self.aiter_bytes(), path)
+        finally:
+            await self.aclose()
+
+    def extract_to(self, directory: PathLike) -> List[Path]:
+        """Extracts a zip archive body (e.g. multipart/x-zip risk model results)
+        member by member as it is received and closes the response
+
+        Args:
+            directory (PathLike): the directory the members are extracted to
+
+        Returns:
+            List[Path]: the paths of the extracted files
+        """
+        try:
+            return extract_zip(self.iter_bytes(), directory)
+        finally:
+            self.close()
+
+    async def aextract_to(self, directory: PathLike) -> List[Path]:
+        """Async version of extract_to for responses of the async session"""
+        try:
+            return await aextract_zip(self.aiter_bytes(), directory)
+        finally:
+            await self.aclose()
+
+    def to_parquet(
+        self,
+        path: PathLike,
+        items_key: str = "items",
+        batch_size: int = 10000,
+        schema: Any = None,
+    ) -> int:
+        """Converts a streamed JSON (the items array) or CSV response to a parquet
+        file in batches and closes the response. Requires pyarrow.
+
+        Args:
+            path (PathLike): the parquet file
+            items_key (str): the key of the items array of a JSON response
+            batch_size (int): the number of items of a row group of a JSON response
+            schema (pyarrow.Schema): the schema of a JSON response, by default
+                inferred from the first batch
 
-    def iter_lines(self):
-        return self.response.iter_bytes()
+        Returns:
+            int: the number of rows written
+        """
+        if "CSV" in self.headers.get("content-type", "").upper():
+            try:
+                return csv_to_parquet(self.iter_bytes(), path)
+            finally:
+                self.close()
+        return items_to_parquet(
+            self.iter_items(items_key), path, batch_size=batch_size, schema=schema
+        )
 
 
 class HttpxLoggingHooks:
@@ -218,14 +471,18 @@ class HttpxLoggingHooks:
         )
 
         body = ""
+        decoded = 0
         try:
             body = response.text
+            decoded = len(response.content)
         except Exception:
             pass
 
         msg = "\r\n".join(
             (
                 f"Response in {response.elapsed.total_seconds}s",
+                f"Bytes: {response.num_bytes_downloaded} received, "
+                f"{decoded} decoded",
                 f"Method: {req.method} to {req.url}",
                 f"Status: {response.status_code}" "Headers:",
                 "\r\n".join("{}: {}".format(k, v) for k, v in response.headers.items()),
@@ -236,6 +493,14 @@ class HttpxLoggingHooks:
 
         _logger.debug(msg)
 
+    async def alog_request(self, req: httpx.Request):
+        """Async version of log_request for the httpx.AsyncClient hooks"""
+        self.log_request(req)
+
+    async def alog_response(self, response: httpx.Response):
+        """Async version of log_response for the httpx.AsyncClient hooks"""
+        self.log_response(response)
+
 
 def get_event_hooks(event_hooks: dict, async_fns: bool = False):
     hooks = {
@@ -267,7 +532,15 @@ class AxiomaSession(BaseContext):
         api_version: str = API_VERSION,
         event_hooks: dict = None,
         max_retries: int = 0,
-        request_timeout: int = 300
+        request_timeout: int = 300,
+        limits: httpx.Limits = None,
+        http2: bool = False,
+        transport: httpx.BaseTransport = None,
+        retry_policy: RetryPolicy = None,
+        rate_limiter: RateLimiter = None,
+        json_codec: Union[str, JsonCodec] = "json",
+        compression: CompressionPolicy = None,
+        accept_encoding: Union[str, Iterable[str]] = None,
     ):
         self.name = application_name
         self.event_hooks = event_hooks
@@ -280,7 +553,14 @@ class AxiomaSession(BaseContext):
         self.certificates = certificates
         self.max_retries = max_retries
         self.timeout = request_timeout
-
+        self.limits = limits
+        self.http2 = http2
+        self.transport = transport
+        self.retry_policy = retry_policy or RetryPolicy(max_retries=max_retries)
+        self.rate_limiter = rate_limiter
+        self.json_codec = get_json_codec(json_codec)
+        self.compression = compression
+        self.accept_encoding = accept_encoding_header(accept_encoding)
 
     @classmethod
     def get_session(
@@ -296,7 +576,15 @@ class AxiomaSession(BaseContext):
         api_version: str = API_VERSION,
         event_hooks: dict = None,
         max_retries: int = 0,
-        request_timeout: int = 300
+        request_timeout: int = 300,
+        limits: httpx.Limits = None,
+        http2: bool = False,
+        transport: httpx.BaseTransport = None,
+        retry_policy: RetryPolicy = None,
+        rate_limiter: RateLimiter = None,
+        json_codec: Union[str, JsonCodec] = "json",
+        compression: CompressionPolicy = None,
+        accept_encoding: Union[str, Iterable[str]] = None,
     ) -> "AxiomaSession":
         """Gets an uninitialised session - you must call init() before this session
         can be used
@@ -311,6 +599,30 @@ class AxiomaSession(BaseContext):
             proxy (dict|str): The proxy for the request (if required)
             max_retries (int) : Number of times to retry if request fails
             request_timeout (int) : Number of seconds till request is timed out
+            limits (httpx.Limits) : Connection pool limits (max connections, max
+                            keep-alive connections and keep-alive expiry) of the client
+            http2 (bool) : Enable HTTP/2 (requires the h2 package, pip install
+                            httpx[http2])
+            transport (httpx.BaseTransport) : Optional transport for the client, the
+                            authentication requests use the same client and transport
+            retry_policy (RetryPolicy) : Which requests are retried and the backoff
+                            between the attempts, defaults to
+                            RetryPolicy(max_retries=max_retries)
+            rate_limiter (RateLimiter) : Optional client side limits (requests per
+                            second and requests in flight) by endpoint family, can be
+                            shared by sessions, threads and asyncio tasks
+            json_codec (Union[str, JsonCodec]) : The json library used to encode the
+                            request bodies and decode the responses, defaults to the
+                            standard library. "orjson" (or "auto" for the fastest
+                            library installed) opts in to a faster library, see
+                            get_json_codec
+            compression (CompressionPolicy) : Optional compression (gzip or zstd) of
+                            the request bodies larger than a threshold
+            accept_encoding (Union[str, Iterable[str]]) : The content encodings of
+                            the responses accepted (Accept-Encoding header), e.g.
+                            ["zstd", "gzip"] or "auto" for all the encodings that can
+                            be decoded, defaults to gzip and deflate. The responses
+                            are decompressed while they are streamed
 
         Keyword Arguments:
             application_name (str): Optional label for this session
@@ -326,11 +638,11 @@ class AxiomaSession(BaseContext):
         if not isinstance(event_hooks, dict):
             hook_methods = HttpxLoggingHooks(application_name=application_name)
             event_hooks = {
-                "request": [hook_methods.log_request],
-                "response": [hook_methods.log_response],
+                "request": [hook_methods.log_request, hook_methods.alog_request],
+                "response": [hook_methods.log_response, hook_methods.alog_response],
             }
 
-        return SimpleAuthSession(
+        return cls._get_session_type()(
             client_id,
             username,
             password,
@@ -342,16 +654,43 @@ class AxiomaSession(BaseContext):
             api_version,
             event_hooks,
             max_retries,
-            request_timeout
+            request_timeout,
+            limits=limits,
+            http2=http2,
+            transport=transport,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            json_codec=json_codec,
+            compression=compression,
+            accept_encoding=accept_encoding,
         )
 
+    @classmethod
+    def _get_session_type(cls) -> type:
+        """The session class created by get_session"""
+        return SimpleAuthSession
+
+    def _client_kwargs(self) -> dict:
+        """The keyword arguments used to create the underlying httpx client"""
+        kwargs = {
+            "proxy": self.proxy,
+            "timeout": self.retry_policy.timeout(self.timeout),
+            "http2": self.http2,
+        }
+        if self.certificates is not None and self.certificates != "":
+            kwargs["verify"] = self.certificates
+        if self.limits is not None:
+            kwargs["limits"] = self.limits
+        if self.transport is not None:
+            kwargs["transport"] = self.transport
+        if self.accept_encoding is not None:
+            kwargs["headers"] = {"Accept-Encoding": self.accept_encoding}
+        return kwargs
+
     def init(self) -> None:
         """Initializes the http client and authenticates the session"""
         if not self._session:
-            if(self.certificates is not None and self.certificates != ''):
-                self._session = httpx.Client(proxy=self.proxy, verify=self.certificates)
-            else:
-                self._session = self.session_type()
+            self._session = self.session_type(**self._client_kwargs())
             self._is_authenticated = self._authenticate()
             if self._is_authenticated:
                 if self.event_hooks is not None:
@@ -371,7 +710,15 @@ class AxiomaSession(BaseContext):
         api_version: str = API_VERSION,
         event_hooks: dict = None,
         max_retries: int = 0,
-        request_timeout: int = 300
+        request_timeout: int = 300,
+        limits: httpx.Limits = None,
+        http2: bool = False,
+        transport: httpx.BaseTransport = None,
+        retry_policy: RetryPolicy = None,
+        rate_limiter: RateLimiter = None,
+        json_codec: Union[str, JsonCodec] = "json",
+        compression: CompressionPolicy = None,
+        accept_encoding: Union[str, Iterable[str]] = None,
     ) -> None:
         """Gets a session, initializes it and uses as the current session ready to
         use sdk.
@@ -386,6 +733,17 @@ class AxiomaSession(BaseContext):
             proxy (dict|str): The proxy for the request (if required).
             max_retries (int) : Number of times to retry if request fails
             request_timeout (int) : Number of seconds till request is timed out
+            limits (httpx.Limits) : Connection pool limits of the client
+            http2 (bool) : Enable HTTP/2 (requires the h2 package)
+            transport (httpx.BaseTransport) : Optional transport for the client
+            retry_policy (RetryPolicy) : Which requests are retried and the backoff
+            rate_limiter (RateLimiter) : Optional client side limits by endpoint family
+            json_codec (Union[str, JsonCodec]) : The json library of the requests and
+                            responses (default "json": the standard library)
+            compression (CompressionPolicy) : Optional compression of large request
+                            bodies
+            accept_encoding (Union[str, Iterable[str]]) : The content encodings of
+                            the responses accepted, "auto" for all that can be decoded
         Keyword Arguments:
             application_name (str): Optional label for this session.
                         (default: {DEFAULT_APP})
@@ -408,7 +766,15 @@ class AxiomaSession(BaseContext):
             api_version=api_version,
             event_hooks=event_hooks,
             max_retries=max_retries,
-            request_timeout=request_timeout
+            request_timeout=request_timeout,
+            limits=limits,
+            http2=http2,
+            transport=transport,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            json_codec=json_codec,
+            compression=compression,
+            accept_encoding=accept_encoding,
         )
         session.init()
         cls.current = session
@@ -510,6 +876,7 @@ class AxiomaSession(BaseContext):
         data = None,
         params: dict = None,
         headers: dict = None,
+        api_type: APIType = None,
     ):
         kwargs = {}
         req_headers = self._session.headers.copy()
@@ -521,10 +888,24 @@ class AxiomaSession(BaseContext):
         kwargs["headers"] = req_headers
 
         if json:
-            kwargs["json"] = json
+            # encoded by the session codec, the content type is set above
+            if isinstance(json, bytes):
+                content = json
+            else:
+                content = self.json_codec.dumps(json)
+            req_headers.setdefault("Content-Type", self.json_codec.content_type)
+            if (
+                self.compression is not None
+                and "Content-Encoding" not in req_headers
+                and self.compression.should_compress(method.value, content)
+            ):
+                content, encoding = self.compression.compress(content)
+                req_headers["Content-Encoding"] = encoding
+            kwargs["content"] = content
 
         if data:
-            kwargs["data"] = data
+            # raw (e.g. pre-compressed) bodies are content, httpx deprecated data=bytes
+            kwargs["content" if isinstance(data, bytes) else "data"] = data
 
         if params:
             kwargs["params"] = params
@@ -534,7 +915,7 @@ class AxiomaSession(BaseContext):
             full_url = full_url[1:] if full_url.startswith("/") else full_url
             if not full_url.startswith(f"api/{self.api_version}"):
                 full_url = f"api/{self.api_version}/{full_url}"
-            full_url = posixpath.join(self.domain, self.api_type, full_url)
+            full_url = posixpath.join(self.domain, api_type or self.api_type, full_url)
         return full_url, kwargs
 
     def _prepare_response(
@@ -566,14 +947,26 @@ class AxiomaSession(BaseContext):
             }
 
         if (method == HttpMethods.GET or method == HttpMethods.PATCH) and cls:
-            res_json = response.json()
+            if stream:
+                return self._stream_items(response, cls)
+            res_json = self.json_codec.loads(response.content)
+            from_dict = cls.from_dict
+            if isinstance(cls, type) and issubclass(cls, EntityBase):
+                # the parsed json is not used elsewhere so it does not need copying
+                from_dict = functools.partial(cls.from_dict, copy=False)
             items = res_json.get("items", None)
             if items is not None:
-                return tuple(cls.from_dict(item) for item in items)
+                return tuple(from_dict(item) for item in items)
             else:
-                return cls.from_dict(res_json)
+                return from_dict(res_json)
         else:
-            return AxiomaResponse(response=response, streaming=stream)
+            return AxiomaResponse(
+                response=response, streaming=stream, json_codec=self.json_codec
+            )
+
+    def _stream_items(self, response: httpx.Response, cls: type) -> Iterator[Any]:
+        """The instances of cls created from the items of a streamed response"""
+        return iter_response_items(response, cls=cls)
 
     def _handle_response_exception(
         self, response: httpx.Response, stream: bool = False
@@ -621,23 +1014,55 @@ class AxiomaSession(BaseContext):
         )
         return self._authenticate()
 
-    def retry_request(__make_request):
-        def inner_function(*args, **kwargs):
-            counter = 0
-            while counter <= AxiomaSession.current.max_retries:
-                response = __make_request(*args, **kwargs)
-                if (response.status_code == 500 and
-                        "/analyses/" not in args[2] and
-                        AxiomaSession.current.api_type != "BULK"):
-                    counter = counter + 1
-                    _logger.info(f"Will Retry request if {counter} <= {AxiomaSession.current.max_retries} as specified by user")
-                else:
-                    return response
-            return response
+    def _rate_limit(self, url: str, api_type: APIType) -> RateLimit:
+        """The rate limit of the endpoint, unlimited if the session has no rate
+        limiter"""
+        if self.rate_limiter is None:
+            return _UNLIMITED
+        return self.rate_limiter.limit_for(url, api_type)
+
+    def _send(
+        self,
+        request: httpx.Request,
+        stream: bool = False,
+        rate_limit: RateLimit = _UNLIMITED,
+    ) -> httpx.Response:
+        """Sends the request, retrying according to the retry policy of the session.
+        Every attempt waits for the rate limit of the endpoint.
 
-        return inner_function
+        Args:
+            request (httpx.Request): the request to send
+            stream (bool): stream the response content
+            rate_limit (RateLimit): the rate limit of the endpoint
+
+        Returns:
+            httpx.Response: the last response received
+        """
+        policy = self.retry_policy
+        attempt = 0
+        while True:
+            try:
+                with rate_limit:
+                    response = self._session.send(request=request, stream=stream)
+            except httpx.RequestError as e:
+                if not policy.should_retry_error(request.method, e, attempt):
+                    raise
+                delay = policy.delay(attempt)
+                _logger.warning(
+                    f"Sending the request raised {e!r}, will retry in {delay:.2f}s"
+                )
+            else:
+                if not policy.should_retry_response(request.method, response, attempt):
+                    return response
+                delay = policy.delay(attempt, response)
+                _logger.warning(
+                    f"{request.method} {request.url} returned {response.status_code},"
+                    f" will retry in {delay:.2f}s"
+                )
+                response.close()
+            attempt += 1
+            time.sleep(delay)
 
-    @retry_request
     def __make_request(
         self,
         method: HttpMethods,
@@ -649,32 +1074,41 @@ class AxiomaSession(BaseContext):
         stream: bool = False,
         cls: type = None,
         try_auth: bool = True,
-        return_response: bool = False
+        return_response: bool = False,
+        api_type: APIType = APIType.REST,
     ):
         """
         Wraps the requests method to log the request and log the response
         handle errors.
 
-        Setting stream to True will ignore the cls argument and
-        return the response object.
+        Setting stream to True returns the (streamed) response object or, if cls is
+        set, an iterator of the instances created from the items of the response as
+        they are parsed.
+
+        The api_type is declared by the calling endpoint and selects the api
+        (REST, BULK or CEB) the request is sent to.
 
         Returns:
             requests response: the response object from making the request
         """
 
-        url, kwargs = self._prepare_request_args(
-            method=method, url=url, json=json, data=data, params=params, headers=headers
+        full_url, kwargs = self._prepare_request_args(
+            method=method,
+            url=url,
+            json=json,
+            data=data,
+            params=params,
+            headers=headers,
+            api_type=api_type,
         )
 
-        if stream and cls is not None:
-            _logger.warning(
-                "If the cls argument is not None the request will not be streamed"
-            )
-            stream = False
-
         try:
-            req = self._session.build_request(method=method.value, url=url, **kwargs)
-            response = self._session.send(request=req, stream=stream)
+            req = self._session.build_request(
+                method=method.value, url=full_url, **kwargs
+            )
+            response = self._send(
+                request=req, stream=stream, rate_limit=self._rate_limit(url, api_type)
+            )
         except httpx.RequestError as e:
             _logger.error(f"Sending the request raised a request error: {e}")
             raise AxiomaRequestError(http_request_error=e) from e
@@ -685,12 +1119,16 @@ class AxiomaSession(BaseContext):
 
             return self.__make_request(
                 method,
-                str(req.url),
+                url,
                 params=params,
                 json=json,
+                data=data,
                 headers=headers,
+                stream=stream,
                 cls=cls,
                 try_auth=False,
+                return_response=return_response,
+                api_type=api_type,
             )
 
         self._handle_response_exception(response=response, stream=stream)
@@ -708,16 +1146,6 @@ class AxiomaSession(BaseContext):
 
         return prepped_response
 
-    def _set_api_type(self):
-        stack = inspect.stack()
-        file_name = stack[2].filename.split(os.path.sep)[-1]
-        if file_name == "bulk.py":
-            self.api_type = APIType.BULK
-        elif file_name == "clienteventbus.py":
-            self.api_type = APIType.CEB
-        else:
-            self.api_type = APIType.REST
-
     def _get(
         self,
         url: str,
@@ -726,8 +1154,8 @@ class AxiomaSession(BaseContext):
         stream: bool = False,
         cls: type = None,
         return_response: bool = False,
+        api_type: APIType = APIType.REST,
     ):
-        self._set_api_type()
         resp = self.__make_request(
             HttpMethods.GET,
             url,
@@ -736,6 +1164,7 @@ class AxiomaSession(BaseContext):
             stream=stream,
             cls=cls,
             return_response=return_response,
+            api_type=api_type,
         )
         return resp
 
@@ -745,40 +1174,51 @@ class AxiomaSession(BaseContext):
         params: dict = None,
         headers: dict = None,
         return_response: bool = False,
+        api_type: APIType = APIType.REST,
     ):
-        self._set_api_type()
         resp = self.__make_request(
             HttpMethods.DELETE,
             url,
             params=params,
             headers=headers,
             return_response=return_response,
+            api_type=api_type,
         )
         return resp
 
     def _post(
-        self, url: str, json: dict, headers: dict = None, return_response: bool = False,
+        self,
+        url: str,
+        json: dict,
+        headers: dict = None,
+        return_response: bool = False,
+        api_type: APIType = APIType.REST,
     ):
-        self._set_api_type()
         resp = self.__make_request(
             HttpMethods.POST,
             url,
             json=json,
             headers=headers,
             return_response=return_response,
+            api_type=api_type,
         )
         return resp
 
     def _put(
-        self, url: str, json: dict, headers: dict = None, return_response: bool = False,
+        self,
+        url: str,
+        json: dict,
+        headers: dict = None,
+        return_response: bool = False,
+        api_type: APIType = APIType.REST,
     ):
-        self._set_api_type()
         resp = self.__make_request(
             HttpMethods.PUT,
             url,
             json=json,
             headers=headers,
             return_response=return_response,
+            api_type=api_type,
         )
         return resp
 
@@ -790,8 +1230,8 @@ class AxiomaSession(BaseContext):
         parameters: dict = None,
         cls: type = None,
         return_response: bool = False,
+        api_type: APIType = APIType.REST,
     ):
-        self._set_api_type()
         if (headers is not None and 'gzip' in headers.values()):
             resp = self.__make_request(
                 HttpMethods.PATCH,
@@ -801,6 +1241,7 @@ class AxiomaSession(BaseContext):
                 params=parameters,
                 cls=cls,
                 return_response=return_response,
+                api_type=api_type,
             )
         else:
             resp = self.__make_request(
@@ -811,6 +1252,7 @@ class AxiomaSession(BaseContext):
                 params=parameters,
                 cls=cls,
                 return_response=return_response,
+                api_type=api_type,
             )
         return resp
 
@@ -839,7 +1281,15 @@ class SimpleAuthSession(AxiomaSession):
         api_version: str = API_VERSION,
         event_hooks: dict = None,
         max_retries: int = 0,
-        request_timeout: int = 300
+        request_timeout: int = 300,
+        limits: httpx.Limits = None,
+        http2: bool = False,
+        transport: httpx.BaseTransport = None,
+        retry_policy: RetryPolicy = None,
+        rate_limiter: RateLimiter = None,
+        json_codec: Union[str, JsonCodec] = "json",
+        compression: CompressionPolicy = None,
+        accept_encoding: Union[str, Iterable[str]] = None,
     ):
         super().__init__(
             domain=domain,
@@ -849,6 +1299,16 @@ class SimpleAuthSession(AxiomaSession):
             application_name=application_name,
             api_version=api_version,
             event_hooks=event_hooks,
+            max_retries=max_retries,
+            request_timeout=request_timeout,
+            limits=limits,
+            http2=http2,
+            transport=transport,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            json_codec=json_codec,
+            compression=compression,
+            accept_encoding=accept_encoding,
         )
 
         env_config = self._config_for_environment()
@@ -864,7 +1324,8 @@ class SimpleAuthSession(AxiomaSession):
         self.certificates = certificates
         self.max_retries = max_retries
 
-    def _authenticate(self):
+    def _authentication_payload(self):
+        """Returns the form data and headers for the token request"""
         credentials = {
             "grant_type": self.grant_type,
             "client_id": self.__client_id,
@@ -875,15 +1336,37 @@ class SimpleAuthSession(AxiomaSession):
             "accept": "application/json",
             "Content-Type": "application/x-www-form-urlencoded",
         }
-        proxy = self.proxy
-        certificates = self.certificates
-        _logger.info("Preparing to authenticate:")
+        return credentials, headers
+
+    def _authentication_request(self):
+        """Builds the token request on the session client so the authentication
+        shares the connection pool (and transport) of the session"""
+        credentials, headers = self._authentication_payload()
+        request = self._session.build_request(
+            "POST", self.auth_url, data=credentials, headers=headers
+        )
+        # do not send an expired token when re-authenticating
+        request.headers.pop("Authorization", None)
+        return request
 
-        with httpx.Client(proxy=proxy, verify=certificates, timeout=self.timeout) as client:
-            response = client.post(self.auth_url, data=credentials, headers=headers)
+    def _authenticate(self):
+        _logger.info("Preparing to authenticate:")
 
         _logger.info(f"Sending authentication request to {self.auth_url}")
 
+        response = self._session.send(self._authentication_request())
+
+        return self._authenticated(response)
+
+    def _authenticated(self, response: httpx.Response) -> bool:
+        """Checks the token response and sets the access token on the session headers
+
+        Args:
+            response (httpx.Response): the response from the token request
+
+        Returns:
+            bool: True if authenticated (otherwise raises)
+        """
         if response.status_code != 200:
             _logger.error(
                 f"Unable to authenticate: {response.status_code} - {response.text}"
@@ -930,6 +1413,339 @@ class SimpleAuthSession(AxiomaSession):
         }
 
         self._session.headers.update(auth_headers)
-        self._session.timeout = httpx.Timeout(self.timeout)
+        self._session.timeout = self.retry_policy.timeout(self.timeout)
 
         return True
+
+
+class AsyncAxiomaSession(AxiomaSession, BaseContext):
+    """The asyncio version of the AxiomaSession. Wraps an httpx AsyncClient so the
+    request methods (and the async api classes in axiomapy.axiomaapi) are coroutines
+    and many requests can be in flight from a single thread.
+    The async session is managed through its own context so AsyncAxiomaSession.current
+    and AxiomaSession.current can be set at the same time.
+    To get started await AsyncAxiomaSession.use_session(...) or use the session from
+    AsyncAxiomaSession.get_session(...) with async with.
+
+    Args:
+        AxiomaSession ([type]): [description]
+    """
+
+    @classmethod
+    def _get_session_type(cls) -> type:
+        """The session class created by get_session"""
+        return AsyncSimpleAuthSession
+
+    @classmethod
+    async def use_session(cls, *args, **kwargs) -> None:
+        """Gets a session, initializes it and uses as the current async session.
+        Same as calling .get_session and then awaiting .init()
+
+        Takes the same arguments as AxiomaSession.use_session
+        """
+        session = cls.get_session(*args, **kwargs)
+        await session.init()
+        cls.current = session
+
+    async def init(self) -> None:
+        """Initializes the async http client and authenticates the session"""
+        if not self._session:
+            self._session = httpx.AsyncClient(**self._client_kwargs())
+            self._is_authenticated = await self._authenticate()
+            if self._is_authenticated:
+                if self.event_hooks is not None:
+                    self._session.event_hooks = get_event_hooks(
+                        self.event_hooks, async_fns=True
+                    )
+
+    def close(self):
+        """Removes the underlying async session without closing the connections,
+        await aclose() to close them."""
+        self._session = None
+
+    async def aclose(self):
+        """Closes the underlying async session and removes it."""
+        if self._session:
+            await self._session.aclose()
+            self._session = None
+
+    def __enter__(self):
+        raise AxiomaTypeError(
+            f"{self.__class__.__name__} is entered with async with, not with"
+        )
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    async def _aon_enter(self):
+        self.__close_on_exit = self._session is None
+        if not self._session:
+            await self.init()
+
+    async def _aon_exit(self, exc_type, exc_val, exc_tb):
+        if self.__close_on_exit:
+            await self.aclose()
+
+    async def test(self) -> str:
+        """Make a test call to the api $me endpoint
+
+        Returns:
+            str: text from response
+        """
+        print(f"Running Test on: {self.name}")
+        url = posixpath.join(self.domain, self.api_type, "api", self.api_version, "$me")
+        response = await self._session.get(url)
+        sub = {
+            k: v
+            for k, v in response.json().items()
+            if k in ["userLogin", "userName", "email", "role", "lastSuccessfulLogin"]
+        }
+        print(f"Test completed: {str(sub)}")
+        return response.json()
+
+    def _stream_items(
+        self, response: httpx.Response, cls: type
+    ) -> AsyncIterator[Any]:
+        return aiter_response_items(response, cls=cls)
+
+    async def _send(
+        self,
+        request: httpx.Request,
+        stream: bool = False,
+        rate_limit: RateLimit = _UNLIMITED,
+    ) -> httpx.Response:
+        """Async version of AxiomaSession._send"""
+        policy = self.retry_policy
+        attempt = 0
+        while True:
+            try:
+                async with rate_limit:
+                    response = await self._session.send(request=request, stream=stream)
+            except httpx.RequestError as e:
+                if not policy.should_retry_error(request.method, e, attempt):
+                    raise
+                delay = policy.delay(attempt)
+                _logger.warning(
+                    f"Sending the request raised {e!r}, will retry in {delay:.2f}s"
+                )
+            else:
+                if not policy.should_retry_response(request.method, response, attempt):
+                    return response
+                delay = policy.delay(attempt, response)
+                _logger.warning(
+                    f"{request.method} {request.url} returned {response.status_code},"
+                    f" will retry in {delay:.2f}s"
+                )
+                await response.aclose()
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def __make_request(
+        self,
+        method: HttpMethods,
+        url: str,
+        json: dict = None,
+        data: bytes = None,
+        params: dict = None,
+        headers: dict = None,
+        stream: bool = False,
+        cls: type = None,
+        try_auth: bool = True,
+        return_response: bool = False,
+        api_type: APIType = APIType.REST,
+    ):
+        """
+        Async version of AxiomaSession.__make_request
+
+        Returns:
+            requests response: the response object from making the request
+        """
+
+        full_url, kwargs = self._prepare_request_args(
+            method=method,
+            url=url,
+            json=json,
+            data=data,
+            params=params,
+            headers=headers,
+            api_type=api_type,
+        )
+
+        try:
+            req = self._session.build_request(
+                method=method.value, url=full_url, **kwargs
+            )
+            response = await self._send(
+                request=req, stream=stream, rate_limit=self._rate_limit(url, api_type)
+            )
+        except httpx.RequestError as e:
+            _logger.error(f"Sending the request raised a request error: {e}")
+            raise AxiomaRequestError(http_request_error=e) from e
+
+        if stream and (response.status_code == 401 or response.is_error):
+            # read so the sync error handling can access the content
+            await response.aread()
+
+        if response.status_code == 401:
+            # Try logging in again in case session expired
+            await self._authentication_failed(response=response, try_auth=try_auth)
+
+            return await self.__make_request(
+                method,
+                url,
+                params=params,
+                json=json,
+                data=data,
+                headers=headers,
+                stream=stream,
+                cls=cls,
+                try_auth=False,
+                return_response=return_response,
+                api_type=api_type,
+            )
+
+        self._handle_response_exception(response=response, stream=stream)
+
+        if return_response:
+            return response
+
+        prepped_response = self._prepare_response(
+            response=response,
+            method=method,
+            cls=cls,
+            stream=stream,
+            return_response=return_response,
+        )
+
+        return prepped_response
+
+    async def _get(
+        self,
+        url: str,
+        params: dict = None,
+        headers: dict = None,
+        stream: bool = False,
+        cls: type = None,
+        return_response: bool = False,
+        api_type: APIType = APIType.REST,
+    ):
+        resp = await self.__make_request(
+            HttpMethods.GET,
+            url,
+            params=params,
+            headers=headers,
+            stream=stream,
+            cls=cls,
+            return_response=return_response,
+            api_type=api_type,
+        )
+        return resp
+
+    async def _delete(
+        self,
+        url: str,
+        params: dict = None,
+        headers: dict = None,
+        return_response: bool = False,
+        api_type: APIType = APIType.REST,
+    ):
+        resp = await self.__make_request(
+            HttpMethods.DELETE,
+            url,
+            params=params,
+            headers=headers,
+            return_response=return_response,
+            api_type=api_type,
+        )
+        return resp
+
+    async def _post(
+        self,
+        url: str,
+        json: dict,
+        headers: dict = None,
+        return_response: bool = False,
+        api_type: APIType = APIType.REST,
+    ):
+        resp = await self.__make_request(
+            HttpMethods.POST,
+            url,
+            json=json,
+            headers=headers,
+            return_response=return_response,
+            api_type=api_type,
+        )
+        return resp
+
+    async def _put(
+        self,
+        url: str,
+        json: dict,
+        headers: dict = None,
+        return_response: bool = False,
+        api_type: APIType = APIType.REST,
+    ):
+        resp = await self.__make_request(
+            HttpMethods.PUT,
+            url,
+            json=json,
+            headers=headers,
+            return_response=return_response,
+            api_type=api_type,
+        )
+        return resp
+
+    async def _patch(
+        self,
+        url: str,
+        json: Union[dict, bytes],
+        headers: dict = None,
+        parameters: dict = None,
+        cls: type = None,
+        return_response: bool = False,
+        api_type: APIType = APIType.REST,
+    ):
+        if (headers is not None and 'gzip' in headers.values()):
+            resp = await self.__make_request(
+                HttpMethods.PATCH,
+                url,
+                data=json,
+                headers=headers,
+                params=parameters,
+                cls=cls,
+                return_response=return_response,
+                api_type=api_type,
+            )
+        else:
+            resp = await self.__make_request(
+                HttpMethods.PATCH,
+                url,
+                json=json,
+                headers=headers,
+                params=parameters,
+                cls=cls,
+                return_response=return_response,
+                api_type=api_type,
+            )
+        return resp
+
+    async def _authenticate(self):
+        raise NotImplementedError("Must implement _authenticate")
+
+
+class AsyncSimpleAuthSession(AsyncAxiomaSession, SimpleAuthSession):
+    """The async version of the SimpleAuthSession.
+    Created by the AsyncAxiomaSession based on the credentials provided.
+
+    Args:
+        AsyncAxiomaSession ([type]): [description]
+    """
+
+    async def _authenticate(self):
+        _logger.info("Preparing to authenticate:")
+
+        _logger.info(f"Sending authentication request to {self.auth_url}")
+
+        response = await self._session.send(self._authentication_request())
+
+        return self._authenticated(response)
@@ -0,0 +1,548 @@
+"""
+Copyright © 2024 Axioma by SimCorp.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+"""
+import codecs
+import csv
+import functools
+import json
+import itertools
+import logging
+import re
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+)
+
+import httpx
+
+from axiomapy.entitybase import EntityBase
+
+_logger = logging.getLogger(__name__)
+_logger.addHandler(logging.NullHandler())
+
+_WHITESPACE = " \t\r\n"
+# the consumed part of the buffer is dropped once it is larger than this
+_COMPACT_SIZE = 1 << 16
+
+_START, _KEY, _COLON, _VALUE, _ITEMS, _DONE = range(6)
+_LINE_END = re.compile(r"\r\n|\r|\n")
+# the characters ending a string, a structure and a number or literal
+_STRING_SPECIAL = re.compile(r'["\\]')
+_STRUCTURE = re.compile(r'["\[\]{}]')
+_SCALAR_END = re.compile(r"[\s,\]}]")
+
+
+class JsonItemParser:
+    """An incremental parser of the items array of a JSON document.
+
+    The bytes of the document are passed to feed as they are received and the
+    elements of the items array (the value of items_key in the top level object, or
+    the top level array) are returned as soon as they are complete. Only one item and
+    the other top level values are held in memory at a time, not the document.
+
+    Example:
+        parser = JsonItemParser()
+        for chunk in response.iter_bytes():
+            for item in parser.feed(chunk):
+                ...
+        parser.close()
+
+    Args:
+        items_key (str): The key of the items array in the top level object
+    """
+
+    def __init__(self, items_key: str = "items"):
+        self.items_key = items_key
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._final = False
+        self._state = _START
+        self._key = None
+        self._root_array = False
+        self._scanner = None
+
+    def feed(self, chunk: bytes, final: bool = False) -> List[Any]:
+        """Parses the next part of the document
+
+        Args:
+            chunk (bytes): the next bytes of the document
+            final (bool): the chunk is the end of the document
+
+        Returns:
+            List[Any]: the items completed by the chunk
+        """
+        if self._pos > _COMPACT_SIZE:
+            if self._scanner is not None:
+                self._scanner.pos -= self._pos
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+        # the buffer is not referenced elsewhere while it grows so it is extended
+        # in place rather than copied for each chunk
+        buffer, self._buffer = self._buffer, None
+        buffer += self._text.decode(chunk, final)
+        self._buffer = buffer
+        self._final = final
+        items = []
+        while self._state != _DONE and self._step(items):
+            pass
+        return items
+
+    def close(self) -> List[Any]:
+        """Signals the end of the document
+
+        Returns:
+            List[Any]: the items completed by the end of the document
+
+        Raises:
+            json.JSONDecodeError: the document is incomplete or not valid
+        """
+        items = self.feed(b"", final=True)
+        if self._state != _DONE:
+            raise json.JSONDecodeError(
+                "Unexpected end of the document", self._buffer, len(self._buffer)
+            )
+        return items
+
+    def _error(self, message: str):
+        raise json.JSONDecodeError(message, self._buffer, self._pos)
+
+    def _next_char(self):
+        """Skips whitespace, the next character or None if more data is needed"""
+        buffer = self._buffer
+        pos = self._pos
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            pos += 1
+        self._pos = pos
+        return buffer[pos] if pos < len(buffer) else None
+
+    def _value(self, decode: bool = True):
+        """Scans the value at the position and decodes it once it is complete,
+        (False, None) if more data is needed. A value that is not decoded is
+        consumed as it is scanned so it is not held in memory."""
+        scanner = self._scanner
+        if scanner is None:
+            scanner = self._scanner = _ValueScanner(self._buffer, self._pos)
+        end = scanner.scan(self._buffer, self._final)
+        if end is None:
+            if self._final:
+                self._error("Unexpected end of the document")
+            if not decode:
+                self._pos = scanner.pos
+            return False, None
+        self._scanner = None
+        value = None
+        if decode:
+            value, decoded_end = self._decoder.raw_decode(self._buffer, self._pos)
+            if decoded_end != end:
+                self._pos = decoded_end
+                self._error("Extra data")
+        self._pos = end
+        return True, value
+
+    def _read_value(self, items: list) -> bool:
+        """Reads the key, value or item expected by the state"""
+        state = self._state
+        done, value = self._value(decode=state != _VALUE)
+        if not done:
+            return False
+        if state == _KEY:
+            self._key = value
+            self._state = _COLON
+        elif state == _VALUE:
+            self._state = _KEY
+        else:
+            items.append(value)
+        return True
+
+    def _step(self, items: list) -> bool:
+        if self._scanner is not None:
+            return self._read_value(items)
+        char = self._next_char()
+        if char is None:
+            return False
+        state = self._state
+        if state == _START:
+            if char == "{":
+                self._state = _KEY
+            elif char == "[":
+                self._state = _ITEMS
+                self._root_array = True
+            else:
+                self._error("Expected an object or an array")
+            self._pos += 1
+        elif state == _KEY:
+            if char == "}":
+                self._state = _DONE
+                self._pos += 1
+            elif char == ",":
+                self._pos += 1
+            elif char == '"':
+                return self._read_value(items)
+            else:
+                self._error("Expected a key")
+        elif state == _COLON:
+            if char != ":":
+                self._error("Expected ':'")
+            self._pos += 1
+            self._state = _VALUE
+        elif state == _VALUE:
+            if self._key == self.items_key and char == "[":
+                self._pos += 1
+                self._state = _ITEMS
+            else:
+                return self._read_value(items)
+        elif state == _ITEMS:
+            if char == "]":
+                self._pos += 1
+                self._state = _DONE if self._root_array else _KEY
+            elif char == ",":
+                self._pos += 1
+            else:
+                return self._read_value(items)
+        return True
+
+
+class _ValueScanner:
+    """Finds the end of a JSON value received in chunks without decoding it. The
+    scan resumes where the previous chunk ended so each character is read once."""
+
+    __slots__ = ("pos", "depth", "in_string", "escape", "scalar")
+
+    def __init__(self, buffer: str, start: int):
+        first = buffer[start]
+        self.depth = 0
+        self.escape = False
+        self.in_string = first == '"'
+        self.scalar = first not in '"[{'
+        self.pos = start + 1 if self.in_string else start
+
+    def scan(self, buffer: str, final: bool) -> Optional[int]:
+        """Scans the new part of the buffer
+
+        Args:
+            buffer (str): the buffer holding the value
+            final (bool): the buffer is the end of the document
+
+        Returns:
+            Optional[int]: the end of the value, None if more data is needed
+        """
+        if self.scalar:
+            match = _SCALAR_END.search(buffer, self.pos)
+            if match is not None:
+                return match.start()
+            self.pos = len(buffer)
+            # a number at the end of the buffer may continue in the next chunk
+            return self.pos if final else None
+        pos = self.pos
+        while pos < len(buffer):
+            if self.escape:
+                self.escape = False
+                pos += 1
+                continue
+            pattern = _STRING_SPECIAL if self.in_string else _STRUCTURE
+            match = pattern.search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                break
+            pos = match.end()
+            char = match.group()
+            if char == "\\":
+                self.escape = True
+            elif char == '"':
+                self.in_string = not self.in_string
+                if not self.in_string and self.depth == 0:
+                    return pos
+            elif char in "[{":
+                self.depth += 1
+            else:
+                self.depth -= 1
+                if self.depth == 0:
+                    return pos
+        self.pos = pos
+        return None
+
+
+def _item_factory(cls: type = None) -> Callable[[Any], Any]:
+    if cls is None:
+        return lambda item: item
+    if isinstance(cls, type) and issubclass(cls, EntityBase):
+        # the items are parsed for the instance only so they do not need copying
+        return functools.partial(cls.from_dict, copy=False)
+    return cls.from_dict
+
+
+def iter_json_items(
+    chunks: Iterable[bytes], items_key: str = "items", cls: type = None
+) -> Iterator[Any]:
+    """Iterates over the items array of a JSON document received in chunks, e.g.
+    the iter_bytes() of a streamed response. Peak memory depends on the size of an
+    item rather than the size of the document.
+
+    Args:
+        chunks (Iterable[bytes]): the bytes of the document
+        items_key (str): the key of the items array in the top level object (a top
+            level array is also accepted)
+        cls (type): a type with a from_dict method (e.g. an EntityBase) to create the
+            items, None for the parsed JSON
+
+    Returns:
+        Iterator[Any]: the items
+    """
+    parser = JsonItemParser(items_key)
+    create = _item_factory(cls)
+    for chunk in chunks:
+        for item in parser.feed(chunk):
+            yield create(item)
+    for item in parser.close():
+        yield create(item)
+
+
+async def aiter_json_items(
+    chunks: AsyncIterable[bytes], items_key: str = "items", cls: type = None
+) -> AsyncIterator[Any]:
+    """Async version of iter_json_items, e.g. for the aiter_bytes() of a streamed
+    response of the async session.
+
+    Args:
+        chunks (AsyncIterable[bytes]): the bytes of the document
+        items_key (str): the key of the items array in the top level object
+        cls (type): a type with a from_dict method to create the items
+
+    Returns:
+        AsyncIterator[Any]: the items
+    """
+    parser = JsonItemParser(items_key)
+    create = _item_factory(cls)
+    async for chunk in chunks:
+        for item in parser.feed(chunk):
+            yield create(item)
+    for item in parser.close():
+        yield create(item)
+
+
+def iter_response_items(
+    response: httpx.Response,
+    items_key: str = "items",
+    cls: type = None,
+    chunks: Iterable[bytes] = None,
+) -> Iterator[Any]:
+    """Iterates over the items of a streamed response and closes the response when
+    the items are consumed (or the iterator is closed). A compressed response is
+    decompressed chunk by chunk, chunks defaults to response.iter_bytes()"""
+    if chunks is None:
+        chunks = response.iter_bytes()
+    try:
+        yield from iter_json_items(chunks, items_key, cls)
+    finally:
+        response.close()
+
+
+async def aiter_response_items(
+    response: httpx.Response,
+    items_key: str = "items",
+    cls: type = None,
+    chunks: AsyncIterable[bytes] = None,
+) -> AsyncIterator[Any]:
+    """Async version of iter_response_items"""
+    if chunks is None:
+        chunks = response.aiter_bytes()
+    try:
+        async for item in aiter_json_items(chunks, items_key, cls):
+            yield item
+    finally:
+        await response.aclose()
+
+
+class _LineSplitter:
+    """Splits decoded text into lines (ending with \\n, \\r\\n or \\r) as the chunks
+    are received, a \\r\\n split across chunks is kept together"""
+
+    def __init__(self, encoding: str = "utf-8", keepends: bool = False):
+        self._text = codecs.getincrementaldecoder(encoding)(errors="replace")
+        self._pending = ""
+        self.keepends = keepends
+
+    def feed(self, chunk: bytes, final: bool = False) -> List[str]:
+        text = self._pending + self._text.decode(chunk, final)
+        lines = []
+        start = 0
+        for match in _LINE_END.finditer(text):
+            end = match.end()
+            if end == len(text) and match.group() == "\r" and not final:
+                break
+            line_end = end if self.keepends else match.start()
+            lines.append(text[start:line_end])
+            start = end
+        self._pending = text[start:]
+        if final and self._pending:
+            lines.append(self._pending)
+            self._pending = ""
+        return lines
+
+
+def iter_lines(
+    chunks: Iterable[bytes], encoding: str = "utf-8", keepends: bool = False
+) -> Iterator[str]:
+    """Iterates over the lines of a text document received in chunks
+
+    Args:
+        chunks (Iterable[bytes]): the bytes of the document
+        encoding (str): the encoding of the document
+        keepends (bool): keep the line endings
+
+    Returns:
+        Iterator[str]: the lines
+    """
+    splitter = _LineSplitter(encoding, keepends)
+    for chunk in chunks:
+        yield from splitter.feed(chunk)
+    yield from splitter.feed(b"", final=True)
+
+
+async def aiter_lines(
+    chunks: AsyncIterable[bytes], encoding: str = "utf-8", keepends: bool = False
+) -> AsyncIterator[str]:
+    """Async version of iter_lines"""
+    splitter = _LineSplitter(encoding, keepends)
+    async for chunk in chunks:
+        for line in splitter.feed(chunk):
+            yield line
+    for line in splitter.feed(b"", final=True):
+        yield line
+
+
+def iter_csv_rows(
+    chunks: Iterable[bytes], encoding: str = "utf-8", **fmtparams
+) -> Iterator[List[str]]:
+    """Iterates over the rows of a CSV document received in chunks, quoted values
+    may span lines
+
+    Args:
+        chunks (Iterable[bytes]): the bytes of the document
+        encoding (str): the encoding of the document
+        fmtparams: the dialect and formatting parameters of csv.reader
+
+    Returns:
+        Iterator[List[str]]: the rows, including the header row
+    """
+    return csv.reader(iter_lines(chunks, encoding, keepends=True), **fmtparams)
+
+
+def parse_csv_value(value: str) -> Any:
+    """The int or float of a CSV value that is a number, None for an empty value and
+    otherwise the string. Integers with leading zeros (e.g. codes) stay strings."""
+    if value == "":
+        return None
+    digits = value[1:] if value[0] in "+-" else value
+    if digits.isdigit():
+        if len(digits) > 1 and digits[0] == "0":
+            return value
+        return int(value)
+    try:
+        number = float(value)
+    except ValueError:
+        return value
+    # nan, inf and the like are identifiers rather than numbers here
+    return number if digits[:1].isdigit() or digits[:1] == "." else value
+
+
+def infer_csv_type(values: Iterable[str]) -> Callable[[str], Any]:
+    """The type of a CSV column from a sample of its values: int if the values that
+    are not empty are all integers, float if they are all numbers and otherwise str
+    (e.g. a column of codes with leading zeros)"""
+    parsed = [parse_csv_value(value) for value in values if value != ""]
+    if not parsed or any(isinstance(value, str) for value in parsed):
+        return str
+    if all(isinstance(value, int) for value in parsed):
+        return int
+    return float
+
+
+def _column_converter(column_type: Callable[[str], Any]) -> Callable[[str], Any]:
+    """Converts the values of a column with an inferred type, values after the
+    sample that are not of that type stay strings"""
+    if column_type is str:
+        return str
+
+    def convert(value: str) -> Any:
+        try:
+            return column_type(value)
+        except ValueError:
+            return value
+
+    return convert
+
+
+def iter_csv_records(
+    chunks: Iterable[bytes],
+    types: Optional[Dict[str, Callable[[str], Any]]] = None,
+    encoding: str = "utf-8",
+    infer_types: bool = False,
+    infer_rows: int = 100,
+    **fmtparams,
+) -> Iterator[Dict[str, Any]]:
+    """Iterates over the records of a CSV document with a header row as
+    dictionaries with typed values
+
+    Args:
+        chunks (Iterable[bytes]): the bytes of the document
+        types (Dict[str, Callable[[str], Any]]): the type (a callable taking the
+            string value, e.g. float) of columns by name, empty and missing values
+            are None
+        encoding (str): the encoding of the document
+        infer_types (bool): infer the type of each of the other columns from its
+            values in the first infer_rows rows (see infer_csv_type), otherwise
+            they are strings
+        infer_rows (int): the number of rows the types are inferred from
+        fmtparams: the dialect and formatting parameters of csv.reader
+
+    Returns:
+        Iterator[Dict[str, Any]]: the records
+    """
+    rows = iter_csv_rows(chunks, encoding, **fmtparams)
+    header = next(rows, None)
+    if header is None:
+        return
+    types = types or {}
+    sample = []
+    if infer_types:
+        sample = [row for row in itertools.islice(rows, infer_rows) if row]
+        inferred = {
+            column: infer_csv_type(row[i] for row in sample if i < len(row))
+            for i, column in enumerate(header)
+            if column not in types
+        }
+        types = {
+            **{k: _column_converter(v) for k, v in inferred.items()},
+            **types,
+        }
+    converters = [types.get(column, str) for column in header]
+    for row in itertools.chain(sample, rows):
+        if not row:
+            continue
+        record = dict.fromkeys(header)
+        for column, convert, value in zip(header, converters, row):
+            if value != "":
+                record[column] = convert(value)
+        yield record
@@ -0,0 +1,50 @@
+"""
+Copyright © 2024 Axioma by SimCorp.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+
+
+Micro-benchmark of converting entities to and from dictionaries, using the Position
+entity of the unit tests.
+
+Run with:
+    python -m axiomapy.test.benchmarks.entity_serialisation [--count N]
+"""
+import argparse
+import time
+
+from axiomapy.test.unit.test_entitybase import POSITION, Position
+
+
+def _time(label: str, fn, count: int):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<30} {elapsed:8.3f}s {elapsed / count * 1e6:10.1f} us/entity")
+
+
+def main(count: int = 50000):
+    payload = [dict(POSITION, clientId=f"C{i}") for i in range(count)]
+    positions = []
+
+    _time("Position.from_dict", lambda: positions.extend(
+        Position.from_dict(p) for p in payload), count)
+    _time("Position.from_dict(copy=False)", lambda: [
+        Position.from_dict(p, copy=False) for p in payload], count)
+    _time("Position.to_dict", lambda: [p.to_dict() for p in positions], count)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Entity (de)serialisation")
+    parser.add_argument("--count", type=int, default=50000)
+    main(parser.parse_args().count)
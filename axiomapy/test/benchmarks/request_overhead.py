@@ -0,0 +1,100 @@
+"""
+Copyright © 2024 Axioma by SimCorp.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+
+
+Micro-benchmark of the per-request overhead of the sdk. The requests are answered by
+an httpx.MockTransport so no time is spent on the network; the time of a plain
+httpx.Client request through the same transport is reported as the baseline.
+
+Run with:
+    python -m axiomapy.test.benchmarks.request_overhead [--number N]
+"""
+import argparse
+import timeit
+from unittest.mock import patch
+
+import httpx
+
+from axiomapy import AxiomaSession
+from axiomapy.axiomaapi import BulkAPI, PortfoliosAPI
+from axiomapy.session import SimpleAuthSession
+
+_PORTFOLIO = {
+    "id": 1234,
+    "name": "USAssets",
+    "defaultCurrency": "USD",
+    "attributes": {"CurrencyRisk": "Regular"},
+    "_links": {"self": {"href": "/api/v1/portfolios/1234"}},
+}
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json=_PORTFOLIO)
+
+
+def _use_mock_session():
+    with patch.object(SimpleAuthSession, "_authenticate", return_value=True):
+        AxiomaSession.use_session(
+            username="u_name", password="pwd", domain="https://test", event_hooks={}
+        )
+    session = AxiomaSession.current
+    headers = session._session.headers
+    session._session.close()
+    session._session = httpx.Client(
+        transport=httpx.MockTransport(_handler), headers=headers
+    )
+    return session
+
+
+def _time(label: str, fn, number: int, baseline: float = None) -> float:
+    fn()
+    per_call = min(timeit.repeat(fn, number=number, repeat=5)) / number
+    msg = f"{label:<40} {per_call * 1e6:10.1f} us/request"
+    if baseline is not None:
+        msg = f"{msg} (sdk overhead {(per_call - baseline) * 1e6:8.1f} us)"
+    print(msg)
+    return per_call
+
+
+def main(number: int = 2000):
+    session = _use_mock_session()
+    client = session._session
+    url = "https://test/REST/api/v1/portfolios/1234"
+
+    baseline = _time("httpx.Client.get", lambda: client.get(url), number)
+    _time(
+        "PortfoliosAPI.get_portfolio",
+        lambda: PortfoliosAPI.get_portfolio(1234),
+        number,
+        baseline,
+    )
+    _time(
+        "PortfoliosAPI.get_portfolios",
+        lambda: PortfoliosAPI.get_portfolios(top=10),
+        number,
+        baseline,
+    )
+    _time(
+        "BulkAPI.patch_portfolios_payload",
+        lambda: BulkAPI.patch_portfolios_payload("2023-01-13", {"portfolios": []}),
+        number,
+        baseline,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-request overhead of the sdk")
+    parser.add_argument("--number", type=int, default=2000)
+    main(parser.parse_args().number)
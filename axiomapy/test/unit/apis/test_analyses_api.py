@@ -80,7 +80,9 @@ class TestAnalysesAPIMocker(unittest.TestCase):
                 f"{self.domain}/api/{AxiomaSession.current.api_version}/analyses/performance/portfolios/{p_id}"
             )
 
-            mock_Request.assert_called_with(method="POST", url=url, headers=ANY, json=pa_dict)
+            content = AxiomaSession.current.json_codec.dumps(pa_dict)
+            mock_Request.assert_called_with(method="POST", url=url, headers=ANY,
+                                            content=content)
             self.assertEqual(pa_response.response.status_code, 202)
             self.assertEqual(url, "https://test/REST/api/v1/analyses/performance/portfolios/1234")
             self.assertIsInstance(pa_dict, dict)
@@ -130,7 +130,9 @@ class TestAnalysisDefinitionsAPIMocker(unittest.TestCase):
             url = (
                 f"{self.domain}/api/{AxiomaSession.current.api_version}/analysis-definitions"
             )
-            mock_Request.assert_called_with(method="POST", url=url, headers=ANY, json=analysis_def_dict)
+            content = AxiomaSession.current.json_codec.dumps(analysis_def_dict)
+            mock_Request.assert_called_with(method="POST", url=url, headers=ANY,
+                                            content=content)
             self.assertEqual(ad_response.response.status_code, 201)
             self.assertEqual(url, "https://test/REST/api/v1/analysis-definitions")
 
@@ -0,0 +1,175 @@
+"""
+Copyright © 2024 Axioma by SimCorp.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+
+"""
+from axiomapy.axiomaapi import AsyncBulkAPI, AsyncPortfoliosAPI, AsyncAnalysesAPI
+from axiomapy.axiomaapi.asyncapis import async_api
+from axiomapy.axiomaexceptions import AxiomaTypeError
+from axiomapy.session import AsyncSimpleAuthSession, SimpleAuthSession
+from axiomapy import AsyncAxiomaSession, AxiomaSession
+
+import unittest
+from unittest.mock import patch, AsyncMock
+
+from httpx import Response, Request
+import httpx
+
+
+class TestAsyncAPIMocker(unittest.IsolatedAsyncioTestCase):
+    @patch.object(SimpleAuthSession, "_authenticate", return_value=True)
+    async def asyncSetUp(self, mock_SimpleAuthSession):
+        AxiomaSession.use_session(username="u_name", password="pwd",
+                                  domain="https://test")
+        with patch.object(AsyncSimpleAuthSession, "_authenticate",
+                          new=AsyncMock(return_value=True)):
+            await AsyncAxiomaSession.use_session(username="u_name", password="pwd",
+                                                 domain="https://test")
+        self.domain = "https://test"
+
+    async def asyncTearDown(self):
+        await AsyncAxiomaSession.current.aclose()
+
+    def _response(self, method, url, status_code=200, json=None):
+        return Response(status_code, json=json, request=Request(method, url))
+
+    async def test_get_portfolio(self):
+        url = f"{self.domain}/REST/api/v1/portfolios/1234"
+        sync_session = AxiomaSession.current
+        response = self._response("GET", url, json={"id": 1234})
+        with patch.object(httpx.AsyncClient, "send",
+                          new=AsyncMock(return_value=response)) as mock_send:
+            response = await AsyncPortfoliosAPI.get_portfolio(1234)
+
+            request = mock_send.call_args.kwargs["request"]
+            self.assertEqual(str(request.url), url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json(), {"id": 1234})
+        self.assertIs(AxiomaSession.current, sync_session)
+        self.assertIsInstance(AsyncAxiomaSession.current, AsyncSimpleAuthSession)
+
+    async def test_patch_portfolios_payload(self):
+        url = f"{self.domain}/BULK/api/v1/positions/2023-01-13"
+        with patch.object(
+                httpx.AsyncClient, "send",
+                new=AsyncMock(return_value=self._response("PATCH", url)),
+        ) as mock_send:
+            response = await AsyncBulkAPI.patch_portfolios_payload(
+                as_of_date="2023-01-13", payload={"portfolios": []})
+
+            request = mock_send.call_args.kwargs["request"]
+            self.assertEqual(str(request.url), url)
+            self.assertEqual(response.status_code, 200)
+
+    async def test_reauthenticates_on_401(self):
+        url = f"{self.domain}/REST/api/v1/analyses/1/status"
+        responses = [
+            self._response("GET", url, status_code=401),
+            self._response("GET", url, json={"status": "Completed"}),
+        ]
+        with patch.object(httpx.AsyncClient, "send",
+                          new=AsyncMock(side_effect=responses)), \
+                patch.object(AsyncSimpleAuthSession, "_authenticate",
+                             new=AsyncMock(return_value=True)) as mock_auth:
+            running = await AsyncAnalysesAPI.get_analysis_is_running(1)
+
+            mock_auth.assert_awaited_once()
+            self.assertFalse(running)
+
+    async def test_requests_are_routed_without_changing_the_current_session(self):
+        url = f"{self.domain}/REST/api/v1/portfolios/1234"
+        sync_session = AxiomaSession.current
+        current_during_send = []
+
+        async def send(*args, **kwargs):
+            current_during_send.append(AxiomaSession.current)
+            return self._response("GET", url, json={"id": 1234})
+
+        with patch.object(httpx.AsyncClient, "send", new=send):
+            await AsyncPortfoliosAPI.get_portfolio(1234)
+
+        self.assertEqual(current_during_send, [sync_session])
+
+    def test_endpoints_using_the_response_are_rejected(self):
+        class NamesAPI:
+            _session_cls = AxiomaSession
+
+            @classmethod
+            def get_name(cls, portfolio_id: int):
+                response = cls._session_cls.current._get(f"/portfolios/{portfolio_id}")
+                return response.json()["name"]
+
+            @classmethod
+            def get_names(cls, first: int, second: int):
+                cls._session_cls.current._get(f"/portfolios/{first}")
+                return cls._session_cls.current._get(f"/portfolios/{second}")
+
+            @classmethod
+            def get_first(cls):
+                return cls.get_names(1, 2)
+
+            @staticmethod
+            def get_portfolio(portfolio_id: int):
+                return AxiomaSession.current._get(f"/portfolios/{portfolio_id}")
+
+        for name in ("get_name", "get_names", "get_first", "get_portfolio"):
+            with self.subTest(name=name):
+                # the other endpoints are defined as coroutines
+                endpoints = {
+                    other: staticmethod(AsyncMock())
+                    for other in ("get_name", "get_names", "get_first", "get_portfolio")
+                    if other != name
+                }
+                with self.assertRaisesRegex(AxiomaTypeError, name):
+                    async_api(type("AsyncNamesAPI", (NamesAPI,), endpoints))
+
+    async def test_endpoints_defined_as_coroutines_are_accepted(self):
+        class NamesAPI:
+            _session_cls = AxiomaSession
+
+            @classmethod
+            def get_portfolio(cls, portfolio_id: int, return_response: bool = False):
+                url = f"/portfolios/{portfolio_id}"
+                response = cls._session_cls.current._get(
+                    url, return_response=return_response
+                )
+                return response
+
+            @classmethod
+            def get_name(cls, portfolio_id: int):
+                return cls.get_portfolio(portfolio_id).json()["name"]
+
+        @async_api
+        class AsyncNamesAPI(NamesAPI):
+            @classmethod
+            async def get_name(cls, portfolio_id: int):
+                response = await cls.get_portfolio(portfolio_id)
+                return response.json()["name"]
+
+        url = f"{self.domain}/REST/api/v1/portfolios/1"
+        response = self._response("GET", url, json={"name": "P1"})
+        with patch.object(httpx.AsyncClient, "send",
+                          new=AsyncMock(return_value=response)):
+            self.assertEqual(await AsyncNamesAPI.get_name(1), "P1")
+        self.assertIs(NamesAPI._session_cls, AxiomaSession)
+        self.assertIs(AsyncNamesAPI._session_cls, AsyncAxiomaSession)
+
+    async def test_sync_context_manager_is_rejected(self):
+        with self.assertRaises(AxiomaTypeError):
+            with AsyncAxiomaSession.current:
+                pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -108,7 +108,9 @@ class TestBulkAPIMocker(unittest.TestCase):
                 f"{self.domain}/api/{AxiomaSession.current.api_version}/positions/{as_of_date}"
             )
 
-            mock_Request.assert_called_with(method="PATCH", url=url, headers=ANY, json=payload)
+            content = AxiomaSession.current.json_codec.dumps(payload)
+            mock_Request.assert_called_with(method="PATCH", url=url, headers=ANY,
+                                            content=content)
             self.assertEqual(bulk_response.status_code, 200)
             self.assertEqual(url, "https://test/BULK/api/v1/positions/2023-01-13")
 
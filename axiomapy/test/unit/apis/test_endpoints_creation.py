@@ -48,6 +48,15 @@ class TestEndpointMocker(unittest.TestCase):
         self.assertEqual(response[0],
                          'https://qa.axioma.com/rest/api/v1/analyses/risk/portfolios')
 
+    def test_api_type_endpoint(self):
+        session1 = mock_session(domain="https://qa.axioma.com/",
+                                api_type="REST")
+        response = AxiomaSession._prepare_request_args(session1, 'PATCH',
+                                                       '/positions/2023-01-13',
+                                                       api_type="BULK")
+        self.assertEqual(response[0],
+                         'https://qa.axioma.com/BULK/api/v1/positions/2023-01-13')
+
 
 if __name__ == "__main__":
     unittest.main()
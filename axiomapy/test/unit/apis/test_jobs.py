@@ -0,0 +1,334 @@
+"""
+Copyright © 2024 Axioma by SimCorp.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+
+"""
+from axiomapy import AxiomaSession
+from axiomapy.axiomaapi import AnalysisJob, JobPoller, PollingPolicy, Status
+from axiomapy.axiomaapi import utils
+from axiomapy.axiomaapi.jobs import request_id_from_response
+from axiomapy.axiomaexceptions import (
+    AxiomaJobCancelledError,
+    AxiomaJobError,
+    AxiomaJobTimeoutError,
+    AxiomaValueError,
+)
+from axiomapy.test.unit.helpers import ConcurrencyRecorder, use_mock_session
+
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+FAST = PollingPolicy(initial_interval=0.001, max_interval=0.005, jitter=0)
+
+
+class _StatusResponse:
+    def __init__(self, status):
+        self.headers = {"location": "https://test/api/v1/analyses/42"}
+        self._status = status
+
+    def json(self):
+        return {"status": self._status}
+
+
+def _statuses(*statuses):
+    """A status function returning the statuses in turn, then the last one"""
+    calls = []
+
+    def status_fn(request_id):
+        calls.append(request_id)
+        return _StatusResponse(statuses[min(len(calls), len(statuses)) - 1])
+
+    return status_fn, calls
+
+
+class TestPollingPolicy(unittest.TestCase):
+    def test_intervals_back_off(self):
+        policy = PollingPolicy(initial_interval=0.1, multiplier=2, max_interval=1,
+                               jitter=0)
+        intervals = policy.intervals()
+
+        self.assertEqual([next(intervals) for _ in range(6)],
+                         [0.1, 0.2, 0.4, 0.8, 1, 1])
+
+    def test_jitter_and_validation(self):
+        policy = PollingPolicy(initial_interval=1, max_interval=1, jitter=0.2)
+        self.assertTrue(all(0.8 <= policy.interval(5) <= 1.2 for _ in range(50)))
+        with self.assertRaises(AxiomaValueError):
+            PollingPolicy(initial_interval=2, max_interval=1)
+        with self.assertRaises(AxiomaValueError):
+            PollingPolicy(multiplier=0.5)
+
+
+class TestAnalysisJob(unittest.TestCase):
+    def test_wait(self):
+        status_fn, calls = _statuses("Submitted", "running", "COMPLETED")
+        result_fn = Mock(return_value="results")
+        job = AnalysisJob(42, status_fn, result_fn, policy=FAST)
+
+        self.assertEqual(job.result(stream=True), "results")
+
+        self.assertEqual(job.status, Status.Completed)
+        self.assertEqual((len(calls), job.polls), (3, 3))
+        result_fn.assert_called_once_with(42, stream=True)
+        # a finished job is not polled again
+        self.assertEqual(job.wait(), Status.Completed)
+        self.assertEqual(len(calls), 3)
+
+    def test_short_jobs_finish_quickly(self):
+        status_fn, calls = _statuses("Running", "Running", "Completed")
+        job = AnalysisJob.analysis(_StatusResponse("Submitted"),
+                                   api=Mock(get_analyses_status=status_fn))
+
+        start = time.monotonic()
+        job.wait()
+
+        self.assertEqual(job.request_id, 42)
+        self.assertLess(time.monotonic() - start, 1)
+
+    def test_failed_statuses(self):
+        for status in ("Failed", "PostProcessingFailed"):
+            with self.subTest(status=status):
+                job = AnalysisJob(1, _statuses(status)[0], policy=FAST)
+                self.assertEqual(job.wait(), Status(status))
+                with self.assertRaises(AxiomaJobError):
+                    job.result()
+
+    def test_timeout(self):
+        status_fn, calls = _statuses("Running")
+        job = AnalysisJob(1, status_fn, policy=FAST)
+
+        with self.assertRaises(AxiomaJobTimeoutError) as e:
+            job.wait(timeout=0.05)
+
+        self.assertEqual(e.exception.status, Status.Running)
+        self.assertGreater(len(calls), 1)
+
+    def test_cancel_from_another_thread(self):
+        cancel_fn = Mock()
+        job = AnalysisJob(1, _statuses("Running")[0], cancel_fn=cancel_fn,
+                          policy=PollingPolicy(initial_interval=10, max_interval=10))
+        threading.Timer(0.05, job.cancel).start()
+
+        start = time.monotonic()
+        with self.assertRaises(AxiomaJobCancelledError):
+            job.wait()
+
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertTrue(job.cancelled())
+        cancel_fn.assert_called_once_with(1)
+
+    def test_cancel_with_the_session_of_the_job(self):
+        session = use_mock_session(self, Mock())
+        sessions = []
+        job = AnalysisJob(1, _statuses("Running")[0],
+                          cancel_fn=lambda _: sessions.append(AxiomaSession.current))
+
+        thread = threading.Thread(target=job.cancel)
+        thread.start()
+        thread.join()
+
+        self.assertEqual(sessions, [session])
+        self.assertIs(AxiomaSession.current, session)
+
+    def test_async_cancel_without_a_loop(self):
+        cancelled = []
+
+        async def cancel_fn(request_id):
+            cancelled.append(request_id)
+
+        job = AnalysisJob(3, _statuses("Running")[0], cancel_fn=cancel_fn)
+        job.cancel()
+
+        self.assertEqual(cancelled, [3])
+
+    def test_request_id_from_response(self):
+        for location in ("https://test/api/v1/analyses/42",
+                         "https://test/api/v1/analyses/performance/42/status",
+                         "/api/v1/analyses/performance/42/"):
+            with self.subTest(location=location):
+                response = Mock(headers={"location": location})
+                self.assertEqual(request_id_from_response(response), 42)
+        with self.assertRaises(AxiomaValueError):
+            request_id_from_response(Mock(headers={"location": "/analyses/risk"}))
+
+    def test_utils_request_model(self):
+        status_fn, calls = _statuses("Running", "Completed")
+        with patch.object(utils.AnalysesRiskAPI, "post_risk_model_request",
+                          return_value=_StatusResponse("Created")), \
+                patch.object(utils.AnalysesRiskAPI, "get_risk_model_request_status",
+                             side_effect=status_fn):
+            status, response = utils.request_model({}, timelimit=5)
+
+        self.assertEqual(status, "Completed")
+        self.assertEqual(calls, [42, 42])
+
+
+class TestAsyncAnalysisJob(unittest.IsolatedAsyncioTestCase):
+    async def test_await(self):
+        status_fn, calls = _statuses("Running", "Completed")
+
+        async def astatus_fn(request_id):
+            return status_fn(request_id)
+
+        async def aresult_fn(request_id):
+            return "results"
+
+        job = AnalysisJob(7, astatus_fn, aresult_fn, policy=FAST)
+
+        self.assertEqual(await job, Status.Completed)
+        self.assertEqual(await job.result_async(), "results")
+        self.assertEqual(calls, [7, 7])
+
+    async def test_cancel_and_timeout(self):
+        job = AnalysisJob(1, _statuses("Running")[0],
+                          policy=PollingPolicy(initial_interval=10, max_interval=10))
+        asyncio.get_running_loop().call_later(0.05, job.cancel)
+
+        with self.assertRaises(AxiomaJobCancelledError):
+            await asyncio.wait_for(job.wait_async(), 5)
+
+        with self.assertRaises(AxiomaJobTimeoutError):
+            await AnalysisJob(1, _statuses("Running")[0], policy=FAST).wait_async(0.02)
+
+    async def test_async_cancel_from_another_thread(self):
+        cancelled = asyncio.Event()
+
+        async def cancel_fn(request_id):
+            cancelled.set()
+
+        job = AnalysisJob(1, _statuses("Running")[0], cancel_fn=cancel_fn)
+        # the cancel request is sent by the loop the job was created on
+        await asyncio.get_running_loop().run_in_executor(None, job.cancel)
+
+        await asyncio.wait_for(cancelled.wait(), 5)
+        self.assertTrue(job.cancelled())
+
+
+class _Server(ConcurrencyRecorder):
+    """Status functions of jobs that complete after a number of polls, recording the
+    largest number of status requests in flight"""
+
+    def __init__(self, delay=0.002):
+        super().__init__()
+        self.delay = delay
+        self.polls = {}
+
+    def _response(self, request_id, polls_to_complete):
+        with self.lock:
+            self.polls[request_id] = self.polls.get(request_id, 0) + 1
+            done = self.polls[request_id] >= polls_to_complete
+        return _StatusResponse("Completed" if done else "Running")
+
+    def status_fn(self, polls_to_complete):
+        def status(request_id):
+            with self.tracking():
+                time.sleep(self.delay)
+            return self._response(request_id, polls_to_complete)
+        return status
+
+    def astatus_fn(self, polls_to_complete):
+        async def status(request_id):
+            with self.tracking():
+                await asyncio.sleep(self.delay)
+            return self._response(request_id, polls_to_complete)
+        return status
+
+
+class TestJobPoller(unittest.TestCase):
+    def test_many_jobs(self):
+        server = _Server()
+        poller = JobPoller(max_concurrency=8)
+        finished = []
+        for i in range(200):
+            poller.add(AnalysisJob(i, server.status_fn(i % 4 + 1), policy=FAST),
+                       callback=finished.append)
+
+        jobs = list(poller.iter_completed(timeout=30))
+
+        self.assertEqual(sorted(j.request_id for j in jobs), list(range(200)))
+        self.assertEqual(finished, jobs)
+        self.assertTrue(all(j.status == Status.Completed for j in jobs))
+        self.assertLessEqual(server.max_in_flight, 8)
+        self.assertEqual(len(poller), 0)
+
+    def test_priority(self):
+        server = _Server(delay=0)
+        poller = JobPoller(max_concurrency=1)
+        for request_id, priority in ((1, 5), (2, 0), (3, 9), (4, 1)):
+            poller.add(AnalysisJob(request_id, server.status_fn(1)), priority=priority)
+
+        self.assertEqual([j.request_id for j in poller.run()], [2, 4, 1, 3])
+
+    def test_errors_cancellation_and_timeout(self):
+        poller = JobPoller(max_status_errors=2)
+        status_fn = Mock(side_effect=RuntimeError("down"))
+        failing = poller.add(AnalysisJob(1, status_fn, policy=FAST))
+        cancelled = poller.add(AnalysisJob(2, _statuses("Running")[0]))
+        cancelled.cancel()
+
+        self.assertEqual(poller.run(), [cancelled, failing])
+        self.assertIsInstance(failing.error, RuntimeError)
+        self.assertEqual(status_fn.call_count, 2)
+
+        poller.add(AnalysisJob(3, _statuses("Running")[0], policy=FAST))
+        with self.assertRaises(AxiomaJobTimeoutError):
+            poller.run(timeout=0.05)
+        with self.assertRaises(AxiomaValueError):
+            JobPoller(max_concurrency=0)
+        with self.assertRaises(AxiomaValueError):
+            JobPoller(max_status_errors=0)
+
+    def test_status_errors_are_retried(self):
+        status_fn, calls = _statuses("Running", "Running", "Completed")
+        responses = iter([RuntimeError("reset"), None, RuntimeError("reset"),
+                          RuntimeError("reset"), None, None])
+
+        def flaky(request_id):
+            error = next(responses)
+            if error is not None:
+                raise error
+            return status_fn(request_id)
+
+        poller = JobPoller(max_status_errors=3)
+        finished = []
+        job = poller.add(AnalysisJob(1, flaky, policy=FAST), callback=finished.append)
+
+        self.assertEqual(poller.run(timeout=30), [job])
+        self.assertEqual(finished, [job])
+        self.assertEqual(job.status, Status.Completed)
+        self.assertIsNone(job.error)
+        self.assertEqual(len(calls), 3)
+
+
+class TestAsyncJobPoller(unittest.IsolatedAsyncioTestCase):
+    async def test_as_completed(self):
+        server = _Server()
+        poller = JobPoller(max_concurrency=16)
+        poller.add_all(AnalysisJob(i, server.astatus_fn(i % 3 + 1), policy=FAST)
+                       for i in range(500))
+        poller.add(AnalysisJob(500, server.status_fn(2), policy=FAST))
+
+        jobs = [job async for job in poller.as_completed(timeout=30)]
+
+        self.assertEqual(len(jobs), 501)
+        self.assertTrue(all(j.status == Status.Completed for j in jobs))
+        self.assertLessEqual(server.max_in_flight, 16)
+        self.assertGreater(server.max_in_flight, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
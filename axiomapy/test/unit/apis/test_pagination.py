@@ -0,0 +1,195 @@
+"""
+Copyright © 2024 Axioma by SimCorp.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+
+"""
+from axiomapy import AxiomaSession
+from axiomapy.axiomaapi import (
+    AsyncPortfoliosAPI,
+    PortfoliosAPI,
+    apaginate,
+    paginate,
+)
+from axiomapy.axiomaexceptions import AxiomaValueError
+from axiomapy.test.unit.helpers import use_mock_async_session, use_mock_session
+
+import unittest
+
+import httpx
+
+
+class MockPortfolios:
+    """Serves count portfolios with $top/$skip and optionally next links"""
+
+    def __init__(self, count, next_links=False, max_page=None, total_key="total"):
+        self.count = count
+        self.next_links = next_links
+        # the largest page returned whatever $top is
+        self.max_page = max_page
+        self.total_key = total_key
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        top = int(request.url.params.get("$top", self.count))
+        skip = int(request.url.params.get("$skip", 0))
+        end = min(skip + min(top, self.max_page or top), self.count)
+        body = {"items": [{"id": i} for i in range(skip, end)]}
+        if self.total_key is not None:
+            body[self.total_key] = self.count
+        if self.next_links and skip + top < self.count:
+            body["_links"] = {
+                "next": {
+                    "href": f"/REST/api/v1/portfolios?$top={top}&$skip={skip + top}"
+                }
+            }
+        return httpx.Response(200, json=body)
+
+
+class TestPaginate(unittest.TestCase):
+    def test_advances_skip(self):
+        server = MockPortfolios(25)
+        use_mock_session(self, server)
+
+        items = list(paginate(PortfoliosAPI.get_portfolios, page_size=10))
+
+        self.assertEqual([i["id"] for i in items], list(range(25)))
+        self.assertEqual([r.url.params.get("$skip") for r in server.requests],
+                         [None, "10", "20"])
+
+    def test_stops_at_total(self):
+        server = MockPortfolios(20)
+        use_mock_session(self, server)
+
+        items = list(paginate(PortfoliosAPI.get_portfolios, page_size=10,
+                              filter_results="contains(name, 'p')"))
+
+        self.assertEqual(len(items), 20)
+        self.assertEqual(len(server.requests), 2)
+        self.assertEqual(server.requests[1].url.params["$filter"],
+                         "contains(name, 'p')")
+
+    def test_follows_next_links(self):
+        server = MockPortfolios(15, next_links=True)
+        use_mock_session(self, server)
+
+        items = list(paginate(PortfoliosAPI.get_portfolios, page_size=5,
+                              prefetch=False))
+
+        self.assertEqual([i["id"] for i in items], list(range(15)))
+        self.assertEqual(str(server.requests[1].url),
+                         "https://test/REST/api/v1/portfolios?$top=5&$skip=5")
+
+    def test_max_items(self):
+        server = MockPortfolios(100)
+        use_mock_session(self, server)
+
+        items = list(paginate(PortfoliosAPI.get_portfolios, page_size=10, max_items=15))
+
+        self.assertEqual(len(items), 15)
+
+    def test_parallel_pages(self):
+        server = MockPortfolios(95)
+        use_mock_session(self, server)
+
+        items = list(paginate(PortfoliosAPI.get_portfolios, page_size=10,
+                              parallel_pages=4))
+
+        self.assertEqual([i["id"] for i in items], list(range(95)))
+        skips = sorted(int(r.url.params.get("$skip", 0)) for r in server.requests)
+        self.assertEqual(skips, list(range(0, 100, 10)))
+
+    def test_parallel_pages_without_total(self):
+        server = MockPortfolios(35)
+        server_call = server.__call__
+
+        def without_total(request):
+            response = server_call(request)
+            body = response.json()
+            body.pop("total", None)
+            return httpx.Response(response.status_code, json=body)
+
+        use_mock_session(self, without_total)
+
+        items = list(paginate(PortfoliosAPI.get_portfolios, page_size=10,
+                              parallel_pages=3))
+
+        self.assertEqual([i["id"] for i in items], list(range(35)))
+
+    def test_parallel_pages_with_limited_page_size(self):
+        for total_key in ("total", "@odata.count", None):
+            with self.subTest(total_key=total_key):
+                server = MockPortfolios(53, max_page=7, total_key=total_key)
+                use_mock_session(self, server)
+
+                items = list(paginate(PortfoliosAPI.get_portfolios, page_size=10,
+                                      parallel_pages=3))
+
+                self.assertEqual([i["id"] for i in items], list(range(53)))
+                if total_key is not None:
+                    # the pages have the size of the first page
+                    self.assertEqual(len(server.requests), 8)
+
+    def test_parallel_pages_share_the_session(self):
+        server = MockPortfolios(40)
+        session = use_mock_session(self, server)
+
+        items = list(paginate(PortfoliosAPI.get_portfolios, page_size=5,
+                              parallel_pages=4))
+
+        self.assertEqual(len(items), 40)
+        self.assertIs(AxiomaSession.current, session)
+        # the session is not closed by the workers
+        self.assertEqual(len(PortfoliosAPI.get_portfolios(top=5).json()["items"]), 5)
+
+    def test_invalid_arguments(self):
+        use_mock_session(self, MockPortfolios(1))
+        with self.assertRaises(AxiomaValueError):
+            list(paginate(PortfoliosAPI.get_portfolios, page_size=0))
+        with self.assertRaises(AxiomaValueError):
+            list(paginate(PortfoliosAPI.get_portfolios, top=10))
+        with self.assertRaises(AxiomaValueError):
+            list(paginate(PortfoliosAPI.get_portfolios, parallel_pages=0))
+
+
+class TestAsyncPaginate(unittest.IsolatedAsyncioTestCase):
+    async def test_advances_skip(self):
+        server = MockPortfolios(25)
+        await use_mock_async_session(self, server)
+        items = [i async for i in apaginate(AsyncPortfoliosAPI.get_portfolios,
+                                            page_size=10)]
+
+        self.assertEqual([i["id"] for i in items], list(range(25)))
+        self.assertEqual(len(server.requests), 3)
+
+    async def test_parallel_pages(self):
+        server = MockPortfolios(42)
+        await use_mock_async_session(self, server)
+        items = [i async for i in apaginate(AsyncPortfoliosAPI.get_portfolios,
+                                            page_size=5, parallel_pages=3)]
+
+        self.assertEqual([i["id"] for i in items], list(range(42)))
+        self.assertEqual(len(server.requests), 9)
+
+    async def test_parallel_pages_with_limited_page_size(self):
+        server = MockPortfolios(30, max_page=4, total_key=None)
+        await use_mock_async_session(self, server)
+        items = [i async for i in apaginate(AsyncPortfoliosAPI.get_portfolios,
+                                            page_size=10, parallel_pages=3)]
+
+        self.assertEqual([i["id"] for i in items], list(range(30)))
+
+
+if __name__ == "__main__":
+    unittest.main()
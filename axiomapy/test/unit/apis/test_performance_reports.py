@@ -0,0 +1,113 @@
+"""
+Copyright © 2024 Axioma by SimCorp.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+
+"""
+from axiomapy.axiomaapi import AnalysesPerformanceAPI, AsyncAnalysesPerformanceAPI
+from axiomapy.axiomaapi.analyses import PERFORMANCE_REPORTS
+from axiomapy.axiomaexceptions import AxiomaRequestStatusError, AxiomaValueError
+from axiomapy.test.unit.helpers import (
+    MockServer,
+    use_mock_async_session,
+    use_mock_session,
+)
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import httpx
+
+
+class _Server(MockServer):
+    """Serves the reports of a performance attribution, each report takes delay
+    seconds and the largest number of reports requested at a time is recorded"""
+
+    def __init__(self, delay=0.02, failing=None):
+        super().__init__(delay)
+        self.failing = failing
+
+    def respond(self, request):
+        report = request.url.path.split("/")[-1]
+        if report == self.failing:
+            return httpx.Response(500, json={"message": "failed"})
+        if request.headers.get("Accept") == "text/csv":
+            return httpx.Response(200, content=f"report\n{report}\n".encode(),
+                                  headers={"Content-Type": "text/csv"})
+        return httpx.Response(200, json={"report": report})
+
+
+class TestFetchAllResults(unittest.TestCase):
+    def test_reports_are_fetched_concurrently(self):
+        server = _Server(delay=0.1)
+        use_mock_session(self, server)
+
+        results = AnalysesPerformanceAPI.fetch_all_results(12)
+
+        self.assertEqual(list(results), list(PERFORMANCE_REPORTS))
+        self.assertEqual(results["summary"].json()["report"], "summary")
+        self.assertEqual(results["warnings-and-errors"].json()["report"],
+                         "warnings-and-errors")
+        self.assertEqual(server.max_in_flight, len(PERFORMANCE_REPORTS))
+        # the workers share the session without closing it
+        self.assertEqual(AnalysesPerformanceAPI.get_results_summary(12).json(),
+                         {"report": "summary"})
+
+    def test_stream_to_directory(self):
+        server = _Server()
+        use_mock_session(self, server)
+        with tempfile.TemporaryDirectory() as tmp:
+            results = AnalysesPerformanceAPI.fetch_all_results(
+                12, reports=["asset-returns", "summary-time-series"],
+                directory=Path(tmp) / "reports", as_csv=True, max_concurrency=1)
+
+            self.assertEqual(results["asset-returns"].read_text(),
+                             "report\nasset-returns\n")
+            # the summary time series is only available as json
+            self.assertEqual(results["summary-time-series"].name,
+                             "12_summary-time-series.json")
+            self.assertEqual(json.loads(results["summary-time-series"].read_bytes()),
+                             {"report": "summary-time-series"})
+        self.assertEqual(server.max_in_flight, 1)
+
+    def test_errors(self):
+        use_mock_session(self, _Server(failing="factor-attribution"))
+
+        with self.assertRaises(AxiomaRequestStatusError):
+            AnalysesPerformanceAPI.fetch_all_results(12)
+        with self.assertRaises(AxiomaValueError):
+            AnalysesPerformanceAPI.fetch_all_results(12, reports=["unknown"])
+
+
+class TestAsyncFetchAllResults(unittest.IsolatedAsyncioTestCase):
+    async def test_fetch_all_results(self):
+        server = _Server(delay=0.1)
+        await use_mock_async_session(self, server.handle_async)
+        with tempfile.TemporaryDirectory() as tmp:
+            responses = await AsyncAnalysesPerformanceAPI.fetch_all_results(
+                12, reports=["summary", "brinson-attribution"])
+            paths = await AsyncAnalysesPerformanceAPI.fetch_all_results(
+                12, directory=tmp)
+
+            self.assertEqual(responses["brinson-attribution"].json()["report"],
+                             "brinson-attribution")
+            self.assertEqual(len(paths), len(PERFORMANCE_REPORTS))
+            self.assertEqual(json.loads(paths["summary"].read_bytes()),
+                             {"report": "summary"})
+        self.assertEqual(server.max_in_flight, len(PERFORMANCE_REPORTS))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,339 @@
+"""
+Copyright © 2024 Axioma by SimCorp.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+
+"""
+from axiomapy.axiomaapi import (
+    AnalysisJob,
+    DirectorySink,
+    PerformanceAttributionPipeline,
+    PollingPolicy,
+    RiskAnalysisPipeline,
+    Status,
+    run_risk_analyses,
+)
+from axiomapy.axiomaapi.pipelines import (
+    _Attribution,
+    _AttributionRun,
+    missing_precomputed_dates,
+)
+from axiomapy.axiomaexceptions import (
+    AxiomaJobError,
+    AxiomaJobTimeoutError,
+    AxiomaRequestStatusError,
+)
+from axiomapy.test.unit.helpers import (
+    MockServer,
+    use_mock_async_session,
+    use_mock_session,
+)
+
+import json
+import re
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+
+FAST = PollingPolicy(initial_interval=0.001, max_interval=0.005, jitter=0)
+# the analysis of portfolio 3 cannot be submitted and the analysis of 5 fails
+INVALID, FAILING = 3, 5
+
+
+class _Server(MockServer):
+    """Serves the analyses of the portfolios, the analysis of a portfolio has the
+    request id portfolio_id + 1000 and completes on its second status request. The
+    submissions take delay seconds and the status requests of the analyses in
+    status_errors fail the number of times given."""
+
+    def __init__(self, delay=0.005, status_errors=None, running=()):
+        super().__init__(delay)
+        self.polls = {}
+        self.status_errors = dict(status_errors or {})
+        # the analyses that never finish
+        self.running = set(running)
+
+    def tracked(self, request):
+        return request.method == "POST"
+
+    def respond(self, request):
+        path = request.url.path
+        match = re.search(r"/analyses/risk/portfolios/(\d+)$", path)
+        if request.method == "POST" and match:
+            return self._submit(int(match.group(1)))
+        request_id = int(re.search(r"/analyses/(\d+)", path).group(1))
+        if path.endswith("/status"):
+            return self._status(request_id)
+        if request.headers.get("Accept") == "text/csv":
+            return httpx.Response(200, content=f"request\n{request_id}\n".encode(),
+                                  headers={"Content-Type": "text/csv"})
+        return httpx.Response(200, json={"request": request_id})
+
+    def _status(self, request_id):
+        with self.lock:
+            if self.status_errors.get(request_id, 0) > 0:
+                self.status_errors[request_id] -= 1
+                return httpx.Response(503, json={"message": "unavailable"})
+            self.polls[request_id] = self.polls.get(request_id, 0) + 1
+            polls = self.polls[request_id]
+        status = "Running" if polls < 2 or request_id in self.running else "Completed"
+        if request_id == FAILING + 1000 and polls >= 2:
+            status = "Failed"
+        return httpx.Response(200, json={"status": status})
+
+    def _submit(self, portfolio_id):
+        if portfolio_id == INVALID:
+            return httpx.Response(400, json={"message": "invalid portfolio"})
+        location = f"https://test/api/v1/analyses/{portfolio_id + 1000}"
+        return httpx.Response(202, headers={"location": location})
+
+
+def _work_items(count):
+    return ((portfolio_id, {"name": f"P{portfolio_id}"})
+            for portfolio_id in range(1, count + 1))
+
+
+class TestRiskAnalysisPipeline(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.dir = Path(self.tmp.name)
+        self.server = _Server()
+        use_mock_session(self, self.server)
+
+    def test_run(self):
+        pipeline = RiskAnalysisPipeline(DirectorySink(self.dir), max_submissions=3,
+                                        max_polls=4, policy=FAST, timeout=30)
+
+        results = {r.portfolio_id: r for r in pipeline.run(_work_items(30))}
+
+        self.assertEqual(sorted(results), list(range(1, 31)))
+        self.assertLessEqual(self.server.max_in_flight, 3)
+        self.assertGreater(self.server.max_in_flight, 1)
+        self.assertIsNone(results[INVALID].request_id)
+        self.assertIsNotNone(results[INVALID].error)
+        self.assertIsInstance(results[FAILING].error, AxiomaJobError)
+        self.assertEqual(results[FAILING].status, Status.Failed)
+        result = results[1]
+        self.assertEqual((result.request_id, result.status, result.error),
+                         (1001, Status.Completed, None))
+        self.assertEqual(result.output, self.dir / "1_1001.json")
+        self.assertEqual(json.loads(result.output.read_bytes()), {"request": 1001})
+        self.assertEqual(len(list(self.dir.iterdir())), 28)
+
+    def test_run_risk_analyses_as_csv(self):
+        results = run_risk_analyses(_work_items(2), self.dir, as_csv=True, policy=FAST)
+
+        self.assertEqual(sorted(r.output.name for r in results),
+                         ["1_1001.csv", "2_1002.csv"])
+        self.assertEqual((self.dir / "2_1002.csv").read_text(), "request\n1002\n")
+
+    def test_stop_early(self):
+        pipeline = RiskAnalysisPipeline(DirectorySink(self.dir), max_submissions=2,
+                                        policy=FAST)
+        submitted = []
+
+        def work_items():
+            for item in _work_items(1000):
+                submitted.append(item)
+                yield item
+
+        results = pipeline.run(work_items())
+        first = next(results)
+        results.close()
+
+        self.assertIn(first.portfolio_id, [p for p, _ in submitted])
+        self.assertLess(len(submitted), 1000)
+
+    def test_timeout(self):
+        self.server.running.add(1002)
+        pipeline = RiskAnalysisPipeline(DirectorySink(self.dir), policy=FAST,
+                                        timeout=0.2)
+        results = []
+
+        with self.assertRaises(AxiomaJobTimeoutError):
+            for result in pipeline.run(_work_items(4)):
+                results.append(result)
+
+        # the other analyses finish before the timeout
+        self.assertEqual(sorted(r.portfolio_id for r in results), [1, 3, 4])
+        self.assertGreater(self.server.polls[1002], 2)
+
+    def test_status_errors(self):
+        # the status of 1001 fails once, the status of 1002 keeps failing
+        self.server.status_errors.update({1001: 1, 1002: 100})
+        pipeline = RiskAnalysisPipeline(DirectorySink(self.dir), policy=FAST,
+                                        timeout=30)
+
+        results = {r.portfolio_id: r for r in pipeline.run(_work_items(2))}
+
+        self.assertEqual((results[1].status, results[1].error),
+                         (Status.Completed, None))
+        self.assertEqual(results[1].output, self.dir / "1_1001.json")
+        self.assertIsNone(results[2].output)
+        self.assertIsInstance(results[2].error, AxiomaRequestStatusError)
+        # the job is given up after the default max_status_errors
+        self.assertEqual(self.server.status_errors[1002], 97)
+
+
+class TestAsyncRiskAnalysisPipeline(unittest.IsolatedAsyncioTestCase):
+    async def test_arun(self):
+        server = _Server(delay=0)
+        await use_mock_async_session(self, server)
+        with tempfile.TemporaryDirectory() as tmp:
+            pipeline = RiskAnalysisPipeline(DirectorySink(tmp), policy=FAST,
+                                            timeout=30)
+            results = [r async for r in pipeline.arun(_work_items(20))]
+
+            self.assertEqual(sorted(r.portfolio_id for r in results),
+                             list(range(1, 21)))
+            self.assertEqual(sum(r.error is None for r in results), 18)
+            self.assertEqual(json.loads((Path(tmp) / "7_1007.json").read_bytes()),
+                             {"request": 1007})
+
+    async def test_stop_early(self):
+        # only the analysis of portfolio 1 finishes
+        server = _Server(delay=0, running=range(1002, 1100))
+        await use_mock_async_session(self, server)
+        jobs = []
+        analysis = AnalysisJob.analysis
+
+        def create_job(*args, **kwargs):
+            jobs.append(analysis(*args, **kwargs))
+            return jobs[-1]
+
+        with tempfile.TemporaryDirectory() as tmp, \
+                patch.object(AnalysisJob, "analysis", side_effect=create_job):
+            pipeline = RiskAnalysisPipeline(DirectorySink(tmp), policy=FAST)
+            results = pipeline.arun(_work_items(50))
+            await results.__anext__()
+            await results.aclose()
+
+        self.assertTrue(jobs)
+        self.assertTrue(all(job.done() or job.cancelled() for job in jobs))
+
+
+class _PerformanceServer(MockServer):
+    """Serves performance attributions, the dates of portfolio 1 take many polls to
+    precompute, portfolio 2 has no missing dates and a precompute job of portfolio 3
+    fails. The largest number of precompute jobs running at a time is recorded as
+    max_in_flight."""
+
+    MISSING = {1: ["2021-03-29", "2021-03-30", "2021-03-31"], 2: [],
+               3: ["2021-03-30", "2021-03-31"]}
+
+    def __init__(self):
+        super().__init__()
+        self.jobs = {}
+        self.polls = {}
+        self.precomputed = []
+
+    def tracked(self, request):
+        return False
+
+    def respond(self, request):
+        path = request.url.path
+        portfolio = re.search(r"/portfolios/(\d+)", path)
+        if path.endswith("/missing-precomputed-analytics"):
+            dates = self.MISSING[int(portfolio.group(1))]
+            return httpx.Response(200, json={"items": [{"asOfDate": d} for d in dates]})
+        if path.endswith("/precompute-analytics"):
+            body = json.loads(request.content)
+            return self._create(int(portfolio.group(1)), body["asOfDate"])
+        if portfolio is not None:
+            return self._create(int(portfolio.group(1)), None)
+        request_id = int(re.search(r"/performance/(\d+)/status", path).group(1))
+        return httpx.Response(200, json={"status": self._status(request_id)})
+
+    def _create(self, portfolio_id, date):
+        with self.lock:
+            request_id = len(self.jobs) + 1
+            self.jobs[request_id] = (portfolio_id, date)
+            if date is not None:
+                self.precomputed.append((portfolio_id, date))
+        if date is not None:
+            self.enter()
+        location = f"https://test/api/v1/analyses/performance/{request_id}/status"
+        return httpx.Response(202, headers={"location": location})
+
+    def _status(self, request_id):
+        portfolio_id, date = self.jobs[request_id]
+        with self.lock:
+            polls = self.polls[request_id] = self.polls.get(request_id, 0) + 1
+        if polls < (20 if portfolio_id == 1 and date else 2):
+            return "Running"
+        if date is not None and polls == (20 if portfolio_id == 1 else 2):
+            self.exit()
+        if (portfolio_id, date) == (3, "2021-03-31"):
+            return "Failed"
+        return "Completed"
+
+
+class TestPerformanceAttributionPipeline(unittest.TestCase):
+    def setUp(self):
+        self.server = _PerformanceServer()
+        use_mock_session(self, self.server)
+
+    def test_run(self):
+        pipeline = PerformanceAttributionPipeline(max_precomputes=2, policy=FAST,
+                                                  timeout=30)
+        parameters = {"startDate": "2021-03-29", "endDate": "2021-03-31",
+                      "performanceAttributionSettingsId": 2136463}
+
+        results = list(pipeline.run((p, parameters) for p in (1, 2, 3)))
+
+        # the attribution of 2 does not wait for the precompute jobs of 1
+        self.assertEqual(results[0].portfolio_id, 2)
+        results = {r.portfolio_id: r for r in results}
+        self.assertEqual(results[1].status, Status.Completed)
+        self.assertIsNone(results[1].error)
+        self.assertEqual(len(results[1].precompute_request_ids), 3)
+        self.assertEqual(self.server.jobs[results[1].request_id], (1, None))
+        self.assertIsNone(results[3].request_id)
+        self.assertIsInstance(results[3].error, AxiomaJobError)
+        missing = _PerformanceServer.MISSING
+        self.assertEqual(sorted(self.server.precomputed),
+                         sorted((p, d) for p, dates in missing.items() for d in dates))
+        self.assertLessEqual(self.server.max_in_flight, 2)
+
+    def test_step_done(self):
+        run = _AttributionRun(PerformanceAttributionPipeline(policy=FAST))
+        self.addCleanup(run.attributions.shutdown)
+        state = _Attribution(1, {})
+        state.remaining = 2
+        error = AxiomaJobError("failed", 1001, Status.Failed)
+
+        run.step_done(state, error)
+        self.assertTrue(run.queue.empty())
+        run.step_done(state)
+
+        # the attribution is reported without being submitted
+        result = run.queue.get_nowait()
+        self.assertEqual((result.portfolio_id, result.request_id, result.error),
+                         (1, None, error))
+        self.assertEqual(self.server.jobs, {})
+
+    def test_missing_precomputed_dates(self):
+        self.assertEqual(missing_precomputed_dates(["2021-03-31"]), ["2021-03-31"])
+        self.assertEqual(missing_precomputed_dates({"dates": ["2021-03-31"]}),
+                         ["2021-03-31"])
+        self.assertEqual(missing_precomputed_dates({"items": [{"date": "2021-03-31"}]}),
+                         ["2021-03-31"])
+        self.assertEqual(missing_precomputed_dates(None), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
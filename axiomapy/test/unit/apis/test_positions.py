@@ -0,0 +1,174 @@
+"""
+Copyright © 2024 Axioma by SimCorp.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+
+"""
+from axiomapy.axiomaapi import PortfoliosAPI, PositionColumns, QuantityType
+from axiomapy.axiomaexceptions import AxiomaValueError
+
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+POSITIONS = [
+    {
+        "clientId": "514431",
+        "identifiers": [{"type": "ISIN", "value": "US5949181045"},
+                        {"type": "Ticker", "value": "MSFT UN EQUITY"}],
+        "quantity": {"value": 100.0, "scale": "MarketValue"},
+        "instrumentMapping": "Default",
+        "attributes": {"Sector": "IT", "Weight": 0.25},
+    },
+    {
+        "clientId": "514453",
+        "identifiers": [{"type": "ISIN", "value": "US0378331005"}],
+        "quantity": {"value": 50.0, "scale": "MarketValue"},
+        "instrumentMapping": "Default",
+        "attributes": {"Sector": "IT"},
+    },
+    {
+        "clientId": "CASH",
+        "quantity": {"value": 10.0, "scale": "NumberOfInstruments"},
+        "attributes": {"Sector": "Cash", "Weight": 0.1},
+    },
+]
+
+
+class TestPositionColumns(unittest.TestCase):
+    def setUp(self):
+        self.positions = PositionColumns.from_positions(POSITIONS)
+
+    def test_round_trip(self):
+        self.assertEqual(len(self.positions), 3)
+        self.assertEqual(self.positions.to_dict(), POSITIONS)
+        self.assertEqual(self.positions[-1], POSITIONS[2])
+        with self.assertRaises(IndexError):
+            self.positions[3]
+
+    def test_columns(self):
+        np.testing.assert_array_equal(self.positions.quantities, [100.0, 50.0, 10.0])
+        self.assertEqual(self.positions.scales.tolist(), [
+            QuantityType.MarketValue, QuantityType.MarketValue,
+            QuantityType.NumberOfInstruments])
+        self.assertEqual(self.positions.identifiers("Ticker").tolist(),
+                         ["MSFT UN EQUITY", "", ""])
+        self.assertEqual(self.positions.attribute("Sector").tolist(),
+                         ["IT", "IT", "Cash"])
+        self.assertTrue(np.isnan(self.positions.attribute("Weight")[1]))
+        self.assertEqual(self.positions._scales.categories,
+                         (QuantityType.MarketValue, QuantityType.NumberOfInstruments))
+
+    def test_constructor(self):
+        positions = PositionColumns(["A", "B"], [1, None], scales="marketvalue",
+                                    identifiers={"ISIN": ["X", None]})
+
+        self.assertEqual(positions.to_dict(), [
+            {"clientId": "A", "identifiers": [{"type": "ISIN", "value": "X"}],
+             "quantity": {"value": 1, "scale": "MarketValue"}},
+            {"clientId": "B", "quantity": {"scale": "MarketValue"}},
+        ])
+        with self.assertRaises(AxiomaValueError):
+            PositionColumns(["A", "B"], [1.0])
+
+    def test_integers_round_trip(self):
+        positions = [
+            {"clientId": "A", "quantity": {"value": 3, "scale": "NumberOfInstruments"},
+             "attributes": {"Lot": 10, "Weight": 0.5}},
+            {"clientId": "B", "quantity": {"value": 4, "scale": "NumberOfInstruments"},
+             "attributes": {"Weight": 1}},
+        ]
+
+        columns = PositionColumns.from_positions(positions)
+        payload = columns.to_dict()
+
+        self.assertEqual(payload, positions)
+        self.assertIs(type(payload[0]["quantity"]["value"]), int)
+        self.assertIs(type(payload[0]["attributes"]["Lot"]), int)
+        self.assertIs(type(payload[1]["attributes"]["Weight"]), float)
+        self.assertIs(type(columns[1:][0]["quantity"]["value"]), int)
+        self.assertEqual(columns.clone().to_dict(), positions)
+        self.assertEqual(columns.sum(), 7.0)
+
+    def test_missing_client_ids(self):
+        positions = [
+            {"quantity": {"value": 1.0, "scale": "MarketValue"}},
+            {"clientId": "A", "quantity": {"value": 2.0, "scale": "MarketValue"}},
+            {"quantity": {"value": 3.0, "scale": "MarketValue"}},
+        ]
+
+        columns = PositionColumns.from_positions(positions)
+
+        self.assertEqual(columns.to_dict(), positions)
+        self.assertEqual(columns.client_ids.tolist(), ["", "A", ""])
+        upsert, remove = columns.diff(columns.clone())
+        # positions without a client id cannot be matched or removed
+        self.assertEqual([p["quantity"]["value"] for p in upsert], [1.0, 3.0])
+        self.assertEqual(len(remove), 0)
+        upsert, remove = PositionColumns(["B"], [1.0]).diff(columns)
+        self.assertEqual(remove.to_dict(), [positions[1]])
+
+    def test_filter_and_sum(self):
+        it = self.positions.filter(attributes={"Sector": "IT"})
+        self.assertEqual(it.client_ids.tolist(), ["514431", "514453"])
+
+        large = self.positions.filter(self.positions.quantities > 20,
+                                      scale=QuantityType.MarketValue)
+        self.assertEqual(len(large), 2)
+        self.assertEqual(len(self.positions.filter(attributes={"Sector": "None"})), 0)
+        heavy = self.positions.attribute("Weight") > 0.2
+        self.assertEqual(len(self.positions[heavy]), 1)
+
+        self.assertEqual(self.positions.sum(), 160.0)
+        self.assertEqual(self.positions.sum(by="Sector"), {"IT": 150.0, "Cash": 10.0})
+        self.assertEqual(self.positions.sum(by="scale"), {
+            QuantityType.MarketValue: 150.0, QuantityType.NumberOfInstruments: 10.0})
+        with self.assertRaises(AxiomaValueError):
+            self.positions.sum(by="Weight")
+
+    def test_diff(self):
+        current = [dict(p) for p in POSITIONS[:2]]
+        current[0] = dict(current[0], attributes={"Sector": "Tech", "Weight": 0.25})
+        current.append({"clientId": "NEW", "quantity": {"value": 1.0}})
+
+        upsert, remove = PositionColumns.from_positions(current).diff(self.positions)
+
+        self.assertEqual(upsert.client_ids.tolist(), ["514431", "NEW"])
+        self.assertEqual(remove.to_dict(), [POSITIONS[2]])
+
+        upsert, remove = self.positions.diff(self.positions.clone())
+        self.assertEqual((len(upsert), len(remove)), (0, 0))
+        upsert, remove = self.positions.diff(PositionColumns())
+        self.assertEqual((len(upsert), len(remove)), (3, 0))
+
+    def test_memory(self):
+        count = 10000
+        positions = PositionColumns.from_positions(
+            dict(POSITIONS[0], clientId=str(i)) for i in range(count)
+        )
+
+        # 148 bytes: the identifiers are fixed width unicode, the rest 4 or 8 bytes
+        self.assertLessEqual(positions.nbytes / count, 150)
+
+    def test_patch_positions_sends_payload(self):
+        with patch.object(PortfoliosAPI, "_session_cls") as mock_session:
+            PortfoliosAPI.patch_positions(1, "2023-01-13",
+                                          positions_upsert=self.positions)
+
+        payload = mock_session.current._patch.call_args.args[1]
+        self.assertEqual(payload, {"upsert": POSITIONS, "remove": []})
+
+
+if __name__ == "__main__":
+    unittest.main()
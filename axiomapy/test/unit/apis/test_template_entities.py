@@ -0,0 +1,122 @@
+"""
+Copyright © 2024 Axioma by SimCorp.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+
+"""
+from axiomapy.axiomaapi import get_template_entity_class, template_entity_class
+from axiomapy.axiomaexceptions import AxiomaValueError
+from axiomapy.entitybase import TemplatedEntityBase
+from axiomapy.test.unit.helpers import use_mock_session
+
+import json
+import unittest
+from typing import Optional, get_type_hints
+
+import httpx
+
+SCHEMA = {
+    "title": "Bond",
+    "type": "object",
+    "properties": {
+        "name": {"type": "string"},
+        "templateName": {"type": "string"},
+        "content": {
+            "type": "object",
+            "properties": {
+                "Coupon Rate": {"type": "number"},
+                "Maturity Date": {"type": ["string", "null"], "format": "date"},
+                "class": {"type": "string"},
+            },
+        },
+    },
+}
+
+BOND = {
+    "name": "B1",
+    "templateName": "Bond",
+    "content": {"Coupon Rate": 2.5, "Maturity Date": "2030-01-01", "class": "Govt"},
+}
+
+
+class TestTemplateEntityClass(unittest.TestCase):
+    def setUp(self):
+        self.Bond = template_entity_class(SCHEMA)
+
+    def test_class(self):
+        self.assertTrue(issubclass(self.Bond, TemplatedEntityBase))
+        self.assertEqual(self.Bond.__name__, "Bond")
+        self.assertEqual(self.Bond._TEMPLATE_MAPPING, [
+            ("Coupon Rate", "coupon_rate"),
+            ("Maturity Date", "maturity_date"),
+            ("class", "class_"),
+        ])
+        self.assertEqual(get_type_hints(self.Bond.coupon_rate.fget)["return"],
+                         Optional[float])
+
+    def test_round_trip(self):
+        bond = self.Bond.from_dict(BOND)
+
+        self.assertFalse(hasattr(bond, "__dict__"))
+        self.assertEqual(bond.coupon_rate, 2.5)
+        self.assertEqual(bond["Maturity Date"], "2030-01-01")
+        self.assertEqual(bond.to_dict(), BOND)
+        self.assertEqual(bond.clone().to_dict(), BOND)
+        self.assertIn("_coupon_rate", bond)
+
+        bond.couponRate = 3.0
+        self.assertEqual(bond.coupon_rate, 3.0)
+        with self.assertRaises(AttributeError):
+            bond.unknown = 1
+        with self.assertRaises(ValueError):
+            self.Bond.from_dict(dict(BOND, templateName="Equity"))
+
+    def test_schema_without_content(self):
+        Swap = template_entity_class(
+            {"properties": {"Fixed Rate": {"type": "number"}, "1Y Tenor": {}}},
+            template_name="Interest Rate Swap",
+        )
+
+        self.assertEqual(Swap.__name__, "InterestRateSwap")
+        self.assertEqual(Swap(fixed_rate=1.5).to_dict(), {
+            "templateName": "Interest Rate Swap", "content": {"Fixed Rate": 1.5}})
+        self.assertEqual(Swap._TEMPLATE_MAPPING[1], ("1Y Tenor", "p_1_y_tenor"))
+        with self.assertRaises(AxiomaValueError):
+            template_entity_class({"properties": {}})
+
+    def test_get_template_entity_class(self):
+        requests = []
+
+        def server(request):
+            requests.append(request.url.path)
+            content_type = ("application/schema+json" if "Swap" in request.url.path
+                            else "application/json")
+            return httpx.Response(200, content=json.dumps(SCHEMA).encode(),
+                                  headers={"Content-Type": content_type})
+
+        use_mock_session(self, server)
+
+        cls = get_template_entity_class("Bond", refresh=True)
+
+        self.assertIs(get_template_entity_class("Bond"), cls)
+        self.assertEqual(len(requests), 1)
+        self.assertTrue(requests[0].endswith("/metadata/templates/Bond/schema"))
+        self.assertEqual([name for name, _ in cls._TEMPLATE_MAPPING],
+                         ["Coupon Rate", "Maturity Date", "class"])
+        self.assertEqual(cls.from_dict(BOND).to_dict(), BOND)
+        swap = get_template_entity_class("Swap", refresh=True)
+        self.assertEqual(len(swap._TEMPLATE_MAPPING), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+"""
+Copyright © 2024 Axioma by SimCorp.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+
+Mock servers and sessions shared by the unit tests
+"""
+from axiomapy import AsyncAxiomaSession, AxiomaSession
+
+import asyncio
+import contextlib
+import threading
+import time
+import unittest
+from typing import Callable
+
+import httpx
+
+TOKEN_PATH = "/connect/token"
+
+
+def is_token_request(request: httpx.Request) -> bool:
+    return request.url.path.endswith(TOKEN_PATH)
+
+
+def token_response() -> httpx.Response:
+    return httpx.Response(200, json={"access_token": "token"})
+
+
+def serving_token(handler: Callable) -> Callable:
+    """Wraps a MockTransport handler to answer the token requests of the session,
+    the handler may be a coroutine function for the async session"""
+
+    def transport(request: httpx.Request):
+        if is_token_request(request):
+            return token_response()
+        return handler(request)
+
+    return transport
+
+
+def use_mock_session(
+    test: unittest.TestCase, handler: Callable, token: bool = True, **kwargs
+) -> AxiomaSession:
+    """Makes a session sending its requests to handler (a MockTransport handler) the
+    current session, it is closed when the test finishes
+
+    Args:
+        test (unittest.TestCase): the test
+        handler (Callable): the handler of the requests
+        token (bool): answer the token requests, otherwise they go to handler
+        kwargs: the other arguments of AxiomaSession.use_session
+
+    Returns:
+        AxiomaSession: the session
+    """
+    AxiomaSession.use_session(
+        username="u_name",
+        password="pwd",
+        domain="https://test",
+        event_hooks={},
+        transport=httpx.MockTransport(serving_token(handler) if token else handler),
+        **kwargs,
+    )
+    session = AxiomaSession.current
+    test.addCleanup(session.close)
+    return session
+
+
+async def use_mock_async_session(
+    test: unittest.IsolatedAsyncioTestCase,
+    handler: Callable,
+    token: bool = True,
+    **kwargs,
+) -> AsyncAxiomaSession:
+    """Async version of use_mock_session, handler may be a coroutine function"""
+    await AsyncAxiomaSession.use_session(
+        username="u_name",
+        password="pwd",
+        domain="https://test",
+        event_hooks={},
+        transport=httpx.MockTransport(serving_token(handler) if token else handler),
+        **kwargs,
+    )
+    session = AsyncAxiomaSession.current
+    test.addAsyncCleanup(session.aclose)
+    return session
+
+
+class ConcurrencyRecorder:
+    """Records the largest number of calls in flight at the same time, from threads
+    or tasks"""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def enter(self):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def exit(self):
+        with self.lock:
+            self.in_flight -= 1
+
+    @contextlib.contextmanager
+    def tracking(self):
+        self.enter()
+        try:
+            yield
+        finally:
+            self.exit()
+
+
+class MockServer(ConcurrencyRecorder):
+    """A MockTransport handler recording the requests and the largest number of
+    requests in flight. The requests for which tracked is True take delay seconds,
+    subclasses respond in respond.
+
+    Use the instance as the handler of a sync session and handle_async as the
+    handler of an async session.
+
+    Args:
+        delay (float): seconds taken by the tracked requests
+    """
+
+    def __init__(self, delay: float = 0.0):
+        super().__init__()
+        self.delay = delay
+        self.requests = []
+
+    def tracked(self, request: httpx.Request) -> bool:
+        return True
+
+    def respond(self, request: httpx.Request) -> httpx.Response:
+        raise NotImplementedError
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if is_token_request(request):
+            return token_response()
+        self.requests.append(request)
+        if self.tracked(request):
+            with self.tracking():
+                time.sleep(self.delay)
+        return self.respond(request)
+
+    async def handle_async(self, request: httpx.Request) -> httpx.Response:
+        if is_token_request(request):
+            return token_response()
+        self.requests.append(request)
+        if self.tracked(request):
+            with self.tracking():
+                await asyncio.sleep(self.delay)
+        return self.respond(request)
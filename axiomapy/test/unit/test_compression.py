@@ -0,0 +1,137 @@
+"""
+Copyright © 2024 Axioma by SimCorp.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+
+"""
+from axiomapy import AxiomaSession, CompressionPolicy
+from axiomapy.axiomaapi import BulkAPI, PortfoliosAPI
+from axiomapy.axiomaexceptions import AxiomaValueError
+from axiomapy.compression import accept_encoding_header, supported_content_encodings
+from axiomapy.test.unit.helpers import use_mock_session
+
+import gzip
+import json
+import sys
+import unittest
+from unittest.mock import patch
+
+import httpx
+
+PAYLOAD = {"portfolios": [{"name": f"P{i}", "upsert": [{"clientId": "IBM"}]}
+                          for i in range(2000)]}
+
+
+class TestCompressionPolicy(unittest.TestCase):
+    def test_gzip(self):
+        policy = CompressionPolicy(min_size=10)
+        body = json.dumps(PAYLOAD).encode()
+
+        compressed, encoding = policy.compress(body)
+
+        self.assertEqual(encoding, "gzip")
+        self.assertEqual(gzip.decompress(compressed), body)
+        self.assertLess(len(compressed) * 5, len(body))
+        self.assertTrue(policy.should_compress("patch", body))
+        self.assertFalse(policy.should_compress("GET", body))
+        self.assertFalse(policy.should_compress("POST", b"{}"))
+
+    def test_invalid(self):
+        with self.assertRaises(AxiomaValueError):
+            CompressionPolicy("br")
+        with self.assertRaises(AxiomaValueError):
+            CompressionPolicy(min_size=-1)
+        with patch.dict(sys.modules, {"zstandard": None}):
+            with self.assertRaises(ImportError):
+                CompressionPolicy("zstd")
+
+
+class TestSessionCompression(unittest.TestCase):
+    def setUp(self):
+        self.requests = []
+
+        def server(request):
+            self.requests.append(request)
+            return httpx.Response(200, json={})
+
+        use_mock_session(self, server, compression=CompressionPolicy(min_size=1024))
+
+    def test_large_bodies_are_compressed(self):
+        BulkAPI.patch_portfolios_payload(as_of_date="2023-01-13", payload=PAYLOAD)
+        PortfoliosAPI.post_portfolio({"name": "P"})
+
+        large, small = self.requests
+        self.assertEqual(large.headers["Content-Encoding"], "gzip")
+        self.assertEqual(json.loads(gzip.decompress(large.content)), PAYLOAD)
+        self.assertNotIn("Content-Encoding", small.headers)
+        self.assertEqual(json.loads(small.content), {"name": "P"})
+
+    def test_compressed_payloads_are_sent_unchanged(self):
+        payload = gzip.compress(json.dumps(PAYLOAD).encode())
+
+        BulkAPI.patch_portfolios_payload(as_of_date="2023-01-13", payload=payload,
+                                         headers={"Content-Encoding": "gzip"})
+
+        self.assertEqual(self.requests[0].content, payload)
+
+
+class TestResponseDecompression(unittest.TestCase):
+    def setUp(self):
+        self.requests = []
+        self.body = json.dumps(PAYLOAD).encode()
+
+        def server(request):
+            self.requests.append(request)
+            # the compressed body is sent in chunks like a download
+            compressed = gzip.compress(self.body)
+            chunks = [compressed[i:i + 4096] for i in range(0, len(compressed), 4096)]
+            return httpx.Response(200, content=iter(chunks),
+                                  headers={"Content-Encoding": "gzip",
+                                           "Content-Type": "application/json"})
+
+        use_mock_session(self, server, accept_encoding=["gzip"])
+
+    def test_accept_encoding(self):
+        AxiomaSession.current._get("/portfolios")
+
+        self.assertEqual(self.requests[0].headers["Accept-Encoding"], "gzip")
+        self.assertIn("gzip", supported_content_encodings())
+        self.assertIsNone(accept_encoding_header(None))
+        self.assertEqual(accept_encoding_header("gzip;q=1.0, identity"),
+                         "gzip, identity")
+        with patch("importlib.util.find_spec", return_value=None):
+            self.assertEqual(accept_encoding_header("auto"), "gzip, deflate")
+            with self.assertRaises(AxiomaValueError):
+                accept_encoding_header(["zstd"])
+
+    def test_streamed_response_is_decompressed(self):
+        response = AxiomaSession.current._get("/portfolios", stream=True)
+
+        self.assertEqual(response.bytes_on_wire, 0)
+        items = list(response.iter_items("portfolios"))
+
+        self.assertEqual(items, PAYLOAD["portfolios"])
+        self.assertEqual(response.content_encoding, "gzip")
+        self.assertEqual(response.bytes_decoded, len(self.body))
+        self.assertEqual(response.bytes_on_wire, len(gzip.compress(self.body)))
+
+    def test_response_byte_counts(self):
+        response = AxiomaSession.current._get("/portfolios")
+
+        self.assertEqual(response.json(), PAYLOAD)
+        self.assertEqual(response.bytes_decoded, len(self.body))
+        self.assertLess(response.bytes_on_wire * 5, response.bytes_decoded)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,201 @@
+"""
+Copyright © 2024 Axioma by SimCorp.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+
+"""
+from axiomapy import AxiomaSession
+from axiomapy.axiomaexceptions import AxiomaValueError
+from axiomapy.downloads import ZipStreamExtractor, extract_zip
+from axiomapy.test.unit.helpers import use_mock_async_session, use_mock_session
+
+import io
+import json
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+import httpx
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+MEMBERS = {
+    "factors.csv": b"factor,exposure\n" + b"Size,0.5\n" * 5000,
+    "covariance/matrix.csv": b"Size,Value\n0.1,0.2\n",
+    "empty.txt": b"",
+}
+ITEMS = [{"date": "2023-01-13", "portfolio": f"P{i}", "return": i / 100}
+         for i in range(25)]
+
+
+class _Unseekable(io.RawIOBase):
+    """A write only stream, zipfile writes data descriptors to it like a server
+    streaming an archive"""
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self.data += b
+        return len(b)
+
+
+def _zip(compression=zipfile.ZIP_DEFLATED, seekable=True) -> bytes:
+    stream = io.BytesIO() if seekable else _Unseekable()
+    with zipfile.ZipFile(stream, "w", compression=compression) as z:
+        z.writestr("covariance/", b"")
+        for name, data in MEMBERS.items():
+            z.writestr(name, data)
+    return stream.getvalue() if seekable else bytes(stream.data)
+
+
+def _chunks(data: bytes, size: int = 7):
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+
+class TestZipStreamExtractor(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _assert_extracted(self, paths):
+        self.assertEqual(sorted(p.relative_to(self.dir).as_posix() for p in paths),
+                         sorted(MEMBERS))
+        for name, data in MEMBERS.items():
+            self.assertEqual((self.dir / name).read_bytes(), data)
+
+    def test_extract(self):
+        for compression in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+            for seekable in (True, False):
+                with self.subTest(compression=compression, seekable=seekable):
+                    if compression == zipfile.ZIP_STORED and not seekable:
+                        continue
+                    paths = extract_zip(_chunks(_zip(compression, seekable)), self.dir)
+                    self._assert_extracted(paths)
+
+    def test_members_are_extracted_as_they_arrive(self):
+        data = _zip()
+        extractor = ZipStreamExtractor(self.dir)
+
+        end = data.index(b"empty.txt")
+        completed = extractor.feed(data[:end])
+
+        self.assertEqual([p.name for p in completed], ["factors.csv", "matrix.csv"])
+        self.assertEqual((self.dir / "factors.csv").read_bytes(),
+                         MEMBERS["factors.csv"])
+        extractor.feed(data[end:])
+        self._assert_extracted(extractor.close())
+
+    def test_invalid_archives(self):
+        with self.assertRaises(AxiomaValueError):
+            extract_zip([b"not a zip archive"], self.dir)
+        with self.assertRaises(AxiomaValueError):
+            extract_zip([_zip()[:100]], self.dir)
+        corrupt = bytearray(_zip(zipfile.ZIP_STORED))
+        corrupt[corrupt.index(b"Size")] = ord("s")
+        with self.assertRaises(AxiomaValueError):
+            extract_zip([bytes(corrupt)], self.dir)
+
+    def test_member_paths_stay_in_the_directory(self):
+        stream = io.BytesIO()
+        with zipfile.ZipFile(stream, "w") as z:
+            z.writestr("../../outside.txt", b"data")
+
+        paths = extract_zip([stream.getvalue()], self.dir)
+
+        self.assertEqual(paths, [self.dir / "outside.txt"])
+
+
+def _server(request):
+    if request.url.path.endswith("/risk-models/1"):
+        return httpx.Response(200, content=_zip(),
+                              headers={"Content-Type": "multipart/x-zip"})
+    if request.headers.get("Accept") == "text/csv":
+        csv = "date,portfolio,return\n" + "".join(
+            f"{i['date']},{i['portfolio']},{i['return']}\n" for i in ITEMS)
+        return httpx.Response(200, content=csv.encode(),
+                              headers={"Content-Type": "text/csv"})
+    return httpx.Response(200, json={"items": ITEMS})
+
+
+class TestResponseDownloads(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.dir = Path(self.tmp.name)
+        use_mock_session(self, _server)
+
+    def test_download_to(self):
+        response = AxiomaSession.current._get("/results", stream=True)
+
+        size = response.download_to(self.dir / "results.json")
+
+        self.assertEqual(json.loads((self.dir / "results.json").read_bytes()),
+                         {"items": ITEMS})
+        self.assertEqual(size, response.bytes_decoded)
+        self.assertFalse((self.dir / "results.json.part").exists())
+        self.assertTrue(response.response.is_closed)
+
+    def test_extract_to(self):
+        response = AxiomaSession.current._get("/analyses/risk/risk-models/1",
+                                              stream=True)
+
+        paths = response.extract_to(self.dir)
+
+        self.assertEqual(len(paths), len(MEMBERS))
+        self.assertEqual((self.dir / "factors.csv").read_bytes(),
+                         MEMBERS["factors.csv"])
+
+    @unittest.skipIf(pq is None, "pyarrow is not installed")
+    def test_to_parquet(self):
+        response = AxiomaSession.current._get("/results", stream=True)
+        rows = response.to_parquet(self.dir / "results.parquet", batch_size=10)
+        csv_response = AxiomaSession.current._get("/results", stream=True,
+                                                  headers={"Accept": "text/csv"})
+        csv_rows = csv_response.to_parquet(self.dir / "csv.parquet")
+
+        self.assertEqual((rows, csv_rows), (len(ITEMS), len(ITEMS)))
+        parquet = pq.ParquetFile(self.dir / "results.parquet")
+        self.assertEqual(parquet.num_row_groups, 3)
+        self.assertEqual(parquet.read().to_pylist(), ITEMS)
+        self.assertEqual(pq.read_table(self.dir / "csv.parquet").column("return")
+                         .to_pylist(), [i["return"] for i in ITEMS])
+
+
+class TestAsyncResponseDownloads(unittest.IsolatedAsyncioTestCase):
+    async def test_adownload_and_extract(self):
+        session = await use_mock_async_session(self, _server)
+        with tempfile.TemporaryDirectory() as tmp:
+            response = await session._get("/results", stream=True)
+            await response.adownload_to(Path(tmp) / "results.json")
+            response = await session._get("/analyses/risk/risk-models/1",
+                                          stream=True)
+            paths = await response.aextract_to(tmp)
+
+            self.assertEqual(json.loads((Path(tmp) / "results.json").read_bytes()),
+                             {"items": ITEMS})
+            self.assertEqual(len(paths), len(MEMBERS))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,395 @@
+"""
+Copyright © 2024 Axioma by SimCorp.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+
+"""
+from axiomapy.entitybase import (
+    EntityBase,
+    EntitySet,
+    EnumBase,
+    PropTypeEnums,
+    TemplatedEntityBase,
+    camel_case_translate,
+    do_not_clone,
+    do_not_serialise,
+    get_enum_value,
+)
+from axiomapy.utils import date_arg_parse
+
+import unittest
+from datetime import date, datetime
+from typing import List, Optional, Union
+from unittest.mock import patch
+
+
+class Side(EnumBase):
+    Long = "Long"
+    Short = "Short"
+
+
+class Lot(EntityBase):
+    @camel_case_translate
+    def __init__(self, lot_id: str, quantity: float = None):
+        super().__init__()
+        self.lot_id = lot_id
+        self.quantity = quantity
+
+    @property
+    def lot_id(self) -> str:
+        return self._lot_id
+
+    @lot_id.setter
+    def lot_id(self, value: str):
+        self._lot_id = value
+
+    @property
+    def quantity(self) -> Optional[float]:
+        return self._quantity
+
+    @quantity.setter
+    def quantity(self, value: float):
+        self._quantity = value
+
+
+class Position(EntityBase):
+    @camel_case_translate
+    def __init__(
+        self,
+        client_id: str,
+        as_of_date: Union[date, str] = None,
+        side: Union[Side, str] = None,
+        lots: List[Union[Lot, dict]] = None,
+        internal_note: str = None,
+        id_: int = None,
+    ):
+        super().__init__()
+        self.client_id = client_id
+        self.as_of_date = as_of_date
+        self.side = side
+        self.lots = lots
+        self.internal_note = internal_note
+        self.id = id_
+
+    @property
+    def client_id(self) -> str:
+        return self._client_id
+
+    @client_id.setter
+    def client_id(self, value: str):
+        self._client_id = value
+
+    @property
+    def as_of_date(self) -> Optional[date]:
+        return self._as_of_date
+
+    @as_of_date.setter
+    def as_of_date(self, value: Union[date, str]):
+        self._as_of_date = date_arg_parse(value, format="%Y-%m-%d")
+
+    @property
+    def side(self) -> Optional[Side]:
+        return self._side
+
+    @side.setter
+    def side(self, value: Union[Side, str]):
+        self._side = get_enum_value(Side, value)
+
+    @property
+    def lots(self) -> Optional[List[Lot]]:
+        return self._lots
+
+    @lots.setter
+    def lots(self, values: List[Union[Lot, dict]]):
+        self._lots = (
+            None if values is None else [Lot.get_as_instance(v) for v in values]
+        )
+
+    @property
+    @do_not_serialise
+    def internal_note(self) -> str:
+        return self._internal_note
+
+    @internal_note.setter
+    def internal_note(self, value: str):
+        self._internal_note = value
+
+    @property
+    @do_not_clone
+    def id(self) -> int:
+        return self._id
+
+    @id.setter
+    def id(self, value: int):
+        self._id = value
+
+
+class Instrument(TemplatedEntityBase):
+    _TEMPLATE_NAME = "Bond"
+    _TEMPLATE_MAPPING = [("Coupon Rate", "coupon_rate")]
+
+    @camel_case_translate
+    def __init__(self, name: str, coupon_rate: float = None):
+        super().__init__()
+        self.name = name
+        self.coupon_rate = coupon_rate
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, value: str):
+        self._name = value
+
+    @property
+    def coupon_rate(self) -> float:
+        return self._coupon_rate
+
+    @coupon_rate.setter
+    def coupon_rate(self, value: float):
+        self._coupon_rate = value
+
+
+class Positions(EntitySet[Position]):
+    def _element_key_(self, value):
+        return value.client_id
+
+
+POSITION = {
+    "clientId": "AAPL",
+    "asOfDate": "2023-01-13",
+    "side": "long",
+    "lots": [{"lotId": "L1", "quantity": 10.0}, {"lotId": "L2"}],
+    "internalNote": "not sent",
+    "id": 7,
+}
+
+
+class TestEntitySerialisation(unittest.TestCase):
+    def test_to_dict(self):
+        position = Position.from_dict(POSITION)
+
+        self.assertEqual(
+            position.to_dict(),
+            {
+                "clientId": "AAPL",
+                "asOfDate": "2023-01-13",
+                "side": "Long",
+                "lots": [{"lotId": "L1", "quantity": 10.0}, {"lotId": "L2"}],
+                "id": 7,
+            },
+        )
+        self.assertEqual(position.to_dict(translate=False)["as_of_date"], "2023-01-13")
+        self.assertIsNone(position.to_dict(filter_none=False)["lots"][1]["quantity"])
+
+    def test_clone(self):
+        position = Position.from_dict(POSITION)
+
+        clone = position.clone()
+
+        self.assertEqual(clone.internal_note, "not sent")
+        self.assertIsNone(clone.id)
+        self.assertEqual(clone.lots, position.lots)
+
+    def test_serialisation_plan_is_cached(self):
+        Position.from_dict(POSITION).to_dict()
+        plan = Position._serialisation_plan()
+        self.assertIs(Position._registry().serialisation_plan, plan)
+
+        with patch.object(Position, "_get_prop_type") as mock_get_prop_type:
+            Position.from_dict(POSITION).to_dict()
+            mock_get_prop_type.assert_not_called()
+
+        by_name = {info.name: info for info in plan}
+        self.assertEqual(by_name["as_of_date"].key, "asOfDate")
+        self.assertIs(by_name["lots"].prop_type, PropTypeEnums.IterableCommonBaseType)
+        self.assertIs(by_name["side"].prop_type, PropTypeEnums.EnumType)
+        self.assertTrue(by_name["internal_note"].do_not_serialise)
+        self.assertTrue(by_name["id"].do_not_clone)
+        self.assertIs(Lot._serialisation_plan()[0].prop_type, PropTypeEnums.OtherType)
+
+
+class TestEntityConstruction(unittest.TestCase):
+    def test_from_dict_copies_definition(self):
+        definition = {"clientId": "AAPL", "lots": [{"lotId": "L1"}]}
+
+        position = Position.from_dict(definition)
+        position.lots[0].quantity = 5
+
+        self.assertEqual(definition, {"clientId": "AAPL", "lots": [{"lotId": "L1"}]})
+
+    def test_from_dict_without_copy(self):
+        definition = dict(POSITION)
+
+        position = Position.from_dict(definition, copy=False)
+
+        self.assertEqual(position.to_dict(), Position.from_dict(POSITION).to_dict())
+        self.assertEqual(definition, POSITION)
+
+    def test_from_dict_keys(self):
+        position = Position.from_dict(
+            {"client_id": "A", "asOfDate": "2023-01-13", "unknownKey": 1}
+        )
+
+        self.assertEqual(position.client_id, "A")
+        self.assertEqual(position.as_of_date, datetime(2023, 1, 13))
+        self.assertFalse(hasattr(position, "unknown_key"))
+        self.assertEqual(Position._constructor_args(), ("client_id",))
+        self.assertEqual(Position._settable_property("asOfDate"), "as_of_date")
+        self.assertEqual(Position._settable_property("as_of_date"), "as_of_date")
+        self.assertIsNone(Position._settable_property("unknownKey"))
+
+    def test_update(self):
+        position = Position.from_dict(POSITION)
+
+        position.update({"side": "short", "asOfDate": None})
+        position["clientId"] = "MSFT"
+
+        self.assertIs(position.side, Side.Short)
+        self.assertEqual(position.as_of_date, datetime(2023, 1, 13))
+        self.assertEqual(position.client_id, "MSFT")
+
+
+class TestAttributeResolution(unittest.TestCase):
+    def test_model_keys(self):
+        position = Position.from_dict(POSITION)
+
+        self.assertEqual(position.clientId, "AAPL")
+        position.asOfDate = "2023-02-01"
+        self.assertEqual(position.as_of_date, datetime(2023, 2, 1))
+        self.assertNotIn("asOfDate", position.__dict__)
+
+    def test_resolution_is_cached(self):
+        position = Position.from_dict(POSITION)
+        position.clientId = "MSFT"
+
+        with patch.object(Position, "_translate_to_class_prop") as mock_translate:
+            position.clientId = "IBM"
+            self.assertEqual(position.clientId, "IBM")
+            mock_translate.assert_not_called()
+
+    def test_instance_attributes(self):
+        position = Position.from_dict(POSITION)
+        position.extraValue = 1
+
+        self.assertEqual(position.extraValue, 1)
+        self.assertIn("extraValue", position.__dict__)
+
+    def test_template_content_keys(self):
+        instrument = Instrument.from_dict(
+            {"name": "B1", "templateName": "Bond", "content": {"Coupon Rate": 2.5}}
+        )
+
+        self.assertEqual(instrument.coupon_rate, 2.5)
+        self.assertEqual(instrument["Coupon Rate"], 2.5)
+        self.assertEqual(
+            instrument.to_dict(),
+            {"name": "B1", "templateName": "Bond", "content": {"Coupon Rate": 2.5}},
+        )
+        self.assertEqual(Instrument._get_content_class_key("coupon_rate"),
+                         "coupon_rate")
+        self.assertEqual(Instrument._get_content_class_key("name"), "name")
+
+
+class TestPropertyRegistry(unittest.TestCase):
+    def test_subclass_has_own_properties(self):
+        class Base(EntityBase):
+            @property
+            def name(self) -> str:
+                return self._name
+
+            @name.setter
+            def name(self, value: str):
+                self._name = value
+
+        class Derived(Base):
+            @property
+            def code(self) -> str:
+                return "CODE"
+
+        self.assertEqual(Base.class_properties(), {"name"})
+        self.assertEqual(Derived.class_properties(), {"name", "code"})
+        self.assertEqual(Base.class_properties(), {"name"})
+        self.assertIsNot(Derived._registry(), Base._registry())
+
+        derived = Derived.from_dict({"name": "n", "code": "ignored"})
+        self.assertEqual(derived.to_dict(), {"name": "n", "code": "CODE"})
+
+    def test_registry(self):
+        registry = Position._registry()
+
+        self.assertIs(registry.properties["lots"], Position.__dict__["lots"])
+        self.assertIs(registry.setters["side"], Position.__dict__["side"].fset)
+        self.assertIs(Position._registry(), registry)
+        self.assertNotIn("template_name", registry.names)
+        self.assertIn("template_name", Instrument.class_properties())
+
+
+class TestEntitySet(unittest.TestCase):
+    def test_membership(self):
+        positions = Positions(Position(c) for c in ["A", "B", "A", "C"])
+
+        self.assertEqual([p.client_id for p in positions], ["A", "B", "C"])
+        self.assertIn(Position("B"), positions)
+        self.assertNotIn(Position("D"), positions)
+        self.assertEqual(positions,
+                         Positions([Position("C"), Position("B"), Position("A")]))
+
+    def test_add_discard_replace(self):
+        first = Position("A", side="long")
+        positions = Positions([first, Position("B")])
+
+        positions.add(Position("A", side="short"))
+        self.assertIs(next(iter(positions)), first)
+        positions.discard(Position("B"))
+        positions.discard(Position("Z"))
+        self.assertEqual(len(positions), 1)
+
+        replacement = Position("A", side="short")
+        positions.replace(replacement)
+        positions.replace(Position("D"))
+        self.assertEqual(positions.get_items(), [replacement])
+        positions.replace(Position("D"), add_if_missing=True)
+        self.assertEqual([p.client_id for p in positions], ["A", "D"])
+
+    def test_set_operations(self):
+        ab = Positions([Position("A"), Position("B")])
+        bc = Positions([Position("B"), Position("C")])
+
+        self.assertIsInstance(ab.union(bc), Positions)
+        self.assertEqual([p.client_id for p in ab.union(bc)], ["A", "B", "C"])
+        self.assertEqual([p.client_id for p in ab.intersection(bc)], ["B"])
+        self.assertEqual([p.client_id for p in ab.difference(bc)], ["A"])
+
+    def test_update(self):
+        positions = Positions([Position("A"), Position("B")])
+
+        updated = positions.update(
+            Positions([Position("A", side="short"), Position("Z")]))
+
+        self.assertIs(updated[0], positions.get_items()[0])
+        self.assertIs(updated[0].side, Side.Short)
+        self.assertIsNone(updated[1])
+
+    def test_dedupe_is_linear(self):
+        positions = Positions(Position(str(i % 50000)) for i in range(100000))
+
+        self.assertEqual(len(positions), 50000)
+        with patch.object(Positions, "_element_eq_") as mock_eq:
+            self.assertIn(Position("49999"), positions)
+            mock_eq.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+Copyright © 2024 Axioma by SimCorp.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+
+"""
+from axiomapy.axiomaapi import PortfoliosAPI, QuantityType
+from axiomapy.axiomaexceptions import AxiomaValueError
+from axiomapy.jsoncodec import JsonCodec, OrjsonCodec, get_json_codec
+from axiomapy.test.unit.helpers import use_mock_session
+
+import json
+import sys
+import unittest
+from unittest.mock import patch
+
+import httpx
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+PAYLOAD = {"name": "Portfölio", "scale": QuantityType.MarketValue,
+           "values": [1, 2.5, None], 1: True}
+
+
+class TestJsonCodec(unittest.TestCase):
+    def test_stdlib(self):
+        codec = get_json_codec("json")
+
+        self.assertEqual(codec.dumps(PAYLOAD), json.dumps(
+            PAYLOAD, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        self.assertEqual(codec.loads(b'{"a": [1]}'), {"a": [1]})
+
+    def test_stdlib_is_the_default(self):
+        self.assertIs(type(get_json_codec()), JsonCodec)
+        self.assertIs(type(get_json_codec(None)), JsonCodec)
+
+    @unittest.skipIf(orjson is None, "orjson is not installed")
+    def test_orjson(self):
+        codec = get_json_codec("orjson")
+
+        self.assertIsInstance(codec, OrjsonCodec)
+        self.assertIsInstance(get_json_codec("auto"), OrjsonCodec)
+        self.assertEqual(json.loads(codec.dumps(PAYLOAD)),
+                         json.loads(JsonCodec().dumps(PAYLOAD)))
+
+    def test_falls_back_to_stdlib(self):
+        with patch.dict(sys.modules, {"orjson": None, "ujson": None}):
+            self.assertIs(type(get_json_codec("auto")), JsonCodec)
+            with self.assertRaises(ImportError):
+                get_json_codec("orjson")
+
+    def test_codec_argument(self):
+        codec = JsonCodec()
+        self.assertIs(get_json_codec(codec), codec)
+        with self.assertRaises(AxiomaValueError):
+            get_json_codec("simplejson")
+
+
+class TestSessionCodec(unittest.TestCase):
+    def setUp(self):
+        self.requests = []
+
+        def server(request):
+            self.requests.append(request)
+            return httpx.Response(200, json={"items": [{"id": 1}]})
+
+        self.codec = JsonCodec()
+        use_mock_session(self, server, json_codec=self.codec)
+
+    def test_stdlib_is_the_default_codec(self):
+        session = use_mock_session(self, lambda request: httpx.Response(200, json={}))
+
+        self.assertIs(type(session.json_codec), JsonCodec)
+
+    def test_requests_use_the_codec(self):
+        def dumps(codec, obj):
+            return b'{"encoded":true}'
+
+        with patch.object(JsonCodec, "dumps", autospec=True,
+                          side_effect=dumps) as dumps, \
+                patch.object(JsonCodec, "loads", autospec=True,
+                             return_value={"decoded": True}) as loads:
+            PortfoliosAPI.post_portfolio({"name": "P"})
+            body = PortfoliosAPI.get_portfolios().json()
+
+        dumps.assert_called_once_with(self.codec, {"name": "P"})
+        self.assertEqual(self.requests[0].content, b'{"encoded":true}')
+        self.assertEqual(self.requests[0].headers["content-type"], "application/json")
+        self.assertEqual(body, {"decoded": True})
+        self.assertEqual(loads.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+"""
+Copyright © 2024 Axioma by SimCorp.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+
+"""
+from axiomapy import RateLimit, RateLimiter
+from axiomapy.axiomaapi import BulkAPI, PortfoliosAPI, paginate
+from axiomapy.axiomaexceptions import AxiomaValueError
+from axiomapy.session import APIType
+from axiomapy.test.unit.helpers import use_mock_session
+
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import httpx
+
+
+class TestRateLimit(unittest.TestCase):
+    def test_invalid_limits(self):
+        with self.assertRaises(AxiomaValueError):
+            RateLimit(rate=0)
+        with self.assertRaises(AxiomaValueError):
+            RateLimit(max_concurrency=0)
+
+    @patch("axiomapy.ratelimit.time.sleep")
+    def test_token_bucket(self, mock_sleep):
+        limit = RateLimit(rate=10, burst=2)
+        with patch("axiomapy.ratelimit.time.monotonic", return_value=limit._updated):
+            for _ in range(4):
+                limit.acquire()
+
+        delays = [c.args[0] for c in mock_sleep.call_args_list]
+        self.assertEqual(len(delays), 2)
+        self.assertAlmostEqual(delays[0], 0.1)
+        self.assertAlmostEqual(delays[1], 0.2)
+
+    def test_max_concurrency_across_threads(self):
+        limit = RateLimit(max_concurrency=2)
+        lock = threading.Lock()
+        running = []
+        peak = []
+
+        def request():
+            with limit:
+                with lock:
+                    running.append(1)
+                    peak.append(len(running))
+                time.sleep(0.01)
+                with lock:
+                    running.pop()
+
+        threads = [threading.Thread(target=request) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(max(peak), 2)
+
+    def test_max_concurrency_across_tasks(self):
+        limit = RateLimit(max_concurrency=3)
+        running = []
+        peak = []
+
+        async def request():
+            async with limit:
+                running.append(1)
+                peak.append(len(running))
+                await asyncio.sleep(0.01)
+                running.pop()
+
+        async def main():
+            await asyncio.gather(*(request() for _ in range(10)))
+
+        asyncio.run(main())
+
+        self.assertEqual(max(peak), 3)
+
+
+class TestRateLimiter(unittest.TestCase):
+    def setUp(self):
+        self.analyses = RateLimit(rate=1)
+        self.bulk = RateLimit(rate=2)
+        self.limiter = RateLimiter({"analyses": self.analyses, "bulk": self.bulk})
+
+    def test_family(self):
+        self.assertEqual(RateLimiter.family("/portfolios/1/positions"), "portfolios")
+        self.assertEqual(RateLimiter.family("/analyses?$top=1"), "analyses")
+        self.assertEqual(RateLimiter.family("/positions/2023-01-13", APIType.BULK),
+                         "bulk")
+        self.assertEqual(RateLimiter.family("/events", "CEB"), "ceb")
+
+    def test_family_of_full_url(self):
+        for url in ("https://test/REST/api/v1/portfolios?$skip=10",
+                    "https://test/api/v1/portfolios/1/positions",
+                    "api/v1/portfolios"):
+            with self.subTest(url=url):
+                self.assertEqual(RateLimiter.family(url, "REST"), "portfolios")
+
+    def test_limit_for(self):
+        self.assertIs(self.limiter.limit_for("/analyses/1/status"), self.analyses)
+        self.assertIs(self.limiter.limit_for("/positions/2023-01-13", APIType.BULK),
+                      self.bulk)
+        self.assertIs(self.limiter.limit_for("/portfolios"), self.limiter.default)
+
+    def test_session_uses_limit_of_endpoint(self):
+        use_mock_session(self, lambda request: httpx.Response(200, json={}),
+                         rate_limiter=self.limiter)
+        with patch.object(RateLimit, "acquire", autospec=True) as mock_acquire:
+            PortfoliosAPI.get_portfolio(1)
+            BulkAPI.patch_portfolios_payload(as_of_date="2023-01-13", payload={})
+
+        limits = [c.args[0] for c in mock_acquire.call_args_list]
+        self.assertEqual(limits, [self.limiter.default, self.bulk])
+
+    def test_pages_use_limit_of_family(self):
+        portfolios = RateLimit(rate=10)
+        limiter = RateLimiter({"portfolios": portfolios})
+
+        def server(request):
+            skip = int(request.url.params.get("$skip", 0))
+            body = {"items": [{"id": skip}], "total": 3}
+            if skip < 2:
+                href = f"/REST/api/v1/portfolios?$top=1&$skip={skip + 1}"
+                body["_links"] = {"next": {"href": href}}
+            return httpx.Response(200, json=body)
+
+        use_mock_session(self, server, rate_limiter=limiter)
+        with patch.object(RateLimit, "acquire", autospec=True) as mock_acquire:
+            items = list(paginate(PortfoliosAPI.get_portfolios, page_size=1,
+                                  prefetch=False))
+
+        self.assertEqual(len(items), 3)
+        # the next links are full urls
+        limits = [c.args[0] for c in mock_acquire.call_args_list]
+        self.assertEqual(limits, [portfolios] * 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
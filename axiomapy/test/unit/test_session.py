@@ -0,0 +1,168 @@
+"""
+Copyright © 2024 Axioma by SimCorp.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+
+"""
+from axiomapy import AxiomaSession, RetryPolicy
+from axiomapy.axiomaapi import PortfoliosAPI, AsyncPortfoliosAPI
+from axiomapy.axiomaexceptions import AxiomaRequestError, AxiomaRequestStatusError
+from axiomapy.test.unit.helpers import use_mock_async_session, use_mock_session
+
+import unittest
+from unittest.mock import patch
+
+import httpx
+
+
+class MockServer:
+    """Token endpoint and a portfolio endpoint that requires the bearer token"""
+
+    def __init__(self):
+        self.requests = []
+        self.tokens = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.url.path.endswith("/connect/token"):
+            self.tokens += 1
+            return httpx.Response(
+                200, json={"access_token": f"token-{self.tokens}", "expires_in": 3600}
+            )
+        if request.headers.get("Authorization") != f"Bearer token-{self.tokens}":
+            return httpx.Response(401)
+        return httpx.Response(200, json={"id": 1234})
+
+
+class TestSessionTransport(unittest.TestCase):
+    def setUp(self):
+        self.server = MockServer()
+        self.limits = httpx.Limits(max_connections=5, max_keepalive_connections=2)
+        use_mock_session(self, self.server, token=False, limits=self.limits)
+
+    def test_client_options(self):
+        kwargs = AxiomaSession.current._client_kwargs()
+        self.assertIs(kwargs["limits"], self.limits)
+        self.assertFalse(kwargs["http2"])
+        self.assertEqual(kwargs["timeout"], httpx.Timeout(300))
+
+    def test_authenticates_with_session_client(self):
+        response = PortfoliosAPI.get_portfolio(1234)
+
+        self.assertEqual(response.json(), {"id": 1234})
+        token_request, request = self.server.requests
+        self.assertEqual(token_request.method, "POST")
+        self.assertNotIn("Authorization", token_request.headers)
+        self.assertEqual(request.headers["Authorization"], "Bearer token-1")
+
+    def test_reauthenticates_on_401(self):
+        self.server.tokens += 1  # the current token expired
+
+        response = PortfoliosAPI.get_portfolio(1234)
+
+        self.assertEqual(response.status_code, 200)
+        paths = [r.url.path for r in self.server.requests]
+        self.assertEqual(len(paths), 4)
+        self.assertTrue(paths[2].endswith("/connect/token"))
+        self.assertNotIn("Authorization", self.server.requests[2].headers)
+
+
+class TestAsyncSessionTransport(unittest.IsolatedAsyncioTestCase):
+    async def test_authenticates_with_session_client(self):
+        server = MockServer()
+        await use_mock_async_session(self, server, token=False)
+        response = await AsyncPortfoliosAPI.get_portfolio(1234)
+
+        self.assertEqual(response.json(), {"id": 1234})
+        self.assertEqual(len(server.requests), 2)
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def setUp(self):
+        self.policy = RetryPolicy(max_retries=2, backoff_factor=1, backoff_max=3)
+
+    def _response(self, status_code, headers=None):
+        return httpx.Response(status_code, headers=headers)
+
+    def test_retries_idempotent_methods_only(self):
+        response = self._response(503)
+        self.assertTrue(self.policy.should_retry_response("GET", response, 0))
+        self.assertFalse(self.policy.should_retry_response("POST", response, 0))
+        self.assertFalse(self.policy.should_retry_response("GET", response, 2))
+        not_found = self._response(404)
+        self.assertFalse(self.policy.should_retry_response("GET", not_found, 0))
+
+    def test_retries_throttled_post(self):
+        throttled = self._response(429)
+        self.assertTrue(self.policy.should_retry_response("POST", throttled, 0))
+
+    def test_retries_errors(self):
+        request = httpx.Request("POST", "https://test")
+        connect_error = httpx.ConnectError("refused", request=request)
+        read_timeout = httpx.ReadTimeout("timed out", request=request)
+        self.assertTrue(self.policy.should_retry_error("POST", connect_error, 0))
+        self.assertFalse(self.policy.should_retry_error("POST", read_timeout, 0))
+        self.assertTrue(self.policy.should_retry_error("GET", read_timeout, 0))
+
+    def test_delay(self):
+        for attempt in range(5):
+            self.assertTrue(0 <= self.policy.delay(attempt) <= min(3, 2 ** attempt))
+        response = self._response(429, headers={"Retry-After": "7"})
+        self.assertEqual(self.policy.delay(0, response), 7)
+        response = self._response(
+            503, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+        self.assertEqual(self.policy.delay(0, response), 0)
+
+    def test_timeout(self):
+        timeout = RetryPolicy(connect_timeout=5).timeout(300)
+        self.assertEqual(timeout.connect, 5)
+        self.assertEqual(timeout.read, 300)
+
+
+class TestSessionRetry(unittest.TestCase):
+
+    @patch("axiomapy.session.time.sleep")
+    def test_retries_with_backoff(self, mock_sleep):
+        responses = iter([httpx.Response(503),
+                          httpx.Response(429, headers={"Retry-After": "2"}),
+                          httpx.Response(200, json={"id": 1234})])
+        use_mock_session(self, lambda request: next(responses), max_retries=2)
+
+        response = PortfoliosAPI.get_portfolio(1234)
+
+        self.assertEqual(response.json(), {"id": 1234})
+        self.assertEqual(mock_sleep.call_count, 2)
+        self.assertEqual(mock_sleep.call_args.args[0], 2)
+
+    @patch("axiomapy.session.time.sleep")
+    def test_gives_up_after_max_retries(self, mock_sleep):
+        use_mock_session(self, lambda request: httpx.Response(500), max_retries=1)
+
+        with self.assertRaises(AxiomaRequestStatusError):
+            PortfoliosAPI.get_portfolio(1234)
+        self.assertEqual(mock_sleep.call_count, 1)
+
+    @patch("axiomapy.session.time.sleep")
+    def test_does_not_retry_read_timeout_on_post(self, mock_sleep):
+        def handler(request):
+            raise httpx.ReadTimeout("timed out", request=request)
+
+        use_mock_session(self, handler, max_retries=3)
+
+        with self.assertRaises(AxiomaRequestError):
+            PortfoliosAPI.post_portfolio({"name": "p"})
+        mock_sleep.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,230 @@
+"""
+Copyright © 2024 Axioma by SimCorp.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on an
+"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+KIND, either express or implied.  See the License for the
+specific language governing permissions and limitations
+under the License.
+
+"""
+from axiomapy import (
+    AxiomaSession,
+    JsonItemParser,
+    aiter_json_items,
+    iter_csv_records,
+    iter_csv_rows,
+    iter_json_items,
+)
+from axiomapy.axiomaapi import AnalysesAPI
+from axiomapy.streaming import infer_csv_type, iter_lines, parse_csv_value
+from axiomapy.test.unit.helpers import use_mock_async_session, use_mock_session
+from axiomapy.test.unit.test_entitybase import POSITION, Position
+
+import json
+import time
+import unittest
+
+import httpx
+
+DOCUMENT = {
+    "total": 3,
+    "_links": {"self": {"href": "/portfolios/1/positions"}, "items": []},
+    "items": [
+        {"id": 1, "name": "café \"a\" ]}", "values": [1.5, -2e3, None]},
+        {"id": 22, "nested": {"items": [1, 2]}},
+        12345,
+    ],
+    "after": True,
+}
+
+
+def _chunks(data: bytes, size: int):
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+
+class TestJsonItemParser(unittest.TestCase):
+    def test_chunk_sizes(self):
+        data = json.dumps(DOCUMENT, indent=1, ensure_ascii=False).encode("utf-8")
+        for size in (1, 2, 3, 7, 64, len(data)):
+            with self.subTest(size=size):
+                items = list(iter_json_items(_chunks(data, size)))
+                self.assertEqual(items, DOCUMENT["items"])
+
+    def test_top_level_array_and_key(self):
+        self.assertEqual(list(iter_json_items([b"[1, ", b'{"a": 2}]'])),
+                         [1, {"a": 2}])
+        data = json.dumps({"results": [1, 2], "items": [3]}).encode()
+        self.assertEqual(list(iter_json_items(_chunks(data, 5), "results")), [1, 2])
+        self.assertEqual(list(iter_json_items([b'{"items": null}'])), [])
+
+    def test_items_are_returned_when_complete(self):
+        parser = JsonItemParser()
+
+        self.assertEqual(parser.feed(b'{"items": [{"id": 1}, {"id"'), [{"id": 1}])
+        self.assertEqual(parser.feed(b': 2}, 3'), [{"id": 2}])
+        self.assertEqual(parser.feed(b'4]}'), [34])
+        self.assertEqual(parser.close(), [])
+
+    def test_invalid_documents(self):
+        for data in (b'{"items": [1, 2', b'"text"', b'{"items": [1, }'):
+            with self.subTest(data=data):
+                with self.assertRaises(json.JSONDecodeError):
+                    list(iter_json_items(_chunks(data, 4)))
+
+    def test_large_values_in_small_chunks(self):
+        # each value is decoded once it is complete, not for every chunk
+        rows = [{"id": i, "name": f'row "{i}" \\ ]}}', "values": [i, 1.5, None]}
+                for i in range(40000)]
+        data = json.dumps({"results": rows, "items": [rows, 1]}).encode()
+        self.assertGreater(len(data), 4_000_000)
+
+        start = time.perf_counter()
+        items = list(iter_json_items(_chunks(data, 4096)))
+
+        self.assertLess(time.perf_counter() - start, 10)
+        self.assertEqual(items, [rows, 1])
+
+    def test_entities(self):
+        data = json.dumps({"items": [POSITION, dict(POSITION, clientId="MSFT")]})
+
+        positions = list(iter_json_items([data.encode()], cls=Position))
+
+        self.assertEqual([p.client_id for p in positions], ["AAPL", "MSFT"])
+        self.assertEqual(positions[0].to_dict(), Position.from_dict(POSITION).to_dict())
+
+
+def _server(request: httpx.Request, chunked: bool = True) -> httpx.Response:
+    data = json.dumps({"items": [POSITION] * 3}).encode()
+    return httpx.Response(200, headers={"content-type": "application/json"},
+                          content=_chunks(data, 10) if chunked else data)
+
+
+class TestStreamedResponses(unittest.TestCase):
+    def setUp(self):
+        use_mock_session(self, _server)
+
+    def test_iter_items(self):
+        response = AxiomaSession.current._get("/portfolios/1/positions", stream=True)
+
+        items = list(response.iter_items())
+
+        self.assertEqual(items, [POSITION] * 3)
+        self.assertTrue(response.response.is_closed)
+
+    def test_stream_with_cls(self):
+        positions = AxiomaSession.current._get("/portfolios/1/positions", stream=True,
+                                               cls=Position)
+
+        self.assertNotIsInstance(positions, tuple)
+        self.assertEqual([p.client_id for p in positions], ["AAPL"] * 3)
+
+
+class TestAsyncStreamedResponses(unittest.IsolatedAsyncioTestCase):
+    async def test_stream_with_cls(self):
+        session = await use_mock_async_session(
+            self, lambda request: _server(request, chunked=False))
+        positions = await session._get("/portfolios/1/positions", stream=True,
+                                       cls=Position)
+        items = [p async for p in positions]
+        response = await session._get("/portfolios/1/positions", stream=True)
+        raw = [i async for i in response.aiter_items()]
+
+        self.assertEqual([p.client_id for p in items], ["AAPL"] * 3)
+        self.assertEqual(raw, [POSITION] * 3)
+
+    async def test_aiter_json_items(self):
+        async def chunks():
+            for chunk in (b'{"items": [1,', b' 2]}'):
+                yield chunk
+
+        self.assertEqual([i async for i in aiter_json_items(chunks())], [1, 2])
+
+
+CSV = ('Portfolio,Date,Weight,Code,Note\r\n'
+       'Fund é,2023-01-13,0.25,007,"spans\r\ntwo lines"\r\n'
+       'Fund b,2023-01-13,,12,"a ""quote"""\r\n').encode("utf-8")
+RECORDS = [
+    {"Portfolio": "Fund é", "Date": "2023-01-13", "Weight": "0.25", "Code": "007",
+     "Note": "spans\r\ntwo lines"},
+    {"Portfolio": "Fund b", "Date": "2023-01-13", "Weight": None, "Code": "12",
+     "Note": 'a "quote"'},
+]
+
+
+class TestCsvStreaming(unittest.TestCase):
+    def test_lines(self):
+        data = b"a\r\nb\rc\n\nd\xc3\xa9"
+        for size in (1, 2, 3, len(data)):
+            with self.subTest(size=size):
+                self.assertEqual(list(iter_lines(_chunks(data, size))),
+                                 ["a", "b", "c", "", "d\u00e9"])
+        self.assertEqual(list(iter_lines([b"a\r", b"\nb\n"], keepends=True)),
+                         ["a\r\n", "b\n"])
+
+    def test_csv_records(self):
+        for size in (1, 5, len(CSV)):
+            with self.subTest(size=size):
+                self.assertEqual(list(iter_csv_records(_chunks(CSV, size))), RECORDS)
+
+        rows = list(iter_csv_rows([CSV]))
+        self.assertEqual(rows[0], list(RECORDS[0]))
+        typed = list(iter_csv_records([CSV], types={"Weight": float}))
+        self.assertEqual([r["Weight"] for r in typed], [0.25, None])
+        self.assertEqual([r["Code"] for r in typed], ["007", "12"])
+        self.assertEqual(list(iter_csv_records([b""])), [])
+
+    def test_infer_types_per_column(self):
+        inferred = list(iter_csv_records([CSV], infer_types=True))
+        self.assertEqual([r["Weight"] for r in inferred], [0.25, None])
+        # a column of codes has one type even if some of them look like numbers
+        self.assertEqual([r["Code"] for r in inferred], ["007", "12"])
+
+        data = b"Id,Value,Name\n1,2,a\n2,2.5,3\n3,x,b\n"
+        records = list(iter_csv_records([data], infer_types=True, infer_rows=2))
+        self.assertEqual([r["Id"] for r in records], [1, 2, 3])
+        # values after the sampled rows that are not of the column type are strings
+        self.assertEqual([r["Value"] for r in records], [2.0, 2.5, "x"])
+        self.assertEqual([r["Name"] for r in records], ["a", "3", "b"])
+        records = list(iter_csv_records([data], types={"Id": str}, infer_types=True))
+        self.assertEqual([r["Id"] for r in records], ["1", "2", "3"])
+        self.assertEqual([r["Value"] for r in records], ["2", "2.5", "x"])
+
+    def test_infer_csv_type(self):
+        self.assertIs(infer_csv_type(["1", "", "-2"]), int)
+        self.assertIs(infer_csv_type(["1", "0.5"]), float)
+        self.assertIs(infer_csv_type(["12", "007"]), str)
+        self.assertIs(infer_csv_type(["", ""]), str)
+
+    def test_parse_csv_value(self):
+        self.assertEqual([parse_csv_value(v) for v in ("-3", "1e5", ".5", "0", "")],
+                         [-3, 1e5, 0.5, 0, None])
+        self.assertEqual([parse_csv_value(v) for v in ("0012", "nan", "1.2.3")],
+                         ["0012", "nan", "1.2.3"])
+
+    def test_get_analyses_records(self):
+        def server(request):
+            self.assertEqual(request.headers["Accept"], "text/csv")
+            return httpx.Response(200, headers={"content-type": "text/csv"},
+                                  content=_chunks(CSV, 8))
+
+        use_mock_session(self, server)
+        response = AnalysesAPI.get_analyses(1, as_csv=True, stream=True)
+        records = list(response.iter_records())
+        lines = list(AnalysesAPI.get_analyses(1, as_csv=True, stream=True)
+                     .iter_lines())
+
+        self.assertEqual(records, RECORDS)
+        self.assertTrue(response.response.is_closed)
+        self.assertEqual(lines[0], "Portfolio,Date,Weight,Code,Note")
+        self.assertEqual(len(lines), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -40,6 +40,7 @@ setuptools.setup(
     python_requires=">=3.8",
     install_requires=[
         "pandas",
+        "numpy",
         "httpx>=0.26.0",
         "typing;python_version<'3.7'",
         "typing-inspect",
@@ -50,6 +51,10 @@ setuptools.setup(
     ],
     extras_require={
         "notebook": ["jupyter"],
+        "http2": ["httpx[http2]"],
+        "orjson": ["orjson"],
+        "zstd": ["zstandard"],
+        "parquet": ["pyarrow"],
         "test": [
             "pytest",
             "pytest-cov",